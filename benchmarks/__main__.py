@@ -0,0 +1,102 @@
+# lancement : python -m benchmarks [--filtre pioche] [--duree 2] [--sortie bench.json] [--reference ancien.json]
+#
+# résultats en JSON (débit, percentiles par appel, pic mémoire) ; avec --reference, les cas dont le débit
+# a baissé de plus de --seuil par rapport à un ancien fichier sont signalés (code de sortie 1).
+
+from __future__ import annotations
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks import moteur, rendu
+from benchmarks.mesure import DUREE_DEFAUT, Cas, mesurer
+
+
+
+
+def tous_les_cas () -> List[Cas] :
+    cas = moteur.cas()
+    if rendu.indisponible() is None :
+        cas += rendu.cas()
+    return cas
+
+
+
+
+def regressions (resultats : Dict[str, Dict[str, Any]], reference : Dict[str, Any], seuil : float) -> Dict[str, float] :
+    """ Cas dont le débit a baissé de plus de `seuil` (fraction) par rapport à la référence : nom -> rapport nouveau / ancien """
+    anciens = reference.get("resultats", {})
+    baisses = {}
+    for nom, r in resultats.items() :
+        ancien = anciens.get(nom)
+        if not ancien or not ancien.get("ops_par_s") :
+            continue
+        rapport = r["ops_par_s"] / ancien["ops_par_s"]
+        if rapport < 1 - seuil :
+            baisses[nom] = rapport
+    return baisses
+
+
+
+
+def main (argv : Optional[List[str]] = None) -> int :
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks du moteur et du rendu BluePrince")
+    parser.add_argument("--filtre", action="append", default=[], help="ne lancer que les cas dont le nom contient ce texte (répétable)")
+    parser.add_argument("--duree", type=float, default=DUREE_DEFAUT, help="secondes de mesure par cas")
+    parser.add_argument("--sortie", default=None, help="fichier JSON (défaut : sortie standard)")
+    parser.add_argument("--reference", default=None, help="JSON d'un passage précédent, pour détecter les régressions")
+    parser.add_argument("--seuil", type=float, default=0.2, help="baisse de débit tolérée avant de signaler une régression")
+    parser.add_argument("--liste", action="store_true", help="afficher les cas et quitter")
+    args = parser.parse_args(argv)
+
+    cas = [c for c in tous_les_cas() if not args.filtre or any(f in c.nom for f in args.filtre)]
+    if args.liste :
+        for c in cas :
+            print(f"{c.nom:<36} {c.description}")
+        return 0
+
+    resultats : Dict[str, Dict[str, Any]] = {}
+    for c in cas :
+        r = mesurer(c, args.duree)
+        resultats[c.nom] = r.en_dict()
+        print(f"{c.nom:<36} {r.ops_par_s:>12.1f} ops/s   p50 {r.p50_us:>10.2f} us   p99 {r.p99_us:>10.2f} us"
+              f"   pic {r.pic_memoire_octets / 1024:>8.1f} Ko", file=sys.stderr)
+
+    rapport : Dict[str, Any] = {
+        "meta" : {
+            "date" : time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python" : platform.python_version(),
+            "implementation" : platform.python_implementation(),
+            "plateforme" : platform.platform(),
+            "duree_par_cas_s" : args.duree,
+        },
+        "resultats" : resultats,
+        "ignores" : {} if rendu.indisponible() is None else {c.nom : rendu.indisponible() for c in rendu.cas()},
+    }
+
+    code = 0
+    if args.reference :
+        with open(args.reference, encoding="utf-8") as f :
+            baisses = regressions(resultats, json.load(f), args.seuil)
+        rapport["regressions"] = baisses
+        for nom, rapport_debit in sorted(baisses.items()) :
+            print(f"REGRESSION {nom} : {rapport_debit:.0%} du débit de référence", file=sys.stderr)
+        code = 1 if baisses else 0
+
+    if args.sortie :
+        with open(args.sortie, "w", encoding="utf-8") as f :
+            json.dump(rapport, f, indent=2)
+            f.write("\n")
+    else :
+        json.dump(rapport, sys.stdout, indent=2)
+        print()
+    return code
+
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
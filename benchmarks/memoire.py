@@ -0,0 +1,152 @@
+# mémoire par partie : octets retenus par une partie vivante (ce qui limite le nombre de parties par processus,
+# cf. src.server et src.sim), et taille des petits objets du moteur
+#
+# lancement : python -m benchmarks.memoire [--parties 50] [--sortie memoire.json] [--reference ancien.json]
+#
+# mesure avec tracemalloc : mémoire allouée et encore retenue après la création de N parties, divisée par N.
+# Les modèles et l'index de placement partagés par le processus sont construits avant la mesure (non comptés).
+
+from __future__ import annotations
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.Game import Game
+from src.Grille import VuePorte
+from src.Joueur import Joueur
+from src.Piece import FormePiece, PiecePosee
+from src.Pioche import catalogue_partage
+from src.Porte import Porte
+from src.sim import POLITIQUES
+
+
+PARTIES_DEFAUT = 50
+INTENTIONS_PARTIE_JOUEE = 200   # partie en cours typique : quelques dizaines de pièces posées
+
+
+
+
+def _jouer (seed : int, largeur : int, hauteur : int, intentions : int) -> Game :
+    """ Partie neuve, puis `intentions` intentions de la politique aléatoire (src.sim) """
+    game = Game(seed, largeur, hauteur)
+    politique = POLITIQUES["aleatoire"](seed)
+    for _ in range(intentions) :
+        if game.state in ("victoire", "game_over", "quit") :
+            break
+        intention = politique.choisir(game)
+        if not intention :
+            break
+        game.handle_intentions(intention)
+    return game
+
+
+
+
+SCENARIOS : Tuple[Tuple[str, int, int, int, str], ...] = (
+    ("partie.neuve", 5, 9, 0, "Game() au départ"),
+    ("partie.jouee", 5, 9, INTENTIONS_PARTIE_JOUEE, f"après {INTENTIONS_PARTIE_JOUEE} intentions aléatoires"),
+    ("partie.neuve.50x90", 50, 90, 0, "Game() au départ, grille 50 x 90"),
+    ("partie.jouee.50x90", 50, 90, INTENTIONS_PARTIE_JOUEE, f"après {INTENTIONS_PARTIE_JOUEE} intentions, grille 50 x 90"),
+)
+
+
+
+
+def octets_par_objet (creer : Callable[[int], Any], n : int) -> float :
+    """ Mémoire retenue par objet créé (moyenne sur n objets gardés vivants) """
+    gc.collect()
+    tracemalloc.start()
+    try :
+        base, _ = tracemalloc.get_traced_memory()
+        objets = [creer(i) for i in range(n)]
+        gc.collect()
+        courant, _ = tracemalloc.get_traced_memory()
+    finally :
+        tracemalloc.stop()
+    del objets
+    return (courant - base) / n
+
+
+
+
+def objets () -> Dict[str, Callable[[int], Any]] :
+    """ Petits objets du moteur : fabrique (indice -> objet), sans état partagé entre les objets créés """
+    murs = bytearray(64)
+    modele = catalogue_partage()[0]
+    return {
+        "Porte" : lambda i : Porte(),
+        "VuePorte" : lambda i : VuePorte(murs, i % 64),
+        "Joueur" : lambda i : Joueur((2, 8)),
+        "FormePiece" : lambda i : FormePiece("croix", {"N", "S", "E", "O"}),
+        "PiecePosee" : lambda i : PiecePosee(modele),
+    }
+
+
+
+
+def mesurer (n_parties : int) -> Dict[str, Dict[str, Any]] :
+    _jouer(0, 5, 9, INTENTIONS_PARTIE_JOUEE)   # catalogue, index de placement et caches du processus
+    resultats : Dict[str, Dict[str, Any]] = {}
+    for nom, largeur, hauteur, intentions, description in SCENARIOS :
+        octets = octets_par_objet(lambda seed : _jouer(seed, largeur, hauteur, intentions), n_parties)
+        resultats[nom] = {
+            "octets_par_partie" : round(octets),
+            "parties_par_mo" : round((1 << 20) / octets, 1) if octets > 0 else None,
+            "description" : description,
+        }
+    for nom, creer in objets().items() :
+        resultats[f"objet.{nom}"] = {"octets_par_objet" : round(octets_par_objet(creer, 10_000), 1)}
+    return resultats
+
+
+
+
+def main (argv : Optional[List[str]] = None) -> int :
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.memoire", description="Mémoire retenue par partie")
+    parser.add_argument("--parties", type=int, default=PARTIES_DEFAUT, help="parties gardées vivantes par scénario")
+    parser.add_argument("--sortie", default=None, help="fichier JSON (défaut : sortie standard)")
+    parser.add_argument("--reference", default=None, help="JSON d'un passage précédent, pour comparer (avant / après)")
+    args = parser.parse_args(argv)
+
+    resultats = mesurer(args.parties)
+    reference : Dict[str, Any] = {}
+    if args.reference :
+        with open(args.reference, encoding="utf-8") as f :
+            reference = json.load(f).get("resultats", {})
+
+    for nom, r in resultats.items() :
+        cle = "octets_par_partie" if "octets_par_partie" in r else "octets_par_objet"
+        ligne = f"{nom:<36} {r[cle]:>12.1f} octets"
+        ancien = reference.get(nom, {}).get(cle)
+        if ancien :
+            ligne += f"   avant {ancien:>12.1f}   ({r[cle] / ancien:.0%})"
+        print(ligne, file=sys.stderr)
+
+    rapport = {
+        "meta" : {
+            "date" : time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python" : platform.python_version(),
+            "implementation" : platform.python_implementation(),
+            "parties_par_scenario" : args.parties,
+        },
+        "resultats" : resultats,
+    }
+    if args.sortie :
+        with open(args.sortie, "w", encoding="utf-8") as f :
+            json.dump(rapport, f, indent=2)
+            f.write("\n")
+    else :
+        json.dump(rapport, sys.stdout, indent=2)
+        print()
+    return 0
+
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
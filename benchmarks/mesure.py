@@ -0,0 +1,142 @@
+# mesure d'un cas de benchmark : débit, percentiles par appel, pic mémoire
+
+from __future__ import annotations
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+DUREE_DEFAUT = 1.0          # secondes de mesure par cas (hors échauffement)
+ECHAUFFEMENT = 0.1          # secondes d'exécution non mesurées (caches, index de placement ...)
+APPELS_MEMOIRE = 20         # appels exécutés sous tracemalloc (qui ralentit trop pour la mesure de temps)
+
+
+
+
+@dataclass
+class Cas :
+    """
+    Un cas de benchmark.
+
+    Attributs
+    ---------
+    nom : str
+        Identifiant (ex : "grille.deplacer_joueur"), clé dans le JSON.
+    preparer : Callable[[], Tuple[Callable[[], Any], Optional[Callable[[], None]]]]
+        Construit l'état du cas et renvoie (fonction, avant_appel) : la fonction chronométrée (appelée sans argument)
+        et, si besoin, une fonction exécutée avant chaque appel hors chronométrage (ex : restaurer l'état que l'appel consomme).
+    description : str
+    """
+    nom : str
+    preparer : Callable[[], Tuple[Callable[[], Any], Optional[Callable[[], None]]]]
+    description : str = ""
+
+
+
+
+@dataclass
+class Resultat :
+    """ Mesures d'un cas (temps en microsecondes, mémoire en octets) """
+    nom : str
+    appels : int
+    ops_par_s : float
+    moyenne_us : float
+    min_us : float
+    p50_us : float
+    p90_us : float
+    p99_us : float
+    max_us : float
+    pic_memoire_octets : int
+    description : str = ""
+
+
+
+    def en_dict (self) -> Dict[str, Any] :
+        return asdict(self)
+
+
+
+
+def percentile (valeurs_triees : List[int], p : float) -> int :
+    """ Percentile (rang le plus proche) d'une liste déjà triée """
+    if not valeurs_triees :
+        return 0
+    rang = min(len(valeurs_triees) - 1, max(0, round(p / 100 * len(valeurs_triees) + 0.5) - 1))
+    return valeurs_triees[rang]
+
+
+
+
+def mesurer (cas : Cas, duree : float = DUREE_DEFAUT) -> Resultat :
+    """
+    Exécute un cas : échauffement, chronométrage appel par appel pendant `duree` secondes, puis quelques appels
+    sous tracemalloc pour le pic mémoire.
+
+    Paramètres
+    ----------
+    cas : Cas
+    duree : float
+        Durée de la phase chronométrée, en secondes.
+
+    Returns
+    -------
+    Resultat
+    """
+    fonction, avant = cas.preparer()
+    horloge = time.perf_counter_ns
+
+    fin = horloge() + int(ECHAUFFEMENT * 1e9)
+    while horloge() < fin :
+        if avant is not None :
+            avant()
+        fonction()
+
+    temps : List[int] = []
+    gc_actif = gc.isenabled()
+    gc.disable()   # pas de collection au milieu d'un appel chronométré
+    try :
+        fin = horloge() + int(duree * 1e9)
+        while True :
+            if avant is not None :
+                avant()
+            t0 = horloge()
+            fonction()
+            t1 = horloge()
+            temps.append(t1 - t0)
+            if t1 >= fin :
+                break
+    finally :
+        if gc_actif :
+            gc.enable()
+
+    pic = 0
+    tracemalloc.start()
+    try :
+        for _ in range(APPELS_MEMOIRE) :
+            if avant is not None :
+                avant()
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            fonction()
+            _, pic_appel = tracemalloc.get_traced_memory()
+            pic = max(pic, pic_appel - base)   # mémoire allouée en plus pendant l'appel
+    finally :
+        tracemalloc.stop()
+
+    total = sum(temps)
+    temps.sort()
+    return Resultat(
+        nom=cas.nom,
+        appels=len(temps),
+        ops_par_s=len(temps) / (total / 1e9) if total else 0.0,
+        moyenne_us=total / len(temps) / 1e3,
+        min_us=temps[0] / 1e3,
+        p50_us=percentile(temps, 50) / 1e3,
+        p90_us=percentile(temps, 90) / 1e3,
+        p99_us=percentile(temps, 99) / 1e3,
+        max_us=temps[-1] / 1e3,
+        pic_memoire_octets=pic,
+        description=cas.description,
+    )
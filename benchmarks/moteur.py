@@ -0,0 +1,216 @@
+# cas de benchmark du moteur (sans pygame)
+
+from __future__ import annotations
+from functools import partial
+from itertools import count, cycle
+from typing import List
+
+from benchmarks.mesure import Cas
+from src import butin, sauvegarde
+from src.accessibilite import Accessibilite
+from src.Game import Game
+from src.Piece import PiecePosee
+from src.Pioche import catalogue_partage
+from src.sim import jouer_partie
+
+
+SEED = 1
+CIBLE = (2, 7)   # case au nord de l'entrée : la porte entre les deux est ouverte dès le départ
+GRAND = (50, 90)   # grand manoir : le coût d'un déplacement ne doit pas dépendre de la taille de la grille
+
+
+
+
+def corridor_ns () :
+    return next(p for p in catalogue_partage() if p.nom == "Corridor" and p.forme.nom == "couloir_ns")
+
+
+
+
+def _cible (game : Game) :
+    x, y = game.grille.entree
+    return x, y - 1
+
+
+
+def _grille_deplacer_joueur (largeur : int = 5, hauteur : int = 9) :
+    game = Game(SEED, largeur, hauteur)
+    corridor_ns().poser_piece(game.grille, *_cible(game))
+    grille, joueur, inv = game.grille, game.joueur, game.inv
+    sens = cycle(((0, -1), (0, 1)))   # aller-retour entre l'entrée et le couloir
+
+    def fonction () :
+        dx, dy = next(sens)
+        grille.deplacer_joueur(joueur, inv, dx, dy)
+
+    return fonction, None
+
+
+
+
+def _pioche_tirage_3_pieces () :
+    game = Game(SEED)
+    pioche, grille, boosts = game.pioche_pieces, game.grille, game.boosts_pioche_par_couleur
+    x, y = CIBLE
+
+    def fonction () :
+        pioche.tirage_3_pieces(grille, x, y, "S", boosts=boosts)
+
+    return fonction, None
+
+
+
+
+def _piece_peut_etre_posee () :
+    game = Game(SEED)
+    grille = game.grille
+    modeles = catalogue_partage()
+    x, y = CIBLE
+
+    def fonction () :   # un appel = tout le catalogue testé sur la case
+        for m in modeles :
+            m.peut_etre_posee(grille, x, y, "S")
+
+    return fonction, None
+
+
+
+
+def _piece_effet_entree () :
+    base = sauvegarde.encoder(Game(SEED))
+    modeles = cycle(catalogue_partage())
+    etat = {}
+
+    def avant () :   # partie neuve, joueur sur une pièce qui n'a pas encore donné sa récompense
+        game = sauvegarde.decoder(base)
+        posee = PiecePosee(next(modeles))
+        game.grille.placer_piece(*CIBLE, posee)
+        game.joueur.position = CIBLE
+        etat["game"], etat["posee"] = game, posee
+
+    def fonction () :
+        etat["posee"].effet_entree(etat["game"])
+
+    return fonction, avant
+
+
+
+
+def _butin_tirer () :
+    game = Game(SEED)
+    rng, inv = game.rng_butin, game.inv
+    inv.chance_objets = 0.7   # chance de la chambre de bonne : table re-pondérée (compilée une fois)
+
+    def fonction () :
+        butin.COFFRE.tirer(rng, inv)
+
+    return fonction, None
+
+
+
+
+def _game_handle_deplacement (largeur : int = 5, hauteur : int = 9) :
+    base = sauvegarde.encoder(Game(SEED, largeur, hauteur))
+    etat = {}
+
+    def avant () :
+        etat["game"] = sauvegarde.decoder(base)
+
+    def fonction () :   # porte ouverte vers une case vide : déclenche un tirage
+        etat["game"].handle_deplacement(0, -1)
+
+    return fonction, avant
+
+
+
+
+def _accessibilite_franchissables (largeur : int = 5, hauteur : int = 9) :
+    game = Game(SEED, largeur, hauteur)
+    x, y = _cible(game)
+    corridor_ns().poser_piece(game.grille, x, y)
+    acces, inv = game.accessibilite, game.inv
+
+    def fonction () :   # grille inchangée depuis l'appel précédent : chemin courant après un déplacement
+        acces.franchissables(x, y, inv)
+
+    return fonction, None
+
+
+
+
+def _accessibilite_reconstruire () :
+    game = Game(SEED)
+    corridor_ns().poser_piece(game.grille, *CIBLE)
+    grille = game.grille
+
+    def fonction () :
+        Accessibilite(grille)
+
+    return fonction, None
+
+
+
+
+def _game_clone () :
+    game = Game(SEED)
+    corridor_ns().poser_piece(game.grille, *CIBLE)
+
+    def fonction () :
+        game.clone()
+
+    return fonction, None
+
+
+
+
+def _partie_aleatoire () :
+    seeds = count()
+
+    def fonction () :
+        jouer_partie(next(seeds), "aleatoire")
+
+    return fonction, None
+
+
+
+
+def _sauvegarde_encoder () :
+    game = Game(SEED)
+
+    def fonction () :
+        sauvegarde.encoder(game)
+
+    return fonction, None
+
+
+
+
+def _sauvegarde_decoder () :
+    donnees = sauvegarde.encoder(Game(SEED))
+
+    def fonction () :
+        sauvegarde.decoder(donnees)
+
+    return fonction, None
+
+
+
+
+def cas () -> List[Cas] :
+    return [
+        Cas("grille.deplacer_joueur", _grille_deplacer_joueur, "aller-retour par une porte ouverte"),
+        Cas("pioche.tirage_3_pieces", _pioche_tirage_3_pieces, "tirage au nord de l'entrée"),
+        Cas("piece.peut_etre_posee", _piece_peut_etre_posee, "un appel = tout le catalogue de base"),
+        Cas("piece.effet_entree", _piece_effet_entree, "modèles du catalogue tour à tour, partie neuve à chaque appel"),
+        Cas("butin.tirer", _butin_tirer, "objet d'un coffre, chances de l'inventaire appliquées"),
+        Cas("game.handle_deplacement", _game_handle_deplacement, "déplacement qui déclenche un tirage"),
+        Cas("grille.deplacer_joueur.50x90", partial(_grille_deplacer_joueur, *GRAND), "même cas, grille 50 x 90"),
+        Cas("game.handle_deplacement.50x90", partial(_game_handle_deplacement, *GRAND), "même cas, grille 50 x 90"),
+        Cas("game.clone", _game_clone, "copie d'une partie (pioche copiée sur écriture)"),
+        Cas("accessibilite.franchissables", _accessibilite_franchissables, "portes de frontière franchissables, grille inchangée"),
+        Cas("accessibilite.franchissables.50x90", partial(_accessibilite_franchissables, *GRAND), "même cas, grille 50 x 90"),
+        Cas("accessibilite.reconstruire", _accessibilite_reconstruire, "composantes recalculées depuis la grille"),
+        Cas("partie.aleatoire", _partie_aleatoire, "partie complète, politique aléatoire (src.sim)"),
+        Cas("sauvegarde.encoder", _sauvegarde_encoder, "partie au départ"),
+        Cas("sauvegarde.decoder", _sauvegarde_decoder, "partie au départ"),
+    ]
@@ -0,0 +1,77 @@
+# cas de benchmark du rendu : Renderer.render sur un écran hors ligne (pilote vidéo SDL "dummy")
+
+from __future__ import annotations
+import os
+from typing import List, Optional
+
+from benchmarks.mesure import Cas
+from benchmarks.moteur import CIBLE, SEED, corridor_ns
+from src.Game import Game
+
+try :
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")   # avant l'import : aucune fenêtre n'est ouverte
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    import pygame
+except ImportError :   # pygame absent : les cas de rendu sont ignorés
+    pygame = None
+
+LARGEUR_ECRAN = 900
+HAUTEUR_ECRAN = 720
+
+
+
+
+def indisponible () -> Optional[str] :
+    """ Raison pour laquelle les cas de rendu ne peuvent pas tourner (None s'ils le peuvent) """
+    if pygame is None :
+        return "pygame n'est pas installé"
+    return None
+
+
+
+
+def _ecran_et_renderer () :
+    from ui.renderer import Renderer   # importe pygame : seulement si les cas sont exécutés
+    pygame.init()
+    ecran = pygame.display.set_mode((LARGEUR_ECRAN, HAUTEUR_ECRAN))
+    return ecran, Renderer()
+
+
+
+
+def _render_complet () :
+    ecran, renderer = _ecran_et_renderer()
+    game = Game(SEED)
+
+    def fonction () :
+        renderer.render(ecran, game)
+
+    return fonction, renderer.invalider
+
+
+
+
+def _render_deplacement () :
+    ecran, renderer = _ecran_et_renderer()
+    game = Game(SEED)
+    corridor_ns().poser_piece(game.grille, *CIBLE)
+    renderer.render(ecran, game)
+    positions = [game.grille.entree, CIBLE]
+
+    def avant () :   # le joueur change de case : seules les deux cases et le HUD sont à redessiner
+        positions.reverse()
+        game.joueur.position = positions[0]
+
+    def fonction () :
+        renderer.render(ecran, game)
+
+    return fonction, avant
+
+
+
+
+def cas () -> List[Cas] :
+    return [
+        Cas("renderer.render_complet", _render_complet, "écran entier redessiné (après invalider)"),
+        Cas("renderer.render_deplacement", _render_deplacement, "régions sales après un déplacement du joueur"),
+    ]
@@ -159,11 +159,15 @@ class Coffre :
         Nombre maximum d'objets à générer lors de l'ouverture.
     contenu_possibles : Optional[List[Optional[AutreObjet]]]
         Liste d'objets possibles (None représente un emplacement vide).
+    rng : Optional[random.Random]
+        Flux d'aléa du contenu (Game.rng_contenants) ; module random par défaut.
 
     Attributs
     ---------
     contenu_possibles : List[AutreObjet] 
         Objets disponibles dans le coffre.
+    rng : random.Random
+        Flux d'aléa utilisé pour le nombre et le choix des objets.
     nb_objets : int
         Nombre d'objets qui seront tirés aléatoirement à l'ouverture.
 
@@ -175,19 +179,20 @@ class Coffre :
         Sinon applique les objets trouvés à l'inventaire et retourne un résumé des objets récupérés.
     """
     
-    def __init__(self, min_objets: int = 1, max_objets: int = 3, contenu_possibles: Optional[List[AutreObjet]] = None):
+    def __init__(self, min_objets: int = 1, max_objets: int = 3, contenu_possibles: Optional[List[AutreObjet]] = None, rng: Optional[random.Random] = None):
         # Par défaut, le coffre peut contenir un des objets consommables
         if contenu_possibles is None:
             contenu_possibles = [Pomme(), Banane(), Gateau(), Sandwich(), Repas()]
         self.contenu_possibles = contenu_possibles
-        self.nb_objets = random.randint(min_objets, max_objets)  # Nombre d'objets réellement dans le coffre
+        self.rng = rng if rng is not None else random
+        self.nb_objets = self.rng.randint(min_objets, max_objets)  # Nombre d'objets réellement dans le coffre
 
     def ouvrir(self, inv : 'Inventaire') -> str :
         """Ouvre le coffre si le joueur possède une clé ou un marteau."""
         if not inv.ouvrir_coffre() :   # inv.ouvrir_coffre encapsule la règle 
             return "Le coffre est verrouillé. Il faut une clé ou un marteau"
         
-        objets_trouves = random.choices(self.contenu_possibles, k=self.nb_objets)
+        objets_trouves = self.rng.choices(self.contenu_possibles, k=self.nb_objets)
         noms_trouves = []
         for obj in objets_trouves:
             obj.appliquer(inv)
@@ -205,6 +210,7 @@ class Casier:
     min_objets (int): nombre minimum d'objets à générer lors de l'ouverture.
     max_objets (int): nombre maximum d'objets à générer lors de l'ouverture.
     contenu_possibles (Optional[List[Optional[AutreObjet]]]): liste d'objets possibles (None représente un emplacement vide).
+    rng (Optional[random.Random]): flux d'aléa du contenu (Game.rng_contenants) ; module random par défaut.
 
     Attributs
     ---------
@@ -219,18 +225,19 @@ class Casier:
         Sinon, applique les objets trouvés à l'inventaire et retourne un résumé des objets récupérés.
     """
     
-    def __init__(self, min_objets: int = 1, max_objets: int = 2, contenu_possibles: Optional[List[Optional[AutreObjet]]] = None):
+    def __init__(self, min_objets: int = 1, max_objets: int = 2, contenu_possibles: Optional[List[Optional[AutreObjet]]] = None, rng: Optional[random.Random] = None):
         if contenu_possibles is None:
             contenu_possibles = [None, Pomme(), Gateau(), Repas(), Sandwich(), Banane()]
         self.contenu_possibles = contenu_possibles
-        self.nb_objets = random.randint(min_objets, max_objets)
+        self.rng = rng if rng is not None else random
+        self.nb_objets = self.rng.randint(min_objets, max_objets)
 
     def ouvrir_casier(self, inv: 'Inventaire') -> str :
         """Ouvre le casier si le joueur possède une clé."""
         if not inv.depenser_cles(1) :
             return "Vous avez besoin d'une clé pour ouvrir ce casier."
         
-        objets_trouves = random.choices(self.contenu_possibles, k=self.nb_objets)
+        objets_trouves = self.rng.choices(self.contenu_possibles, k=self.nb_objets)
         noms_trouves = []
         for obj in objets_trouves:
             if obj:
@@ -250,6 +257,7 @@ class EndroitCreuser :
     min_objets (int): nombre minimum d'objets à générer lors du creusage.
     max_objets (int): nombre maximum d'objets à générer lors du creusage.
     contenu_possibles (Optional[List[Optional[AutreObjet]]]): liste d'objets possibles (None représente un emplacement vide).
+    rng (Optional[random.Random]): flux d'aléa du contenu (Game.rng_contenants) ; module random par défaut.
     Attributs
     ---------
         contenu_possibles (List[Optional[AutreObjet]]): Liste des objets pouvant être trouvés.
@@ -260,11 +268,12 @@ class EndroitCreuser :
             Permet de creuser si le joueur possède une pelle et retourne les objets trouvés.
     """
     
-    def __init__(self, min_objets: int = 1, max_objets: int = 2, contenu_possibles: Optional[List[Optional[AutreObjet]]] = None):
+    def __init__(self, min_objets: int = 1, max_objets: int = 2, contenu_possibles: Optional[List[Optional[AutreObjet]]] = None, rng: Optional[random.Random] = None):
         if contenu_possibles is None:
             contenu_possibles = [None, Pomme(), Banane()]
         self.contenu_possibles = contenu_possibles
-        self.nb_objets = random.randint(min_objets, max_objets)
+        self.rng = rng if rng is not None else random
+        self.nb_objets = self.rng.randint(min_objets, max_objets)
 
     def creuser(self, inv: 'Inventaire'):
         """Creuse si le joueur possède une pelle."""
@@ -272,7 +281,7 @@ class EndroitCreuser :
         if not inv.creuser() :
             return " Vous avez besoin d'une pelle pour creuser."
         
-        objets_trouves = random.choices(self.contenu_possibles, k=self.nb_objets)
+        objets_trouves = self.rng.choices(self.contenu_possibles, k=self.nb_objets)
         noms_trouves = []
         for obj in objets_trouves:
             if obj:
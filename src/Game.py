@@ -1,13 +1,99 @@
 from src.Grille import Grille
 from src.Joueur import Joueur
-from src.Piece import Piece, CouleurPiece, FORME_CROIX
-from src.Pioche import Pioche
+from src.Piece import Piece, PiecePosee, CouleurPiece, FORME_CROIX
+from src.Pioche import pioche_neuve
 from src.AutreObjet import Coffre, Casier, EndroitCreuser
-from typing import Dict, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, TextIO, Tuple
+import functools
 import random
-from src.AutreObjet import AutreObjet, Banane, Gateau, Pomme, Repas, Sandwich
-from src.ObjetPermanent import DetecteurMetaux, KitCrochetage, Marteau, ObjetPermanent, PatteLapin, Pelle
 from src.Piece import FORME_T_ONE, OPPOSE
+from src import butin, chrono, trace
+from src.accessibilite import Accessibilite
+from src.effets import effets_modele
+from src.alea import AleaCompact
+
+
+
+ENTREE = Piece("Entrance", CouleurPiece.BLEU, FORME_T_ONE)   # modèle de la pièce de départ, partagé par toutes les parties
+
+TRACE_JEU = trace.canal("jeu")
+
+# un flux d'aléa indépendant par sous-système : tirer plus ou moins de niveaux de portes ne décale pas le butin, etc.
+FLUX_ALEATOIRES = ("portes", "tirage", "butin", "contenants")
+
+CODES_CLES = ("cle", "cle5", "kit_crochetage")   # offres de magasin qui ouvrent des portes fermées
+
+
+
+def flux_aleatoire (seed : int, nom : str) -> AleaCompact :
+    """
+    Flux nommé dérivé de la graine de la partie (même graine et même nom -> mêmes tirages, quel que soit le processus).
+    Etat de 8 octets : il tient dans une sauvegarde (cf. src.sauvegarde).
+    """
+    return AleaCompact(f"{seed}:{nom}")
+
+
+
+def offres_magasin (nom : str) -> List[Tuple[str, int, str]] :
+    """ Offres (libellé, prix, code) d'une pièce magasin d'après son nom """
+    nom = nom.lower()
+
+    if "kitchen" in nom :
+        offres = [
+        ("Pomme",1, "pomme"),
+        ("Banane",1, "banane"),
+        ("Gâteau", 2, "gateau"),
+        ("Sandwich",2, "sandwich"),
+        ("Repas", 3, "repas"),
+        ]
+
+    elif "commissary" in nom :
+        offres = [
+            ("Pelle (permanente)", 5, "pelle"),
+            ("Marteau (permanent)", 5, "marteau"),
+            ("Kit de crochetage", 4, "kit_crochetage"),
+            ("2 Dés", 1, "des")
+        ]
+
+    elif "locksmith" in nom :
+        offres = [
+            ("Clé",1, "cle"),
+            ("5 clés",3, "cle5"),
+            ("Kit de crochetage", 5, "kit_crochetage"),
+        ]
+    
+    else:
+        offres = [
+            ("Clé", 3, "cle"),
+            ("Pomme", 1, "pomme"),
+            ("Pelle (permanente)", 6, "pelle"),
+        ]
+
+    return offres
+
+
+
+def modifie_etat (methode : Callable) -> Callable :
+    """
+    Décorateur des handle_* : incrémente game.version après l'action, pour que l'affichage sache qu'il doit se rafraîchir.
+    Si le chronométrage est actif (cf. src.chrono), la durée de l'appel va dans la série "jeu.<nom de la méthode>".
+    """
+    serie = f"jeu.{methode.__name__}"
+
+    @functools.wraps(methode)
+    def enveloppe (self, *args, **kwargs) :
+        if not chrono.actif :
+            try :
+                return methode(self, *args, **kwargs)
+            finally :
+                self.version += 1
+        debut = chrono.maintenant()
+        try :
+            return methode(self, *args, **kwargs)
+        finally :
+            self.version += 1
+            chrono.enregistrer(serie, chrono.maintenant() - debut)
+    return enveloppe
 
 
 
@@ -16,16 +102,31 @@ class Game:
     """
     Représente la logique principale du jeu.
 
+    Paramètres
+    ----------
+    seed : int | None
+        Graine de la partie (tirée au hasard si non fournie).
+    largeur, hauteur : int
+        Dimensions du manoir (5 x 9 par défaut) ; le joueur part de l'entrée (Grille.entree), au milieu de la rangée du bas.
+
     Attributs
     ---------
     grille : Grille
         Instance de la grille du jeu.
+    accessibilite : Accessibilite
+        Pièces atteignables depuis le joueur et portes de leur frontière (détection du blocage).
     joueur : Joueur
         Instance du joueur.
     inv : Inventaire
         Inventaire du joueur.
     pioche_pieces : Pioche
         Instance de la pioche de pièces.
+    seed : int
+        Graine de la partie (tirée au hasard si non fournie).
+    rng_portes, rng_tirage, rng_butin, rng_contenants : AleaCompact
+        Flux d'aléa indépendants : niveaux des portes, tirages de pièces, objets trouvés, contenu des coffres/casiers/endroits à creuser.
+    version : int
+        Incrémenté par chaque handle_* (décorateur modifie_etat) : tant qu'il ne bouge pas, il n'y a rien à redessiner.
     state : str
         État actuel du jeu (exploration, tirage, victoire, game_over, achat).
     tour : int
@@ -51,10 +152,14 @@ class Game:
 
     Méthodes
     --------
-    __init__() :
-        Initialise la partie, la grille, le joueur, la pioche et les états.
+    __init__(seed=None, largeur=5, hauteur=9) :
+        Initialise la partie, les flux d'aléa, la grille, le joueur, la pioche et les états.
+    clone() -> Game
+        Copie indépendante de la partie, qui partage tout ce qui est immuable (pour explorer des coups).
     _verifier_conditions_fin()
         Vérifie conditions de fin de partie (épuisement, blocage, sortie).
+    handle_intentions(actions)
+        Applique un dictionnaire d'intentions (format InputHandler.actions()) selon l'état courant.
     handle_deplacement(dx, dy)
         Gère le déplacement du joueur en mode exploration.
     handle_choix_tirage(mvt) 
@@ -89,16 +194,25 @@ class Game:
         Déplace le curseur sur l'écran de Game Over.
     handle_confirmation_game_over() 
         Valide le choix sur l'écran de Game Over (rejouer/quitter).
-    _diagnostic_blocage() 
-        Affiche des informations de debug pour expliquer un blocage.
+    _cles_a_portee() -> bool
+        Indique si une clé ou le kit de crochetage peut encore être obtenu sans franchir de nouvelle porte.
+    _diagnostic_blocage(fichier=None, n_evenements=50) -> str
+        Décrit un blocage (voisinage et derniers événements tracés), pour debug.
     """
 
-    def __init__(self):
+    def __init__(self, seed : Optional[int] = None, largeur : int = 5, hauteur : int = 9):
+
+        self.version : int = getattr(self, "version", -1) + 1   # survit à une nouvelle partie (__init__ rappelé) : toujours croissant
+        self.seed : int = seed if seed is not None else random.getrandbits(32)
+        self.rng_portes = flux_aleatoire(self.seed, "portes")
+        self.rng_tirage = flux_aleatoire(self.seed, "tirage")
+        self.rng_butin = flux_aleatoire(self.seed, "butin")
+        self.rng_contenants = flux_aleatoire(self.seed, "contenants")
 
-        self.grille = Grille()
-        self.joueur = Joueur()
+        self.grille = Grille(largeur, hauteur, rng=self.rng_portes)
+        self.joueur = Joueur(self.grille.entree)
         self.inv = self.joueur.inventaire
-        self.pioche_pieces = Pioche()
+        self.pioche_pieces = pioche_neuve(self.rng_tirage)
         self.state : str = "exploration"  # autres états : "tirage", "victoire", "game_over", "achat"
         self.tour = 0  # compteur de tours
         self.last_message = "" # dernier message temporaire à afficher à l'écran
@@ -120,30 +234,150 @@ class Game:
         # il faut qu il y ait une piece au depart a la position du joueur 
         x0, y0 = self.joueur.position
 
-        if not self.grille.deplacement_permis(x0,y0) :
-            x0 = self.grille.largeur // 2
-            y0 = self.grille.hauteur - 1
-            self.joueur.position = (x0, y0)
-
         if self.grille.get_piece(x0,y0) is None :
-            piece_a_placer = Piece("Entrance", CouleurPiece.BLEU, FORME_T_ONE)
-            self.grille.placer_piece(x0, y0, piece_a_placer)
+            self.grille.placer_piece(x0, y0, PiecePosee(ENTREE))
 
 
         nx, ny = self.grille.voisin(x0, y0, "N")
         if self.grille.deplacement_permis(nx, ny):
             porte_n = self.grille.garantie_porte(x0, y0, "N", niveau=0)
-            porte_n.ouverte = True
-            # miroir
-            self.grille.dict_portes(nx, ny)["S"].ouverte = True
+            porte_n.ouverte = True   # le mur est partagé : ouvert aussi côté (nx, ny)
+
+        self.accessibilite = Accessibilite(self.grille)
 
         # Fin de partei, rejouer ?
         self.game_over_selection = 0  # 0 = Oui, 1 = Non
         self.rejouer_options = ["Oui", "Non"]
 
+
+
+
+    def clone (self) -> 'Game' :
+        """
+        Copie indépendante de la partie, pour explorer des coups sans toucher à l'originale :
+        jouer les mêmes intentions sur les deux donne la même partie (les flux d'aléa sont copiés, pas réinitialisés).
+        Les modèles de pièces sont partagés, la pioche est copiée sur écriture (cf. Pioche.copier) ;
+        grille, inventaire, boosts, ressources et contextes sont dupliqués.
+
+        Paramètres
+        ----------
+            None
+
+        Returns
+        -------
+            Game
+        """
+        copie = Game.__new__(Game)
+        copie.version = self.version
+        copie.seed = self.seed
+        copie.rng_portes = self.rng_portes.copier()
+        copie.rng_tirage = self.rng_tirage.copier()
+        copie.rng_butin = self.rng_butin.copier()
+        copie.rng_contenants = self.rng_contenants.copier()
+
+        copie.grille = self.grille.copier(rng=copie.rng_portes)
+        copie.accessibilite = self.accessibilite.copier(copie.grille)
+        copie.joueur = self.joueur.copier()
+        copie.inv = copie.joueur.inventaire
+        copie.pioche_pieces = self.pioche_pieces.copier(rng=copie.rng_tirage)
+        copie.state = self.state
+        copie.tour = self.tour
+        copie.last_message = self.last_message
+
+        copie.boosts_pioche_par_couleur = dict(self.boosts_pioche_par_couleur)
+        copie.boosts_loot = dict(self.boosts_loot)
+        copie.ressources_grille = {position : dict(r) for position, r in self.ressources_grille.items()}
+
+        def piece_copiee (posee : Optional[PiecePosee]) -> Optional[PiecePosee] :   # les contextes désignent des pièces de la grille
+            position = self.grille.position_piece(posee) if posee is not None else None
+            return copie.grille.get_piece(*position) if position is not None else None
+
+        copie.tirage_en_cours = dict(self.tirage_en_cours) if self.tirage_en_cours else self.tirage_en_cours   # la liste des pièces est remplacée, jamais modifiée
+        copie.contexte_achat = self.contexte_achat
+        if self.contexte_achat :
+            copie.contexte_achat = dict(self.contexte_achat, piece=piece_copiee(self.contexte_achat.get("piece")))
+        copie.contexte_special = self.contexte_special
+        if self.contexte_special :
+            copie.contexte_special = dict(self.contexte_special, piece=piece_copiee(self.contexte_special.get("piece")))
+
+        copie.game_over_selection = self.game_over_selection
+        copie.rejouer_options = self.rejouer_options   # constante ["Oui", "Non"]
+        return copie
+
+
+
+
+    def handle_intentions(self, actions : Dict[str, Any]) -> None :
+        """
+        Applique les intentions du joueur selon l'état courant du jeu.
+        Même répartition que la boucle pygame : l'UI, la simulation headless et les
+        autres pilotes passent tous par ici.
+
+        Paramètres
+        ----------
+            actions (Dict[str, Any]): intentions au format InputHandler.actions()
+                ('deplacer', 'ouvrir', 'creuser', 'confirmer', 'relancer_tirage', 'annuler', 'nav_game_over')
+
+        Returns
+        -------
+            None
+        """
+
+        # GAME OVER
+        if self.state == "game_over" :
+            if 'nav_game_over' in actions :
+                self.handle_navigation_game_over(actions['nav_game_over'])
+            if actions.get('confirmer') :
+                self.handle_confirmation_game_over()
+            return
+
+        if self.state == "exploration" :
+
+            if "deplacer" in actions :
+                dx, dy = actions["deplacer"]
+                self.handle_deplacement(dx, dy)
+
+            if "ouvrir" in actions :
+                self.handle_ouvrir_sur_piece_courante()
+
+            if "creuser" in actions :
+                self.handle_ouvrir_sur_piece_courante()
+
+        # pas de elif : un déplacement qui déclenche un tirage est aussi lu par l'écran de tirage
+        if self.state == "tirage" :
+            if "deplacer" in actions :
+                dx, dy = actions["deplacer"]
+
+                if dx == -1 :  # gauche
+                    self.handle_choix_tirage(-1)
+
+                if dx == 1 :  # droite
+                    self.handle_choix_tirage(1)
+
+            if 'confirmer' in actions :
+                self.handle_confirmation_tirage()
+
+            if 'relancer_tirage' in actions :
+                self.handle_re_tirage()
+
+        elif self.state == "achat" :
+
+            # ENTER : acheter l'offre sélectionnée
+            if "confirmer" in actions or "ouvrir" in actions :
+                self.handle_confirmation_magasin()
+
+            # ESC : quitter le magasin
+            if "annuler" in actions :
+                self.handle_quitter_magasin()
+            elif "deplacer" in actions :
+                dx, dy = actions["deplacer"]
+                if dx != 0 or dy != 0 :
+                    self.handle_navigation_magasin(dx)
+
     
 
 
+    @modifie_etat
     def handle_deplacement(self, dx : int, dy : int) -> None : # gestion globale du moove du jouer / différent de def dans classe grille qui gère les aspects spatiaux 
         """
         Déplace le joueur dans une direction donnée.
@@ -184,6 +418,9 @@ class Game:
             new_y = y + dy
 
             if (new_x, new_y) == self.grille.sortie :
+                # l'antichambre n'est jamais tirée : franchir sa porte suffit pour sortir
+                self.joueur.position = (new_x, new_y)
+                self.inv.utiliser_pas(1)
                 self._verifier_conditions_fin()
                 return
             
@@ -210,6 +447,7 @@ class Game:
 
 
 
+    @modifie_etat
     def handle_choix_tirage (self, mvt : int) -> None :
         """
         Gère le déplacement du curseur de sélection durant le tirage.
@@ -237,6 +475,7 @@ class Game:
 
 
 
+    @modifie_etat
     def handle_confirmation_tirage (self) -> None :
         """
         Valide le choix de pièce lors d'un tirage et l'applique à la grille.
@@ -265,24 +504,44 @@ class Game:
                 return # on ne peut pas valider si on a pas assex de gemmes
             
 
-        piece.poser_piece(self.grille, cible_x, cible_y)
-        piece.effet_tirage(self)
-        piece.effet_modif_pioche(self)
-        piece.effet_modif_objets(self)
-        piece.effet_ajout_catalogue(self)
-        # (la dispersion peut être déclenchée ici aussi si c'est une pièce de ce type)
-        if "dispersion" in piece.tags:
-            piece.effet_dispersion(self)
+        piece.poser_piece(self.grille, cible_x, cible_y)   # crée l'instance posée, le modèle reste partagé
+        piece.effet_tirage(self)   # boosts, ajouts à la pioche, dispersion (cf. src.effets)
 
         self.tirage_en_cours = None
         self.state = "exploration"
 
         self.tirage_en_cours = None # fin phase tirage
         self.state = "exploration"
+        self._verifier_conditions_fin()   # la pièce posée peut n'ouvrir que sur des portes infranchissables
+
+
+
+
+    def contenant_ouvrable (self) -> bool :
+        """
+        Le contenant du contexte spécial (casier, coffre, endroit à creuser) peut-il être ouvert avec l'inventaire actuel ?
+        Mêmes règles que handle_ouvrir_sur_piece_courante, à blanc : un échec y laisse le contexte en place.
+
+        Returns
+        -------
+        bool
+            False s'il n'y a pas de contenant en attente.
+        """
+        if not self.contexte_special :
+            return False
+        kind = self.contexte_special.get("type")
+        if kind == "casier" :
+            return self.inv.ouvrir_casier(dry_run=True)
+        if kind == "coffre" :
+            return self.inv.ouvrir_coffre(dry_run=True)
+        if kind == "creuser" :
+            return self.inv.creuser(dry_run=True)
+        return False
 
 
 
 
+    @modifie_etat
     def handle_ouvrir_sur_piece_courante(self):
         
         """
@@ -309,9 +568,8 @@ class Game:
         # casier -> 2.2 : "ouverts uniquement avec des clés"
         if kind == "casier":
             if self.inv.ouvrir_casier():
-                # on donne un consommable aléatoire
-                obj = random.choice([Pomme(), Banane(), Gateau(), Sandwich(), Repas()])
-                obj.appliquer(self.inv)
+                # on donne un objet de la table du casier (cf. src.butin)
+                self._donner_butin(butin.CASIER)
                 # on peut vider le contexte après ouverture
                 self.contexte_special = None
             else:
@@ -323,8 +581,7 @@ class Game:
         # coffre
         elif kind == "coffre":
             if self.inv.ouvrir_coffre():
-                obj = random.choice([Pomme(), Banane(), Gateau(), Sandwich(), Repas()])
-                obj.appliquer(self.inv)
+                self._donner_butin(butin.COFFRE)
                 self.contexte_special = None
             else:
                 message = "Vous n'avez pas de clé ni de marteau pour ouvrir ce coffre."
@@ -334,17 +591,29 @@ class Game:
         # endroit à creuser
         elif kind == "creuser":
             if self.inv.creuser():
-                obj = random.choice([Pomme(), Banane(), Gateau()])
-                obj.appliquer(self.inv)
+                self._donner_butin(butin.CREUSER)
                 self.contexte_special = None
             else:
                 message = "Vous n'avez pas de pelle pour creuser."
                 self.last_message = message
                 pass
 
+        if self.contexte_special is None :   # ouverture réussie : elle a pu coûter la dernière clé
+            self._verifier_conditions_fin()
+
+
+
+
+    def _donner_butin (self, table : 'butin.TableButin') -> None :
+        """ Tire un objet de la table (pondérée par les chances de l'inventaire) et l'applique ; None = rien trouvé """
+        obj = table.tirer(self.rng_butin, self.inv)
+        if obj is not None :
+            obj.appliquer(self.inv)
+
     
 
 
+    @modifie_etat
     def handle_re_tirage (self) -> None :
         """
         Relancer le tirage des pièces avec un dé.
@@ -371,7 +640,7 @@ class Game:
         cible_x, cible_y = self.tirage_en_cours["cible"]
         dir_entree = self.tirage_en_cours["dir_entree"]
 
-        pieces = self.pioche_pieces.tirage_3_pieces(self.grille, cible_x, cible_y, dir_entree)
+        pieces = self.pioche_pieces.tirage_3_pieces(self.grille, cible_x, cible_y, dir_entree, boosts=self.boosts_pioche_par_couleur)
         
         if not pieces :
             return
@@ -382,6 +651,7 @@ class Game:
 
 
 
+    @modifie_etat
     def handle_confirmation_magasin(self) -> None:
         """
         Valide l'achat sélectionné en magasin.
@@ -408,37 +678,37 @@ class Game:
 
         # kitchen
         if code == "pomme" :
-            Pomme().appliquer(self.inv)
+            butin.POMME.appliquer(self.inv)
             self.last_message = "vous avez acheté une pomme (+2 pas)."
         
         elif code == "banane" :
-            Banane().appliquer(self.inv)
+            butin.BANANE.appliquer(self.inv)
             self.last_message = "vous avez acheté une banane (+3 pas)."
 
         elif code == "gateau" :
-            Gateau().appliquer(self.inv)
+            butin.GATEAU.appliquer(self.inv)
             self.last_message = "vous avez acheté un gateau (+10 pas)."
 
         elif code == "sandwich" :
-            Sandwich().appliquer(self.inv)
+            butin.SANDWICH.appliquer(self.inv)
             self.last_message = "vous avez acheté un sandwich (+15 pas)."
 
         elif code == "repas" :
-            Repas().appliquer(self.inv)
+            butin.REPAS.appliquer(self.inv)
             self.last_message = "vous avez acheté un repas (+25 pas)."
         
         # comisssariat
         elif code == "pelle":
-            self.inv.ajouter_obj_permanent(Pelle())
+            self.inv.ajouter_obj_permanent(butin.PELLE)
             self.last_message = "vous avez acheté une pelle."
 
         elif code == "marteau":
-            self.inv.ajouter_obj_permanent(Marteau())
+            self.inv.ajouter_obj_permanent(butin.MARTEAU)
             self.last_message = "vous avez acheté un marteau."
         
         # cles + kit crochetage + dés
         elif code == "kit_crochetage":
-            self.inv.ajouter_obj_permanent(KitCrochetage())
+            self.inv.ajouter_obj_permanent(butin.KIT_CROCHETAGE)
             self.last_message = "vous avez acheté un marteau."
 
         elif code == "cle" :
@@ -519,43 +789,13 @@ class Game:
 
 
 
-    def entree_magasin(self, piece : Piece) -> None:
+    def entree_magasin(self, piece : PiecePosee) -> None:
         """
         Appelé quand on entre dans une pièce jaune.
         On prépare les offres et on passe en état 'achat'.
+        Pas de modifie_etat : appelé pendant un handle_* (entrée dans la pièce), qui compte déjà l'action.
         """
-        nom = piece.nom.lower()
-
-        if "kitchen" in nom :
-            offres = [
-            ("Pomme",1, "pomme"),
-            ("Banane",1, "banane"),
-            ("Gâteau", 2, "gateau"),
-            ("Sandwich",2, "sandwich"),
-            ("Repas", 3, "repas"),
-            ]
-
-        elif "commissary" in nom :
-            offres = [
-                ("Pelle (permanente)", 5, "pelle"),
-                ("Marteau (permanent)", 5, "marteau"),
-                ("Kit de crochetage", 4, "kit_crochetage"),
-                ("2 Dés", 1, "des")
-            ]
-
-        elif "locksmith" in nom :
-            offres = [
-                ("Clé",1, "cle"),
-                ("5 clés",3, "cle5"),
-                ("Kit de crochetage", 5, "kit_crochetage"),
-            ]
-        
-        else:
-            offres = [
-                ("Clé", 3, "cle"),
-                ("Pomme", 1, "pomme"),
-                ("Pelle (permanente)", 6, "pelle"),
-            ]
+        offres = offres_magasin(piece.nom)
 
         self.contexte_achat = {
             "piece": piece,
@@ -567,6 +807,7 @@ class Game:
     
 
 
+    @modifie_etat
     def handle_navigation_magasin (self, delta: int) -> None:
         """
         delta = -1 (gauche) ou 1 (droite)
@@ -581,6 +822,7 @@ class Game:
 
 
 
+    @modifie_etat
     def handle_quitter_magasin (self) -> None :
         self.contexte_achat = None
         self.state = "exploration"
@@ -600,6 +842,7 @@ class Game:
 
 
 
+    @modifie_etat
     def handle_navigation_game_over(self, dx: int) -> None:
         """
         Déplacement du curseur sur l'écran de Game Over (Oui / Non)
@@ -616,6 +859,7 @@ class Game:
 
 
 
+    @modifie_etat
     def handle_confirmation_game_over(self) -> None:
         """
         Valide le choix sur l'écran de Game Over.
@@ -626,8 +870,8 @@ class Game:
         choix = self.rejouer_options[self.game_over_selection]
 
         if choix == "Oui":
-            # Relancer une nouvelle partie
-            self.__init__()
+            # Relancer une nouvelle partie (graine suivante : une session reste reproductible)
+            self.__init__(self.seed + 1, self.grille.largeur, self.grille.hauteur)
             self.last_message = "Nouvelle partie !"
         else:
             # Quitter le jeu proprement
@@ -637,35 +881,51 @@ class Game:
 
 
             
-    def _diagnostic_blocage(self):
+    def _diagnostic_blocage(self, fichier : Optional[TextIO] = None, n_evenements : Optional[int] = 50) -> str :
         """
-        Affiche pourquoi le joueur est considéré bloqué : pour debug.
+        Explique pourquoi le joueur est considéré bloqué : état des cases voisines puis derniers événements
+        du tampon de traces (cf. src.trace). Pour debug, appelé à la demande.
+
+        Paramètres
+        ----------
+        fichier : TextIO | None
+            Si fourni, le diagnostic y est aussi écrit.
+        n_evenements : int | None
+            Nombre d'événements récents à inclure (tous si None).
+
+        Returns
+        -------
+        str
+            Le texte du diagnostic.
         """
         x, y = self.joueur.position
-        print("=== DIAGNOSTIC BLOCAGE ===")
-        print(f"Position joueur: {(x,y)}; Pas: {self.inv.pas}; Etat: {self.state}")
+        lignes = ["=== DIAGNOSTIC BLOCAGE ===", f"Position joueur: {(x,y)}; Pas: {self.inv.pas}; Etat: {self.state}"]
+        n0, n1, n2, vides = self.accessibilite.comptes_frontiere(x, y)
+        lignes.append(f"Pièces accessibles: {len(self.accessibilite.composante(x, y))}; portes de frontière: "
+                      f"niveau 0={n0} niveau 1={n1} niveau 2={n2} ouvertes sur case vide={vides}; "
+                      f"clés: {self.inv.cles}; franchissables: {self.accessibilite.franchissables(x, y, self.inv)}")
         for dx, dy, name in [(0,-1,'N'),(0,1,'S'),(1,0,'E'),(-1,0,'O')]:
             nx, ny = x+dx, y+dy
-            in_bounds = 0 <= nx < self.grille.largeur and 0 <= ny < self.grille.hauteur
-            print(f"Voisin {name} -> {(nx,ny)} ; in_bounds: {in_bounds}", end="")
-            if not in_bounds:
-                print(" (hors bornes)")
+            ligne = f"Voisin {name} -> {(nx,ny)}"
+            if not self.grille.deplacement_permis(nx, ny):
+                lignes.append(ligne + " (hors bornes)")
                 continue
             piece = self.grille.get_piece(nx, ny)
-            portes = self.grille.dict_portes(nx, ny) if hasattr(self.grille, "dict_portes") else {}
-            print(f" | piece: {None if piece is None else piece.nom}", end="")
+            ligne += f" | piece: {None if piece is None else piece.nom}"
+            portes = self.grille.dict_portes(nx, ny)
             if portes:
                 for d, p in portes.items():
-                    print(f" | porte[{d}]: ouverte={getattr(p,'ouverte',None)} niveau={getattr(p,'niveau',None)}", end="")
+                    ligne += f" | porte[{d}]: ouverte={p.ouverte} niveau={p.niveau}"
             else:
-                print(" | portes: (aucune)", end="")
-            # est-ce que la grille permet de s'y déplacer ?
-            try:
-                perm = self.grille.deplacement_permis(nx, ny)
-            except Exception as e:
-                perm = f"ERREUR deplacement_permis: {e}"
-            print(f" | deplacement_permis: {perm}")
-        print("=== FIN DIAGNOSTIC ===")
+                ligne += " | portes: (aucune)"
+            lignes.append(ligne)
+        lignes.append("--- derniers événements ---")
+        lignes.extend(trace.derniers(n_evenements))
+        lignes.append("=== FIN DIAGNOSTIC ===")
+        texte = "\n".join(lignes)
+        if fichier is not None:
+            print(texte, file=fichier)
+        return texte
 
 
 
@@ -682,52 +942,69 @@ class Game:
         -------
             Message, Etat du jeu
         """
-        if self.inv.pas <= 0 :
-            self.state = "game_over"
-            self.last_message = "Vous êtes épuisée... plus de pas disponibles !"
-            self.game_over_selection = 0
-            return 
-        
+        # la sortie d'abord : l'atteindre avec son dernier pas est une victoire
         if self.joueur.position == self.grille.sortie :
             self.state = "victoire"
             self.last_message = "Bravo ! Vous avez trouvé la sortie !"
             self.game_over_selection = 0
             return 
 
-        # 3. Vérifier si le joueur est bloqué (aucun déplacement possible)
+        if self.inv.pas <= 0 :
+            self.state = "game_over"
+            self.last_message = "Vous êtes épuisée... plus de pas disponibles !"
+            self.game_over_selection = 0
+            return 
+
+        # 3. Vérifier si le joueur est bloqué : aucune porte de la frontière de ses pièces accessibles n'est franchissable
+        #    avec son inventaire, et aucune clé ne peut plus être obtenue sans en franchir une
         x, y = self.joueur.position
-        blocked = True
-
-        for dx, dy in [(0, -1), (0, 1), (1, 0), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            try:
-                if self.grille.deplacement_permis(nx, ny):
-                    blocked = False
-                    break
-            except Exception as e:
-                # En cas d'erreur, on considère la case non praticable
-                print(f"Erreur déplacement ({nx},{ny}) : {e}")
+        blocked = self.accessibilite.franchissables(x, y, self.inv) == 0 and not self._cles_a_portee()
 
         # 4. Si bloqué  afficher message et fin de partie
         if blocked :
             self.last_message = "Vous êtes complètement bloqué(e) — partie terminée."
-            print("=== DIAGNOSTIC BLOCAGE ===")
-            print(f"Position joueur : {self.joueur.position}")
-            for dx, dy, name in [(0, -1, 'Nord'), (0, 1, 'Sud'), (1, 0, 'Est'), (-1, 0, 'Ouest')]:
-                nx, ny = x + dx, y + dy
-                in_bounds = 0 <= nx < self.grille.largeur and 0 <= ny < self.grille.hauteur
-                print(f"{name} -> {(nx, ny)} (in_bounds={in_bounds})", end="")
-                if not in_bounds:
-                    print(" (hors limites)")
-                    continue
-                try:
-                    perm = self.grille.deplacement_permis(nx, ny)
-                except Exception as e:
-                    perm = f"Erreur : {e}"
-                print(f" | déplacement permis : {perm}")
-            print("=== FIN DIAGNOSTIC ===")
+            TRACE_JEU.alerte("joueur bloqué en (%d,%d), pas=%d (détails : _diagnostic_blocage)", x, y, self.inv.pas)
 
             self.state = "game_over"
+            self.game_over_selection = 0
             return    
 
 
+
+
+    def _cles_a_portee (self) -> bool :
+        """
+        Indique si une clé (ou le kit de crochetage) peut encore être obtenue sans franchir de nouvelle porte :
+        contenant en attente que l'inventaire peut ouvrir et dont la table de butin contient une clé, récompense pas encore prise,
+        dépôt de clés, ou magasin dont une offre de clé est payable avec l'or disponible.
+        Parcourt la composante du joueur : appelé seulement quand aucune porte de la frontière n'est franchissable.
+
+        Paramètres
+        ----------
+            None
+
+        Returns
+        -------
+            bool
+        """
+        if self.contenant_ouvrable() and butin.TABLES[self.contexte_special["type"]].donne_cles :
+            return True
+
+        x, y = self.joueur.position
+        or_disponible = self.inv.piecesOr
+        prix_cle = None
+        for position in self.accessibilite.composante(x, y) :
+            depot = self.ressources_grille.get(position, {})
+            if depot.get("cles") :
+                return True
+            or_disponible += depot.get("or", 0)
+
+            posee = self.grille.get_piece(*position)
+            effets = effets_modele(posee.modele)
+            if effets.magasin :
+                for _libelle, prix, code in offres_magasin(posee.nom) :
+                    if code in CODES_CLES and (prix_cle is None or prix < prix_cle) :
+                        prix_cle = prix
+            elif not posee.recompense_prise and effets.donne_cles :   # récompense d'entrée : clé, or ou kit de crochetage
+                return True
+        return prix_cle is not None and or_disponible >= prix_cle
@@ -1,15 +1,19 @@
 # pour éviter imports croisés
 from __future__ import annotations
-from typing import TYPE_CHECKING, Dict, Tuple
+from array import array
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+import copy
 import random
 
 from src.Porte import Porte
+from src.Piece import MODELES, Piece, PiecePosee
+from src.directions import BITS, BIT_VECT, DIRECTION_BIT, VECT_BIT, OPPOSE_MASQUE
+from src.trace import canal
 
 if TYPE_CHECKING:
     from src.Joueur import Joueur
     from src.Inventaire import Inventaire  # si tu l’annotes aussi
     from src.Porte import Porte
-    from src.Piece import Piece
 
 
 
@@ -18,6 +22,70 @@ DIRECTIONS = {"N" : (0,-1), "S" : (0,1), "E" : (1,0), "O" : (-1,0)}  # on suit l
 DIRECTIONS_REVERSE = {(0,-1):"N",(0,1):"S",(1,0):"E",(-1,0):"O"}
 OPPOSE = {"N" : "S", "S" : "N", "E" : "O", "O" : "E"}
 
+TRACE_PORTES = canal("portes")
+TRACE_GRILLE = canal("grille")
+
+
+# codage d'un mur sur un octet (un seul enregistrement par mur, partagé par les deux cases)
+PORTE_PRESENTE = 0x10   # 0 => pas (encore) de porte sur ce mur
+PORTE_OUVERTE = 0x08
+MASQUE_NIVEAU = 0x03
+
+TAILLE_JOURNAL = 1024   # modifications de cases gardées (cf. Grille.cases_modifiees_depuis) ; au-delà la moitié la plus ancienne est oubliée
+
+
+
+
+class VuePorte (Porte) :
+    """
+    Porte lue à travers le stockage par murs de la grille.
+    Même interface que Porte (niveau, set_niveau, ouverte), mais l'état vit dans l'octet du mur :
+    les deux cases voient donc toujours la même porte, sans synchronisation.
+
+    Attributs
+    ---------
+    _murs : bytearray
+        Tableau des murs (horizontaux ou verticaux) de la grille.
+    _i : int
+        Indice du mur dans ce tableau.
+    _grille : Grille | None
+        Grille prévenue des modifications (révisions des cases, cf. Grille.revisions).
+    """
+
+    __slots__ = ("_murs", "_i", "_grille")
+
+    def __init__ (self, murs : bytearray, i : int, grille : Optional['Grille'] = None) -> None :
+        self._murs = murs
+        self._i = i
+        self._grille = grille
+
+
+    def _modifie (self) -> None :
+        if self._grille is not None :
+            self._grille._mur_modifie(self._murs, self._i)
+
+
+    @property
+    def niveau (self) :
+        return self._murs[self._i] & MASQUE_NIVEAU
+
+    def set_niveau (self, n : int) :
+        self._murs[self._i] = (self._murs[self._i] & ~MASQUE_NIVEAU) | (n & MASQUE_NIVEAU)
+        self._modifie()
+
+
+    @property
+    def ouverte (self) :
+        return self._murs[self._i] & PORTE_OUVERTE != 0
+
+    @ouverte.setter
+    def ouverte (self, valeur : bool) :
+        if valeur :
+            self._murs[self._i] |= PORTE_OUVERTE
+        else :
+            self._murs[self._i] &= ~PORTE_OUVERTE
+        self._modifie()
+
 
 
 
@@ -31,38 +99,75 @@ class Grille :
         Nombre de colonnes (axe x), défaut 5.
     hauteur : int
         Nombre de lignes (axe y), défaut 9.
+    rng : random.Random | None
+        Flux d'aléa des niveaux de portes (un flux propre si non fourni).
 
     Attributs
     ---------
     __largeur : int
     __hauteur : int
-    __pieces : list[list[Piece | None]]
-        Matrice des pièces indexée par [y][x].
-    __portes : Dict[Tuple[int,int], Dict[str, Porte]]
-        Portes par case et direction.
+    __cases : array('H')
+        Identifiant du modèle (Piece.id_modele, cf. MODELES) de la pièce de chaque case, à plat (indice y * largeur + x) ; 0 = case vide.
+    __instances : List[PiecePosee | None]
+        Pièce posée de chaque case (même indexation) : l'état propre à l'emplacement.
+    __murs_h : bytearray
+        Murs horizontaux (portes N/S), largeur * (hauteur + 1) octets : le mur au nord de (x, y) est à l'indice y * largeur + x.
+    __murs_v : bytearray
+        Murs verticaux (portes E/O), (largeur + 1) * hauteur octets : le mur à l'ouest de (x, y) est à l'indice y * (largeur + 1) + x.
+        Chaque octet code PORTE_PRESENTE | PORTE_OUVERTE | niveau ; un mur n'a qu'un enregistrement pour ses deux faces.
+    __revisions : array('I')
+        Compteur de modifications de chaque case (pièce posée, porte d'un de ses murs modifiée), même indexation que __cases.
+    __revision : int
+        Compteur global, incrémenté à chaque modification : s'il n'a pas bougé, aucune case n'a changé.
+    __journal : List[int]
+        Case touchée par chaque modification récente : __journal[r - __debut_journal] pour la révision r + 1.
+    __debut_journal : int
+        Révision à partir de laquelle le journal est complet.
+    entree : Tuple[int,int]
+        Coordonnées de l'entrée (milieu de la rangée du bas), case de départ du joueur.
     sortie : Tuple[int,int]
-        Coordonnées de la sortie.
+        Coordonnées de la sortie (milieu de la rangée du haut).
+    rng : random.Random
+        Flux d'aléa des niveaux de portes.
 
     Méthodes
     --------
-    largeur(), hauteur(), pieces(), portes() 
+    largeur(), hauteur(), pieces(), portes(), murs_horizontaux(), murs_verticaux(), ids_cases(), revisions(), revision()
         Propriétés d'accès.
+    cases_modifiees_depuis(revision) -> Set[int] | None
+        Cases modifiées depuis une révision (sans parcourir la grille).
+    mur(x, y, bit) -> Tuple[bytearray, int]
+        Tableau et indice du mur de la case (x,y) dans la direction donnée.
     placer_piece(x, y, piece) -> None 
-        Place une pièce aux coordonnées données.
-    get_piece(x, y) -> Piece | None 
-        Retourne la pièce à (x,y) ou None.
+        Place une pièce (posée, ou un modèle à instancier) aux coordonnées données.
+    get_piece(x, y) -> PiecePosee | None 
+        Retourne la pièce posée à (x,y) ou None.
+    get_modele(x, y) -> Piece | None
+        Retourne le modèle de la pièce à (x,y) ou None.
+    copier(rng=None) -> Grille
+        Copie de la grille : quelques copies de tableaux, les modèles sont partagés.
+    position_piece(posee) -> Tuple[int,int] | None
+        Case où se trouve une pièce posée.
+    restaurer(instances, murs_h, murs_v) -> None
+        Remplace tout l'état de la grille (chargement d'une sauvegarde).
+    empreinte() -> bytes
+        Etat brut de la grille (cases + murs), pour hacher ou comparer des grilles.
     deplacement_permis(x, y) -> bool
         Indique si (x,y) est dans les bornes.
     dict_portes(x, y) -> Dict[str, Porte]
-        Récupère (ou crée) le dict de portes pour une case.
+        Portes existantes d'une case (vues sur les murs).
     voisin(x, y, direction) -> Tuple[int,int]
         Calcule la case voisine selon DIRECTIONS.
+    masques_voisinage(x, y) -> Tuple[int, int]
+        Masques (directions hors grille, directions où un voisin a une porte vers la case).
     niveau_porte(y) -> int
         Calcule un niveau de porte (logique probabiliste selon la rangée).
     garantie_porte(x, y, direction, niveau=None) -> Porte
-        Crée/synchronise la porte et son miroir.
+        Crée si besoin la porte du mur et la retourne.
     deplacer_joueur(joueur, inventaire, dx, dy) -> (bool, bool, int, str)
        Tente un déplacement et gère l'ouverture de porte (retour : (déplacé, ouverture_effectuée, pas_consumés, message)).
+    deplacer_joueur_bit(joueur, inventaire, bit) -> (bool, bool, int, str)
+       Idem à partir du bit de la direction (chemin rapide, cf. directions.BITS).
     objets_a_position(x, y)
         Retourne la liste d'objets présents si une pièce existe.
 
@@ -72,12 +177,20 @@ class Grille :
     - Coordonnées : (x, y) avec origine en haut à gauche.
     """
 
-    def __init__(self, largeur=5, hauteur=9) :
+    def __init__(self, largeur=5, hauteur=9, rng : Optional[random.Random] = None) :
+        self.rng = rng if rng is not None else random.Random()
         self.__largeur = largeur
         self.__hauteur = hauteur
-        self.__pieces = [[None for _ in range(self.__largeur)] for __ in range(self.__hauteur)]
-        self.__portes : Dict[Tuple[int,int], Dict[str, Porte]] = {}   # __portes[(x,y)] = {"S" : Porte(...), "E" : Porte(...), "O" : Porte)...}, 
-        self.sortie = (2, 0)  # (x, y) => x=2, y=0
+        self.__cases = array('H', bytes(2 * largeur * hauteur))   # 2 octets par case
+        self.__instances : List[Optional[PiecePosee]] = [None] * (largeur * hauteur)
+        self.__murs_h = bytearray(largeur * (hauteur + 1))   # murs des bords compris
+        self.__murs_v = bytearray((largeur + 1) * hauteur)
+        self.__revisions = array('I', bytes(4 * largeur * hauteur))
+        self.__revision = 0
+        self.__journal : List[int] = []
+        self.__debut_journal = 0
+        self.entree = (largeur // 2, hauteur - 1)   # (2, 8) sur la grille 5 x 9
+        self.sortie = (largeur // 2, 0)
 
 
 
@@ -96,26 +209,218 @@ class Grille :
 
 
     @property
-    def pieces (self) :
-        return self.__pieces
+    def pieces (self) -> List[List[Optional[PiecePosee]]] :
+        """ Matrice des pièces posées indexée par [y][x] (reconstruite à chaque appel : préférer get_piece) """
+        instances = self.__instances
+        L = self.__largeur
+        return [instances[y * L : (y + 1) * L] for y in range(self.__hauteur)]
+
+
+
+    @property
+    def ids_cases (self) -> array :
+        """ getter de l'attribut __cases """
+        return self.__cases
     
 
 
     @property
-    def portes (self) :
-        """ getter de l'attribut __portes """
-        return self.__portes
+    def revisions (self) -> array :
+        """ getter de l'attribut __revisions (à comparer à une copie pour savoir quelles cases redessiner) """
+        return self.__revisions
+
+
+
+    @property
+    def revision (self) -> int :
+        """ getter de l'attribut __revision """
+        return self.__revision
+
+
+
+    def _toucher (self, i : int) -> None :
+        """ La case d'indice i a changé """
+        self.__revisions[i] += 1
+        self.__revision += 1
+        self.__journal.append(i)
+        if len(self.__journal) > TAILLE_JOURNAL :
+            oubli = TAILLE_JOURNAL // 2
+            del self.__journal[:oubli]
+            self.__debut_journal += oubli
+
+
+
+    def cases_modifiees_depuis (self, revision : int) -> Optional[Set[int]] :
+        """
+        Indices des cases modifiées depuis la révision donnée (une valeur passée de Grille.revision).
+        Travail proportionnel au nombre de modifications, pas à la taille de la grille.
+
+        Returns
+        -------
+        Set[int] | None
+            None si le journal ne remonte pas jusque-là : l'appelant doit tout relire.
+        """
+        if revision < self.__debut_journal or revision > self.__revision :
+            return None
+        return set(self.__journal[revision - self.__debut_journal :])
+
+
+
+    def _mur_modifie (self, murs : bytearray, i : int) -> None :
+        """ Le mur murs[i] a changé : on invalide les (une ou deux) cases qu'il borde """
+        L = self.__largeur
+        if murs is self.__murs_h :
+            y, x = divmod(i, L)
+            if y < self.__hauteur :
+                self._toucher(i)             # case au sud du mur
+            if y > 0 :
+                self._toucher(i - L)         # case au nord du mur
+        else :
+            y, x = divmod(i, L + 1)
+            if x < L :
+                self._toucher(y * L + x)     # case à l'est du mur
+            if x > 0 :
+                self._toucher(y * L + x - 1) # case à l'ouest du mur
+
+
+
+    @property
+    def portes (self) -> Dict[Tuple[int,int], Dict[str, 'Porte']] :
+        """ Portes de toute la grille par case (reconstruit à chaque appel : préférer murs_horizontaux / murs_verticaux) """
+        portes = {}
+        for y in range(self.__hauteur) :
+            for x in range(self.__largeur) :
+                d = self.dict_portes(x, y)
+                if d :
+                    portes[(x, y)] = d
+        return portes
+
+
+
+    @property
+    def murs_horizontaux (self) -> bytearray :
+        """ getter de l'attribut __murs_h """
+        return self.__murs_h
+
+
+
+    @property
+    def murs_verticaux (self) -> bytearray :
+        """ getter de l'attribut __murs_v """
+        return self.__murs_v
+
+
+
+    def mur (self, x : int, y : int, bit : int) -> Tuple[bytearray, int] :
+        """
+        Localise le mur de la case (x, y) dans la direction bit (cf. directions.BITS).
+        Valable aussi pour les murs du bord de la grille.
+
+        Returns
+        -------
+        Tuple[bytearray, int]
+            Tableau des murs concerné et indice du mur.
+        """
+        if bit == 1 :   # N
+            return self.__murs_h, y * self.__largeur + x
+        if bit == 2 :   # S
+            return self.__murs_h, (y + 1) * self.__largeur + x
+        if bit == 4 :   # E
+            return self.__murs_v, y * (self.__largeur + 1) + x + 1
+        return self.__murs_v, y * (self.__largeur + 1) + x   # O
     
 
 
-    def placer_piece (self, x : int, y : int , piece) -> None :
-        """ setter porte aux coords donnees """
-        self.__pieces[y][x] = piece
+    def placer_piece (self, x : int, y : int , piece : PiecePosee | Piece | None) -> None :
+        """ setter piece aux coords donnees (un modèle est instancié en PiecePosee) """
+        i = y * self.__largeur + x
+        if piece is None :
+            self.__cases[i] = 0
+            self.__instances[i] = None
+            self._toucher(i)
+            return
+        if isinstance(piece, Piece) :
+            piece = PiecePosee(piece)
+        self.__cases[i] = piece.modele.id_modele
+        self.__instances[i] = piece
+        self._toucher(i)
+
+
+
+    def get_piece (self, x : int, y : int) -> PiecePosee | None :
+        return self.__instances[y * self.__largeur + x]
 
 
 
-    def get_piece (self, x : int, y : int) -> Piece | None :
-        return self.__pieces[y][x]
+    def get_modele (self, x : int, y : int) -> Piece | None :
+        return MODELES[self.__cases[y * self.__largeur + x]]
+
+
+
+    def copier (self, rng : Optional[random.Random] = None) -> 'Grille' :
+        """
+        Copie indépendante de la grille : les cases et les murs sont des tableaux d'octets copiés d'un bloc,
+        seuls les états des pièces posées sont dupliqués (les modèles sont partagés).
+        `rng` : flux d'aléa des portes de la copie (par défaut une copie de celui de la grille).
+        """
+        copie = Grille.__new__(Grille)
+        copie.__largeur = self.__largeur
+        copie.__hauteur = self.__hauteur
+        copie.__cases = array('H', self.__cases)
+        copie.__instances = [None if p is None else p.copier() for p in self.__instances]
+        copie.__murs_h = bytearray(self.__murs_h)
+        copie.__murs_v = bytearray(self.__murs_v)
+        copie.__revisions = array('I', self.__revisions)
+        copie.__revision = self.__revision
+        copie.__journal = []   # les modifications antérieures à la copie ne sont pas dans son journal
+        copie.__debut_journal = self.__revision
+        copie.entree = self.entree
+        copie.sortie = self.sortie
+        copie.rng = rng if rng is not None else copy.copy(self.rng)   # la copie poursuit la même suite de niveaux de portes
+        return copie
+
+
+
+    def position_piece (self, posee : PiecePosee) -> Optional[Tuple[int, int]] :
+        """ Case où se trouve la pièce posée (None si elle n'est pas sur la grille) """
+        for i, p in enumerate(self.__instances) :
+            if p is posee :
+                return i % self.__largeur, i // self.__largeur
+        return None
+
+
+
+    def restaurer (self, instances : List[Optional[PiecePosee]], murs_h : bytes, murs_v : bytes) -> None :
+        """
+        Remplace tout l'état de la grille (chargement d'une sauvegarde, cf. src.sauvegarde).
+        Toutes les cases sont marquées modifiées.
+
+        Paramètres
+        ----------
+        instances : List[PiecePosee | None]
+            Pièce posée de chaque case, à plat (indice y * largeur + x).
+        murs_h, murs_v : bytes
+            Octets des murs, au format de __murs_h / __murs_v.
+
+        Returns
+        -------
+        None
+        """
+        n = self.__largeur * self.__hauteur
+        if len(instances) != n or len(murs_h) != len(self.__murs_h) or len(murs_v) != len(self.__murs_v) :
+            raise ValueError("restaurer : dimensions incompatibles avec la grille")
+        self.__instances = list(instances)
+        self.__cases = array('H', [0 if p is None else p.modele.id_modele for p in instances])
+        self.__murs_h = bytearray(murs_h)
+        self.__murs_v = bytearray(murs_v)
+        for i in range(n) :
+            self._toucher(i)
+
+
+
+    def empreinte (self) -> bytes :
+        """ Etat brut (cases puis murs) : deux grilles issues de la même partie ont la même empreinte ssi elles sont identiques """
+        return self.__cases.tobytes() + bytes(self.__murs_h) + bytes(self.__murs_v)
 
     
 
@@ -131,10 +436,15 @@ class Grille :
 
     def dict_portes (self, x : int, y : int) -> Dict[str, 'Porte'] :
         """ 
-        Retourne le dictionnaire des portes de la case (x,y)
-        S'il n'est pas encore existant, le crée vide 
+        Retourne le dictionnaire des portes existantes de la case (x,y)
+        Les valeurs sont des vues sur les murs : les modifier modifie la grille (et la case voisine)
         """
-        return self.portes.setdefault((x,y), {})
+        portes = {}
+        for d in ("N", "S", "E", "O") :
+            murs, i = self.mur(x, y, BITS[d])
+            if murs[i] :
+                portes[d] = VuePorte(murs, i, self)
+        return portes
 
 
 
@@ -147,6 +457,36 @@ class Grille :
 
 
 
+    def masques_voisinage (self, x : int, y : int) -> Tuple[int, int] :
+        """
+        Décrit le voisinage de (x, y) sous forme de masques de portes (cf. directions.BITS).
+
+        Paramètres
+        ----------
+        x, y : int
+            Coordonnées de la case.
+
+        Returns
+        -------
+        Tuple[int, int]
+            - hors_bornes : directions dont la case voisine sort de la grille.
+            - requises : directions où une pièce voisine a une porte tournée vers (x, y).
+        """
+        hors_bornes = 0
+        requises = 0
+        for bit in (1, 2, 4, 8) :
+            dx, dy = VECT_BIT[bit]
+            new_x, new_y = x + dx, y + dy
+            if not (0 <= new_x < self.__largeur and 0 <= new_y < self.__hauteur) :
+                hors_bornes |= bit
+                continue
+            voisin = MODELES[self.__cases[new_y * self.__largeur + new_x]]
+            if voisin is not None and voisin.forme.masque & OPPOSE_MASQUE[bit] :
+                requises |= bit
+        return hors_bornes, requises
+
+
+
     def niveau_porte(self, y : int) -> int :
         """
         Statut aléatoire sauf pour rangée du bas et du haut
@@ -165,24 +505,24 @@ class Grille :
         y = max(0, min(self.__hauteur - 1, y))  # on s'assure qu y est dans les bornes
         
         if y == self.__hauteur - 1  or y == self.__hauteur - 2 :   # deux premieres rangées du bas
-            print("niveau_porte: y bas", y, "-> 0")
+            TRACE_PORTES.debug("niveau_porte y=%d (bas) -> 0", y)
             return 0
         if y == 0 : # rangée du haut
-            print("niveau_porte: y haut", y, "-> 2")
+            TRACE_PORTES.debug("niveau_porte y=%d (haut) -> 2", y)
             return 2 
         
         limite = self.__hauteur // 2  # moité pour éviter porttes de niveau 2 dans la moité du bas de la grille
         
         if y >= limite :
-            return random.choices([0, 1], weights=[0.65, 0.35])[0]  # 65% niv 0, %35 niv 1
+            return self.rng.choices([0, 1], weights=[0.65, 0.35])[0]  # 65% niv 0, %35 niv 1
 
         hauteur_norm = (limite - y) / max(1, limite - 1)
         
         p0 = max(0.5 - 0.5 * hauteur_norm, 0.1)  # probabilité niveau 0 etccc
         p1 = 0.3
         p2 = 1 - p0 - p1
-        choix = random.choices([0, 1, 2], weights=[p0, p1, p2])[0]
-        print(f"niveau_porte: y={y}, hauteur_norm={hauteur_norm:.3f}, p=[{p0:.3f},{p1:.3f},{p2:.3f}] -> {choix}")
+        choix = self.rng.choices([0, 1, 2], weights=[p0, p1, p2])[0]
+        TRACE_PORTES.debug("niveau_porte y=%d hauteur_norm=%.3f p=[%.3f,%.3f,%.3f] -> %d", y, hauteur_norm, p0, p1, p2, choix)
         return choix
 
 
@@ -190,8 +530,8 @@ class Grille :
 
     def garantie_porte (self, x : int, y : int, direction : str, niveau=None) -> 'Porte' :
         """
-        Retourne la porte demandée (et son mirroir) en s'assurant qu'elle existe bien avant de l'utiliser
-        Initialisation paresseuse
+        Retourne la porte demandée en s'assurant qu'elle existe bien avant de l'utiliser
+        Initialisation paresseuse ; le mur est partagé avec la case voisine, il n'y a donc pas de miroir à créer
         Paramètres
         ----------
         x : int
@@ -199,8 +539,7 @@ class Grille :
         y : int
             Coordonnée y (ligne) de la case courante.
         direction : str
-            Direction depuis la case courante vers la case voisine (doit être un identifiant reconnu
-            par self.voisin et présent dans la table OPPOSE).
+            Direction depuis la case courante vers la case voisine ('N', 'S', 'E' ou 'O').
         niveau : int | None, optionnel
             Niveau de la porte à créer. Si None, le niveau est déterminé paresseusement via
             self.niveau_porte(new_y) (où new_y est la coordonnée y du voisin).
@@ -208,37 +547,35 @@ class Grille :
         Returns
         -------
         Porte
-            L'objet Porte correspondant à la porte depuis la case (x, y) dans la direction fournie.
+            Vue sur le mur de la case (x, y) dans la direction fournie.
         """
 
-        # 1) trouver le voisin
-        new_x, new_y = self.voisin(x, y, direction)
-        portes_case_courante = self.dict_portes(x,y)
+        murs, i = self.mur(x, y, BITS[direction])
+        if not murs[i] :
+            self._creer_porte(x, y, BITS[direction], murs, i, niveau)
+        return VuePorte(murs, i, self)
 
-        # 2) Gestion des bords de la grille
-        if not self.deplacement_permis(new_x, new_y) :  # deplacement non permis
-            # retourne porte non franchissable
-            return portes_case_courante.setdefault(direction, Porte(niveau=0, ouverte=False))
-        
-        portes_case_vosin = self.dict_portes(new_x, new_y)
-
-        # 3) Création de la porte (x,y) si non existante
-        if direction not in portes_case_courante :   # la porte n'existe pas
-            if niveau is None :
-                niveau = self.niveau_porte(new_y)
-            print(f"[garantie_porte] création porte en {(x,y)} dir={direction} -> niveau={niveau}")
-            portes_case_courante[direction] = Porte(niveau=niveau, ouverte=False)
-            
-        # 4) on fait de même du côté opposé
-        o = OPPOSE[direction] 
-        if o not in portes_case_vosin :
-            portes_case_vosin[o] = Porte(
-                niveau = portes_case_courante[direction].niveau, 
-                ouverte = portes_case_courante[direction].ouverte
-            )
-        
-        print(f"ouverte : {portes_case_courante[direction].ouverte}") # ouverture : vrai automatiquement quand on se déplace vers une porte,pourquoi ?
-        return portes_case_courante[direction]
+
+
+
+    def _creer_porte (self, x : int, y : int, bit : int, murs : bytearray, i : int, niveau=None) -> int :
+        """
+        Initialise le mur murs[i] (côté (x, y), direction bit) et retourne son octet.
+        Un mur du bord reste une porte de niveau 0 non franchissable ; sinon le niveau est tiré
+        selon la rangée de la case voisine.
+        """
+        dx, dy = VECT_BIT[bit]
+        new_x, new_y = x + dx, y + dy
+
+        if not self.deplacement_permis(new_x, new_y) :  # bord de la grille
+            niveau = 0
+        elif niveau is None :
+            niveau = self.niveau_porte(new_y)
+            TRACE_PORTES.debug("création porte en (%d,%d) dir=%s -> niveau=%d", x, y, DIRECTION_BIT[bit], niveau)
+
+        murs[i] = PORTE_PRESENTE | niveau
+        self._mur_modifie(murs, i)
+        return murs[i]
 
 
 
@@ -271,43 +608,66 @@ class Grille :
             - message (str) : Message à destination de l'utilisateur expliquant l'issue de l'action (vide si pas d'information).
         """
         
+        # on récupere le bit associé au vecteur (dx,dy)
+        bit = BIT_VECT.get((dx, dy))
+        if bit is None :   # Si (0,0) ou diagonale je ne fais rien
+            return False, False, 0, ""
+        return self.deplacer_joueur_bit(joueur, inventaire, bit)
+
+
+
+
+    def deplacer_joueur_bit (self, joueur : 'Joueur', inventaire : 'Inventaire', bit : int) -> Tuple[bool, bool, int, str] :
+        """
+        Corps de deplacer_joueur, la direction étant donnée par son bit (cf. directions.BITS).
+        Le test de porte de la pièce courante est un simple ET sur le masque de sa forme.
+
+        Paramètres
+        ----------
+        joueur : Joueur
+        inventaire : Inventaire
+        bit : int
+            Bit de la direction du déplacement.
+
+        Returns
+        ------
+        Tuple[bool, bool, int, str]
+            Voir deplacer_joueur.
+        """
+
         message = ""
-        # on récupere la valeur associée a la cle (dx,dy)
-        d = DIRECTIONS_REVERSE.get((dx, dy))
-        if d is None or (dx == 0 and dy == 0) :   # Si (0,0) je ne fais rien
-            return False, False, 0, message
 
         x,y = joueur.position
-        piece_actuelle  = self.get_piece(x,y)
+        piece_actuelle  = MODELES[self.__cases[y * self.__largeur + x]]
         
-        if piece_actuelle is not None and not piece_actuelle.a_porte(d):
+        if piece_actuelle is not None and not piece_actuelle.forme.masque & bit:
             # pas de porte dans cette direction → on ne tente même pas
-            message = f"Il n'y a pas de porte vers le {d}."
+            message = f"Il n'y a pas de porte vers le {DIRECTION_BIT[bit]}."
             return False, False, 0, message
 
-        new_x, new_y = self.voisin(x, y, d)
+        dx, dy = VECT_BIT[bit]
+        new_x, new_y = x + dx, y + dy
 
         if not self.deplacement_permis(new_x, new_y) :   ### déplacement non permis (bords)
             message = "Vous ne pouvez pas aller dans cette direction."
-            print(f"[Grille] mouvement refusé : hors-limites {(new_x, new_y)}")
+            TRACE_GRILLE.info("mouvement refusé : hors-limites (%d,%d)", new_x, new_y)
             return False, False, 0, message
 
-        # porte séparant (x,y) et (new_x, new_y)
-        porte = self.garantie_porte(x, y, d)
+        # mur séparant (x,y) et (new_x, new_y) : un seul octet pour les deux côtés
+        murs, i = self.mur(x, y, bit)
+        etat = murs[i] or self._creer_porte(x, y, bit, murs, i)
 
 
-        if not porte.ouverte :    # porte fermee
-            print(f"[ouvrir_porte] niveau={porte.niveau}, cles={inventaire.cles}, kit={inventaire.possede_obj_permanent('kit_crochetage')}")
-            if not inventaire.ouvrir_porte(porte.niveau) :  # porte ne peut pas etre ouverte
-                #print(f"Porte niveau {porte.niveau} NON OUVERTE (pos {(x,y)} -> {(new_x,new_y)})") 
+        if not etat & PORTE_OUVERTE :    # porte fermee
+            niveau = etat & MASQUE_NIVEAU
+            if not inventaire.ouvrir_porte(niveau) :  # porte ne peut pas etre ouverte
                 message = "Vous ne pouvez pas ouvrir cette porte (ressource manquante)."
                 return False, False, 0, message
             else:
-                print(f"Porte niveau {porte.niveau} OUVERTE (pos {(x,y)} -> {(new_x,new_y)})")
-                porte.ouverte = True  # la porte peut etre ouverte
-                self.dict_portes(new_x, new_y)[OPPOSE[d]].ouverte = True
+                TRACE_PORTES.info("porte niveau %d ouverte (%d,%d) -> (%d,%d)", niveau, x, y, new_x, new_y)
+                murs[i] = etat | PORTE_OUVERTE  # ouverte des deux côtés à la fois
+                self._mur_modifie(murs, i)
 
-            # il faut assurer coherence entre les deux cases opposées pour garantir que l'on puisse faire des aller-retour sans consommer de ressources davantage
             # il faut faire le tirage aleatoire d piece si le côté opposé est vide
                 if self.get_piece(new_x, new_y) is None :
                     return False, True, 0, message
@@ -322,7 +682,7 @@ class Grille :
 
 
     def objets_a_position(self, x, y):
-        piece = self.pieces[y][x]
+        piece = self.get_piece(x, y)
         if piece:
             return piece.objets
         return []
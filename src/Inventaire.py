@@ -1,12 +1,16 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import List, Set, TYPE_CHECKING
+from src.trace import canal
 
 if TYPE_CHECKING :
     from src.ObjetPermanent import ObjetPermanent
     from src.AutreObjet import AutreObjet
 
 
+TRACE_INVENTAIRE = canal("inventaire")
+
+
 
 
 @dataclass
@@ -60,6 +64,19 @@ class Inventaire :
 
 
 
+    def copier (self) -> 'Inventaire' :
+        """ Copie indépendante : ensembles et listes dupliqués, objets partagés (ils n'ont pas d'état modifié après coup) """
+        return replace(
+            self,
+            noms_objets_permanents=set(self.noms_objets_permanents),
+            objets_permanents=list(self.objets_permanents),
+            noms_autres_objets=set(self.noms_autres_objets),
+            autres_objets=list(self.autres_objets),
+        )
+
+
+
+
     def enregistrer_possession_obj_perm (self, obj_perm : 'ObjetPermanent') -> bool :
         """
         Enregistre possession d'un objet permament
@@ -169,11 +186,13 @@ class Inventaire :
         """
         if obj_perm.nom in self.noms_objets_permanents :
             return
-        self.noms_objets_permanents.add(obj_perm.nom)
-        self.objets_permanents.append(obj_perm)
-        # si l'objet a une méthode appliquer, on peut l'appeler
         if hasattr(obj_perm, "appliquer"):
+            # enregistre la possession puis applique les effets (chances du détecteur de métaux, de la patte de lapin) ;
+            # enregistrer d'abord ici faisait croire à appliquer que l'objet était déjà possédé
             obj_perm.appliquer(self)
+            return
+        self.noms_objets_permanents.add(obj_perm.nom)
+        self.objets_permanents.append(obj_perm)
 
 
 
@@ -195,7 +214,7 @@ class Inventaire :
 
     def ouvrir_porte (self, niveau : int, dry_run : bool = False) -> bool :   # dry_run pour l'UI
         """ dry_run permet de pre-verifier action sans la comettre """
-        print(f"[ouvrir_porte] niveau={niveau}, cles={self.cles}, kit={self.possede_obj_permanent('kit_crochetage')}, dry_run={dry_run}")
+        TRACE_INVENTAIRE.debug("ouvrir_porte niveau=%d cles=%d dry_run=%s", niveau, self.cles, dry_run)
         if niveau == 0:
             return True
         if niveau == 1:
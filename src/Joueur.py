@@ -15,20 +15,45 @@ class Joueur:
     """
     Représente le joueur ou la joueuse.
 
+    Paramètres
+    ----------
+    position : tuple(int, int)
+        Case de départ (l'entrée de la grille, cf. Grille.entree).
+
     Attributs
     ----------
     inventaire : Inventaire
         Contient les objets et le nombre de pas disponibles.
     position : tuple(int, int)
         Coordonnées (x, y) du joueur dans la grille.
+
+    Méthodes
+    --------
+    deplacer_str(direction, grille) -> bool
+    deplacer_coords(direction, grille) -> bool
+    ramasser_objet(objet) -> None
+    copier() -> Joueur
+        Copie indépendante (inventaire compris).
     """
-    def __init__(self) -> None :
+
+    __slots__ = ("inventaire", "position")
+
+    def __init__(self, position : Tuple[int, int] = (2, 8)) -> None :
         self.inventaire = Inventaire()
-        self.position = (2, 8)  # Position initiale dans la grille (peut être modifiée selon le jeu) ###### a modifier
+        self.position = position
     
 
 
 
+    def copier (self) -> 'Joueur' :
+        copie = Joueur.__new__(Joueur)
+        copie.inventaire = self.inventaire.copier()
+        copie.position = self.position
+        return copie
+
+
+
+
     def deplacer_str(self, direction : str, grille : 'Grille'):
         """
         Déplace le joueur dans la direction donnée si le déplacement est permis.
@@ -1,11 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import TYPE_CHECKING, Set, Optional
-from src.AutreObjet import AutreObjet, Banane, Gateau, Pomme, Repas, Sandwich
-from src.ObjetPermanent import DetecteurMetaux, KitCrochetage, Marteau, ObjetPermanent, PatteLapin, Pelle
-from src.directions import OPPOSITE, voisin
-import random
+from typing import TYPE_CHECKING, Set, Optional, List, Tuple
+from src.directions import OPPOSITE, voisin, BITS, DIRECTIONS_MASQUE, masque
+from src.effets import effets_modele
 
 
 
@@ -42,21 +40,32 @@ class FormePiece :
         Nom de la forme de la pièce.
     ens_portes : Set[str]
         Ensemble des directions ('N', 'S', 'E', 'O') où se trouvent les portes.
+    masque : int
+        Les mêmes portes sur 4 bits (cf. directions.BITS), calculé une fois à la création.
 
     Méthodes
     -------
     a_porte(direction: str) -> bool
         Vérifie si la pièce a une porte dans la direction donnée.
+    a_porte_bit(bit: int) -> bool
+        Idem à partir du bit de la direction.
     """
+    __slots__ = ("nom", "ens_portes", "masque")
+
     nom : str
     ens_portes : Set[str]
+    masque : int
 
     def __init__(self, nom, ens_portes) -> None:
         self.nom = nom
         self.ens_portes = ens_portes
+        self.masque = masque(ens_portes)
  
     def a_porte (self, direction : str) -> bool :
-        return direction in self.ens_portes
+        return self.masque & BITS[direction] != 0
+
+    def a_porte_bit (self, bit : int) -> bool :
+        return self.masque & bit != 0
     
 
 
@@ -94,9 +103,16 @@ FORME_T_ONE = FormePiece("t_one", {"O", "N", "E"})
 
 
 
+# registre des modèles du processus : l'identifiant d'un modèle est son indice (0 = case vide dans la grille)
+MODELES : List[Optional['Piece']] = [None]
+
+
+
+
 class Piece :
     """
-    Représente les pièces du jeu.
+    Modèle (immuable) d'une pièce du jeu, partagé par toutes les parties d'un processus.
+    L'état propre à une pièce posée (récompense, contenu, or) est porté par PiecePosee.
 
     Attributs
     ---------
@@ -114,47 +130,65 @@ class Piece :
         Coût en gemmes pour obtenir la pièce (default à 0).
     rarete : int
         Indique la rareté de la pièce et donc sa probabilité de tirage (0 à 3) : (commonplace, standard, unusual, rare).
-    tags : list
-        Une liste de balises associées à la pièce pour les effets spéciaux.
-    contenu : list[str]
-        Liste des contenus spéciaux de la pièce (ex: "Casier", "Endroit à creuser").
-    recompense_prise : bool
-        Indique si la récompense de la pièce a déjà été prise.
-    or_dans_piece : int
-        Quantité d'or contenue dans la pièce.
+    tags : Tuple[str, ...]
+        Balises associées à la pièce pour les effets spéciaux.
+    or_initial : int
+        Or contenu dans la pièce au moment où elle est posée.
+    id_modele : int
+        Identifiant du modèle dans MODELES (>= 1, 0 est réservé aux cases vides de la grille).
 
     Méthodes
     -------
     a_porte(direction: str) -> bool:
         Vérifie si la pièce a une porte dans la direction spécifiée.
+    a_porte_bit(bit: int) -> bool:
+        Idem avec le bit de la direction (chemin rapide).
+    est_magasin() -> bool:
+        Vrai si la pièce est un magasin (l'entrée ouvre l'écran d'achat).
     peut_etre_posee(grille: “Grille”, x: int, y: int, dir_entree: str) -> bool:
         Vérifie si la pièce peut être placée sur la grille aux coordonnées spécifiées.
-    poser_piece(grille: “Grille”, x: int, y: int) -> None:
-        Place la pièce sur la grille et ouvre les portes correspondantes.
-    effet_entree(game: “Game”) -> None:
-        Applique des effets lorsque le joueur entre dans la pièce.
+    peut_etre_posee_masque(bit_entree: int, hors_bornes: int, requises: int) -> bool:
+        Même vérification à partir des masques du voisinage (chemin rapide).
+    poser_piece(grille: “Grille”, x: int, y: int) -> PiecePosee:
+        Crée une pièce posée à partir du modèle, la place sur la grille et ouvre les portes correspondantes.
+    effet_entree(game: “Game”, posee: “PiecePosee”) -> None:
+        Applique des effets lorsque le joueur entre dans la pièce (effets résolus par src.effets).
     effet_tirage(game: “Game”) -> None:
-        Applique des effets lorsque la pièce est tirée de la pioche.
-    effet_dispersion(game: “Game”) -> None:
-        Disperse les ressources vers les pièces voisines.
-    effet_modif_pioche(game: “Game”) -> None:
-        Modifie les chances de tirer certaines couleurs après avoir placé la pièce.
-    effet_modif_objets(game: “Game”) -> None:
-        Augmente les chances de trouver certains objets plus tard.
-    effet_ajout_catalogue(game: “Game”) -> None:
-        Ajoute d'autres pièces au pool de tirage en fonction de conditions spécifiques.
+        Applique des effets lorsque la pièce est tirée de la pioche (boosts, ajouts à la pioche, dispersion...).
     """
 
-    def __init__(self, nom: str, couleur : CouleurPiece, forme : FormePiece, cout_gemmes=0, rarete=0, tags=None) -> None:
-        self.nom = nom
-        self.couleur = couleur
-        self.forme = forme
-        self.cout_gemmes = cout_gemmes
-        self.rarete = rarete
-        self.tags = tags or []
-        self.contenu: list[str] = []
-        self.recompense_prise : bool = False  
-        self.or_dans_piece : int = 0
+    __slots__ = ("nom", "couleur", "forme", "cout_gemmes", "rarete", "tags", "or_initial", "id_modele")
+
+    def __init__(self, nom: str, couleur : CouleurPiece, forme : FormePiece, cout_gemmes=0, rarete=0, tags=None, or_initial=0) -> None:
+        initialiser = object.__setattr__   # le modèle est figé : __setattr__ est interdit après la construction
+        initialiser(self, "nom", nom)
+        initialiser(self, "couleur", couleur)
+        initialiser(self, "forme", forme)
+        initialiser(self, "cout_gemmes", cout_gemmes)
+        initialiser(self, "rarete", rarete)
+        initialiser(self, "tags", tuple(tags or ()))
+        initialiser(self, "or_initial", or_initial)
+        initialiser(self, "id_modele", len(MODELES))
+        MODELES.append(self)
+
+
+
+
+    def __setattr__ (self, nom : str, valeur) -> None :
+        raise AttributeError(f"modèle de pièce immuable : impossible de modifier '{nom}' (l'état d'une pièce posée est dans PiecePosee)")
+
+
+
+
+    def __reduce__ (self) :
+        # recréé (et réenregistré) à la désérialisation : l'identifiant de modèle est propre au processus
+        return (Piece, (self.nom, self.couleur, self.forme, self.cout_gemmes, self.rarete, self.tags, self.or_initial))
+
+
+
+
+    def __repr__ (self) -> str :
+        return f"Piece({self.nom!r}, {self.couleur.name}, {self.forme.nom})"
 
 
 
@@ -165,6 +199,44 @@ class Piece :
 
 
 
+    def a_porte_bit (self, bit : int) -> bool :
+        return self.forme.masque & bit != 0
+
+
+
+
+    def est_magasin (self) -> bool :
+        nom = self.nom.lower()
+        return self.couleur is CouleurPiece.JAUNE or "shop" in nom or "magasin" in nom or "store" in nom
+
+
+
+
+    def peut_etre_posee_masque (self, bit_entree : int, hors_bornes : int, requises : int) -> bool :
+        """
+        Vérification de pose sur masques : porte d'entrée présente, aucune porte hors de la grille,
+        et toutes les portes exigées par les voisins présentes.
+
+        Paramètres
+        ----------
+        bit_entree : int
+            Bit de la direction d'arrivée.
+        hors_bornes : int
+            Masque des directions qui sortent de la grille.
+        requises : int
+            Masque des directions où un voisin posé a une porte vers la case.
+
+        Returns
+        ------
+        bool
+            True si la pose est valide.
+        """
+        m = self.forme.masque
+        return m & bit_entree != 0 and m & hors_bornes == 0 and m & requises == requises
+    
+
+
+
     def peut_etre_posee (self, grille : 'Grille', x : int, y : int, dir_entree : str) -> bool :
         """
         Vérifie si la pièce peut être posée en (x, y) venant de dir_entree.
@@ -193,46 +265,18 @@ class Piece :
         """
     
         # entree bloquee
-        #if dir_entree not in DIRECTIONS or not self.a_porte(dir_entree) :
-            #return False
-
-        if dir_entree not in DIRECTIONS:
-            return False
-        
-        if dir_entree not in self.forme.ens_portes:
+        if dir_entree not in BITS :
             return False
-        
-        # hors bornes
-        for d in self.forme.ens_portes :
-            new_x, new_y = grille.voisin(x, y, d)   # case voisinne dans direction demandée
-            if not grille.deplacement_permis(new_x, new_y) :
-                return False
-            
-
-        for d in DIRECTIONS :
-            new_x, new_y = grille.voisin(x, y, d)  # case voisinne dans direction demandée
-            # ignorer ce voisin car il est hors bornes
 
-            if not grille.deplacement_permis(new_x, new_y) :
-                continue
-
-            voisin = grille.get_piece(new_x, new_y)
-            if voisin is None :
-                continue
-
-            if isinstance(voisin, Piece) :
-                if voisin.a_porte(OPPOSE[d]) :
-                    if not self.a_porte(d) :
-                        return False # car c est incoherent si le voisin a une porte vers la case courante masi que la case courant en a pas de porte vers le voisin
-        
-        return True
+        hors_bornes, requises = grille.masques_voisinage(x, y)
+        return self.peut_etre_posee_masque(BITS[dir_entree], hors_bornes, requises)
         
 
 
 
-    def poser_piece (self, grille : 'Grille', x : int, y : int) -> None :
+    def poser_piece (self, grille : 'Grille', x : int, y : int) -> 'PiecePosee' :
         """ 
-        On pose la pièce, on modifie l'état de la grille.
+        On pose une nouvelle instance du modèle, on modifie l'état de la grille.
 
         Paramètres
         ----------
@@ -245,14 +289,15 @@ class Piece :
 
         Returns
         -------
-        None
+        PiecePosee
+            L'instance posée (état propre à cet emplacement).
         """
 
-        grille.placer_piece(x,y,self) 
+        posee = PiecePosee(self)
+        grille.placer_piece(x, y, posee)
         
-        for d in self.forme.ens_portes :
+        for d in DIRECTIONS_MASQUE[self.forme.masque] :   # ordre fixe : les niveaux de portes sont tirés dans cet ordre
             porte = grille.garantie_porte(x, y, d)
-            #porte.ouverte = True
             new_x, new_y = grille.voisin(x, y, d)
 
             if not grille.deplacement_permis(new_x, new_y) :
@@ -262,41 +307,36 @@ class Piece :
             if voisin is None :
                 continue
 
-            portes_voisin = grille.dict_portes(new_x, new_y)
-            porte_retour = portes_voisin.get(OPPOSE[d])
-
-            if porte_retour is None :
-                continue
+            # une pièce voisine existe déjà : le mur commun (un seul enregistrement pour les deux cases) devient un passage libre
+            porte.ouverte = True
+            porte.set_niveau(0)
 
-            #porte.ouverte = True   # j ouvre la porte de al case courante 
-            porte_retour.ouverte = True    # j ouvre la porte de la case voisinne
-            porte_retour.set_niveau(0)
+        return posee
 
 
 
 
     
-    def effet_entree (self, game : 'Game') :
+    def effet_entree (self, game : 'Game', posee : 'PiecePosee') -> None :
         """
-        Applique des effets lorsque le joueur entre dans la pièce.
+        Applique des effets lorsque le joueur entre dans la pièce : ressources déposées par d'autres pièces,
+        écran d'achat des magasins, puis effets d'entrée du modèle (cf. src.effets) si la récompense n'a pas été prise.
 
         Paramètres
         ----------
         game : Game
             L'objet Game qui contient l'état actuel du jeu.
+        posee : PiecePosee
+            La pièce posée où se trouve le joueur (porte l'état : récompense prise, contenu, or).
 
         Returns
         -------
         None
         """
-        
-        inv : 'Inventaire' = game.inv
-        x, y = game.joueur.position
-        nom = self.nom.lower()
-
         # récupérer les ressources déposées par d'autres pièces
-        drop = game.ressources_grille.pop((x, y), None)
+        drop = game.ressources_grille.pop(game.joueur.position, None)
         if drop:
+            inv : 'Inventaire' = game.inv
             if "gemmes" in drop:
                 inv.ramasser_gemmes(drop["gemmes"])
             if "or" in drop:
@@ -304,265 +344,122 @@ class Piece :
             if "cles" in drop:
                 inv.ramasser_cles(drop["cles"])
 
-        if self.couleur is CouleurPiece.JAUNE or "shop" in nom or "magasin" in nom or "store" in nom:
-            game.entree_magasin(self)
+        effets = effets_modele(self)
+        if effets.magasin:
+            game.entree_magasin(posee)
             return
 
-
-        if self.recompense_prise : 
-            return
-        
-        if "corridor" in nom :
-            inv.ramasser_cles(1)
-            inv.ramasser_pieceOr(2)
-            self.recompense_prise = True
-            
-
-        if "bedroom" in nom :
-            # regagner des pas
-            inv.ramasser_pas(5)
-            self.recompense_prise = True
+        if posee.recompense_prise :
             return
+        for effet in effets.entree :
+            effet(game, posee)
 
-        if "chapel" in nom :
-            inv.depenser_pieceOr(1)
-            self.recompense_prise = True
-            return
 
-        if "garden" in nom or "veranda" in nom or "patio" in nom or "greenhouse" in nom :
-            # gemme quasi systématique
-            inv.ramasser_gemmes(1)
-            inv.ramasser_pieceOr(2)
-
-            # parfois un objet consommable de 2.2
-            if random.random() < 0.5:
-                obj = random.choice([Pomme(), Banane(), Gateau(), Sandwich(), Repas()])
-                obj.appliquer(inv)
-
-            # parfois un objet permanent
-            if random.random() < 0.3:
-                candidats = [
-                    Pelle(),
-                    Marteau(),
-                    KitCrochetage(),
-                    DetecteurMetaux(),
-                    PatteLapin(),
-                ]
-                candidats = [c for c in candidats if not inv.possede_obj_permanent(c.nom)]
-                if candidats:
-                    inv.ajouter_obj_permanent(random.choice(candidats))
-
-            if hasattr(self, "contenu"):
-                if "Endroit à creuser" not in self.contenu:
-                    self.contenu.append("Endroit à creuser")
-            
-            self.recompense_prise = True
-            return
-        
-        if "locker" in nom :
-            # on ne l'ouvre pas automatiquement  c'est au joueur d'appuyer sur O
-            # donc on indique juste au game qu'on est sur un casier
-            inv.ramasser_cles(5)
-            game.contexte_special = {"type": "casier", "piece": self}
-            if hasattr(self, "contenu"):
-                if "Casier" not in self.contenu:
-                    self.contenu.append("Casier")
-            self.recompense_prise = True
-            return
 
-        if "den" in nom:
-            # on ne l'ouvre pas automatiquement  c'est au joueur d'appuyer sur O
-            # donc on indique juste au game qu'on est sur un coffre
-            game.contexte_special = {"type": "coffre", "piece": self}
-            if hasattr(self, "contenu"):
-                if "Coffre" not in self.contenu:
-                    self.contenu.append("Coffre")
-            self.recompense_prise = True
-            return
 
-        if "security" in nom or "guard room" in nom:
-            inv.ramasser_cles(5)
-            inv.ramasser_pieceOr(3)  
-            self.recompense_prise = True
-            return
-        
-        
-        if "furnace" in nom  in nom:
-            inv.utiliser_pas(1)
-            self.recompense_prise = True
-            return
-        
-        # MAID'S CHAMBER  boost + gemme (une fois)
-        if "maidschamber" in nom:
-            inv.chance_objets = max(inv.chance_objets, 0.7)
-            inv.ramasser_gemmes(1)
-            self.recompense_prise = True
-            return
-        
-    
+    def effet_tirage (self, game : 'Game') -> None :
+        """
+        Appelé juste après avoir choisi cette pièce dans l'écran de tirage (et l'avoir posée) : ressources données
+        ou reprises, boosts de couleur ou d'objets, pièces ajoutées à la pioche, dispersion (cf. src.effets).
+        """
+        for effet in effets_modele(self).tirage :
+            effet(game, self)
 
-        # MASTER BEDROOM 
-        if "master bedroom" in nom:
-            inv.ramasser_pas(5)
-            self.recompense_prise = True
-            return
-        
-        if "gallery" in nom :
-            r = random.randint(1,3)
-            inv.ramasser_gemmes(r)
-            self.recompense_prise = True
-
-
-        # PATIO , gemme + dépôt autour (mais une seule fois)
-        if "patio" in nom:
-            inv.ramasser_gemmes(1)
-           
-            for d, (dx, dy) in {"N": (0,-1), "S": (0,1), "E": (1,0), "O": (-1,0)}.items():
-                nx, ny = x + dx, y + dy
-                if game.grille.deplacement_permis(nx, ny):
-                    game.ressources_grille.setdefault((nx, ny), {})
-                    game.ressources_grille[(nx, ny)]["gemmes"] = \
-                        game.ressources_grille[(nx, ny)].get("gemmes", 0) + 1
-            self.recompense_prise = True
-            return
-        
-        # OFFICE - dépose or dans cases voisinnes
-        if "office" in nom :
-            for d, (dx, dy) in {"N": (0,-1), "S": (0,1), "E": (1,0), "O": (-1,0)}.items():
-                nx, ny = x + dx, y + dy
-                if game.grille.deplacement_permis(nx, ny):
-                    game.ressources_grille.setdefault((nx, ny), {})
-                    game.ressources_grille[(nx, ny)]["or"] = \
-                        game.ressources_grille[(nx, ny)].get("or", 0) + 2
-            inv.ramasser_cles(1)
-            self.recompense_prise = True
-            return
-        
-        # CHAMBER OF MIRRORS: ajoute des pièces (une fois)
-        if "chamber of mirrors" in nom:
-            if hasattr(game, "pioche_pieces") and game.pioche_pieces:
-                game.pioche_pieces.ajouter_piece_modele("couloir_NS")
-                game.pioche_pieces.ajouter_piece_modele("couloir_EO")
-            self.recompense_prise = True
-            return
 
-        # POOL 
-        if "pool" in nom:
-            inv.ramasser_pas(4)
-            self.recompense_prise = True
-            return  
-    
-        if "nursery" in nom:
-            inv.ramasser_pas(5)
-            self.recompense_prise = True
-            return
-        
-        if "vault" in nom:
-            if getattr(self, "or_dans_piece", 0) > 0:
-                inv.ramasser_pieceOr(self.or_dans_piece)
-                self.or_dans_piece = 0
-            self.recompense_prise = True
-            return
-    
-        return
-        
 
 
+class PiecePosee :
+    """
+    Pièce posée sur la grille : référence vers son modèle et état propre à cet emplacement.
+    Les attributs du modèle (nom, couleur, forme, ...) sont accessibles directement.
 
+    Attributs
+    ---------
+    modele : Piece
+        Modèle (partagé) de la pièce.
+    recompense_prise : bool
+        Indique si la récompense de la pièce a déjà été prise.
+    contenu : list[str]
+        Liste des contenus spéciaux de la pièce (ex: "Casier", "Endroit à creuser").
+    or_dans_piece : int
+        Quantité d'or restant dans la pièce.
 
-    def effet_tirage (self, game : 'Game') -> None :
-        """
-        Appelé juste après avoir choisi cette pièce dans l'écran de tirage.
-        Ici on peut donner/reprendre des ressources directement.
-        """
-        inv : 'Inventaire'= game.inv
-        nom = self.nom.lower()
+    Méthodes
+    -------
+    a_porte(direction: str) -> bool:
+        Vérifie si la pièce a une porte dans la direction spécifiée.
+    effet_entree(game: “Game”) -> None:
+        Applique les effets du modèle lorsque le joueur entre dans la pièce.
+    copier() -> PiecePosee
+        Copie indépendante de l'état (le modèle reste partagé).
+    """
 
-        # Master Bedroom : regagne des pas au moment où on la choisit
-        if "master bedroom" in nom:
-            inv.ramasser_pas(4) ### ca se répète avec l'effet d'entrée ?
+    __slots__ = ("modele", "recompense_prise", "contenu", "or_dans_piece")
 
-        # Furnace : rend plus probable le rouge après
-        if "furnace" in nom:
-            game.boosts_pioche_par_couleur[self.couleur.__class__.ROUGE] += 1
+    def __init__(self, modele : Piece) -> None :
+        self.modele = modele
+        self.recompense_prise : bool = False
+        self.contenu : list[str] = []
+        self.or_dans_piece : int = modele.or_initial
 
-        # Greenhouse : booste le vert
-        if "greenhouse" in nom:
-            game.boosts_pioche_par_couleur[self.couleur.__class__.VERT] += 1
 
-        # Veranda : booste la découverte d'objets
-        if "veranda" in nom:
-            game.boosts_loot["obj_perm"] += 1
-            game.boosts_loot["gemmes"] += 1
 
-        # Chamber of Mirrors : ajoute des pièces au catalogue
-        if "chamber of mirrors" in nom or "chambre des miroirs" in nom:
-            game.pioche_pieces.ajouter_piece_modele("couloir_NS")
-            game.pioche_pieces.ajouter_piece_modele("couloir_EO")
 
+    @property
+    def nom (self) :
+        """ nom du modèle """
+        return self.modele.nom
 
+    @property
+    def couleur (self) :
+        """ couleur du modèle """
+        return self.modele.couleur
 
+    @property
+    def forme (self) :
+        """ forme du modèle """
+        return self.modele.forme
 
-    def effet_dispersion(self, game : 'Game') -> None:
-        """
-        Certaines pièces 'jettent' une ressource dans leurs voisines.
-        On l'appelle depuis effet_a_l_entree OU depuis effet_tirage selon le type.
-        """
-        if "dispersion" not in self.tags:
-            return
+    @property
+    def cout_gemmes (self) :
+        """ cout_gemmes du modèle """
+        return self.modele.cout_gemmes
 
-        grille = game.grille
-        x, y = game.joueur.position
-        for d in ("N", "S", "E", "O"):
-            nx, ny = grille.voisin(x, y, d)
-            if not grille.deplacement_permis(nx, ny):
-                continue
-            if grille.get_piece(nx, ny) is None:
-                continue
-            # on dépose 1 or dans la pièce voisine
-            game.ressources_grille.setdefault((nx, ny), {})
-            game.ressources_grille[(nx, ny)]["or"] = game.ressources_grille[(nx, ny)].get("or", 0) + 1
+    @property
+    def rarete (self) :
+        """ rarete du modèle """
+        return self.modele.rarete
 
+    @property
+    def tags (self) :
+        """ tags du modèle """
+        return self.modele.tags
 
 
 
-    # Effet de modif de proba de tirage 
-    def effet_modif_pioche(self, game :'Game') -> None:
-        """
-        Modifie les chances de tirer certaines couleurs après que cette pièce a été posée.
-        """
-        if "boost_vert" in self.tags:
-            game.boosts_pioche_par_couleur[self.couleur.__class__.VERT] += 1
-        if "boost_bleu" in self.tags:
-            game.boosts_pioche_par_couleur[self.couleur.__class__.BLEU] += 1
-        if "boost_rouge" in self.tags:
-            game.boosts_pioche_par_couleur[self.couleur.__class__.ROUGE] += 1
 
+    def a_porte (self, direction : str) -> bool :
+        return self.modele.forme.a_porte(direction)
 
 
 
-    #  Effet de modif de proba d'objets 
-    def effet_modif_objets(self, game : 'Game') -> None:
-        """
-        Augmente les chances de trouver certains objets plus tard.
-        """
-        if "boost_gemmes" in self.tags:
-            game.boosts_loot["gemmes"] += 1
-        if "boost_obj_perm" in self.tags:
-            game.boosts_loot["obj_perm"] += 1
-        if "boost_cles" in self.tags:
-            game.boosts_loot["cles"] += 1
 
+    def effet_entree (self, game : 'Game') -> None :
+        self.modele.effet_entree(game, self)
 
 
 
-    # Effet d'ajout au catalogue (Chamber of Mirrors, Pool) 
-    def effet_ajout_catalogue(self, game : 'Game') -> None:
-        """
-        Certaines pièces ajoutent d'autres pièces à la pioche.
-        On ajoute un nom ou un 'fournisseur' dans la pioche.
-        """
-        if "ajoute_couloir" in self.tags:
-            game.pioche_pieces.ajouter_piece_modele("couloir_NS")
-        if "ajoute_piece_rare" in self.tags:
-            game.pioche_pieces.ajouter_piece_modele("salle_tresor")
+
+    def copier (self) -> 'PiecePosee' :
+        copie = PiecePosee.__new__(PiecePosee)
+        copie.modele = self.modele
+        copie.recompense_prise = self.recompense_prise
+        copie.contenu = list(self.contenu)
+        copie.or_dans_piece = self.or_dans_piece
+        return copie
+
+
+
+
+    def __repr__ (self) -> str :
+        return f"PiecePosee({self.modele.nom!r}, {self.modele.forme.nom})"
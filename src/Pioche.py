@@ -1,28 +1,21 @@
 from __future__ import annotations
+import copy
 import random
-from typing import List, Optional, Dict, TYPE_CHECKING
+from typing import Callable, List, Optional, Dict, Tuple, TYPE_CHECKING
 
 
+from src.echantillonnage import ArbreFenwick
 from src.Piece import (
     Piece,
     FORME_COULOIR_EO,
     FORME_COULOIR_NS,
-    FORME_ANGLE_NE,
-    FORME_ANGLE_ES,
-    FORME_ANGLE_SO,
-    FORME_ANGLE_ON,
     FORME_CROIX,
-    FORME_IMPASSE_N,
-    FORME_IMPASSE_S,
-    FORME_IMPASSE_E,
-    FORME_IMPASSE_O,
     CouleurPiece,
     FORME_CARRE,
-    FORME_T_NES,
-    FORME_T_ESO,
-    FORME_T_SON,
-    FORME_T_ONE,
 )
+from src.catalogue import charger_pieces
+from src.directions import BITS
+from src.effets import effets_modele
 
 
 if TYPE_CHECKING:
@@ -34,6 +27,147 @@ def correspondance_poids_rarete (rarete : int) -> int :
     return correspondances.get(rarete, 1)
 
 
+BONUS_PAR_BOOST = 0.5   # chaque boost de couleur (Furnace, Greenhouse, tags boost_*) ajoute +50% au poids des pièces de cette couleur
+
+
+
+
+# signature locale d'un emplacement, en masques de portes (cf. directions.BITS) :
+# (bit de la direction d'entrée, directions hors grille, directions où un voisin a une porte vers la case)
+SignaturePlacement = Tuple[int, int, int]
+
+
+def compatible_signature (piece : Piece, signature : SignaturePlacement) -> bool :
+    """
+    Même règle que Piece.peut_etre_posee, mais exprimée sur la signature de l'emplacement.
+
+    Paramètres
+    ----------
+    piece : Piece
+        Modèle à tester.
+    signature : SignaturePlacement
+        Signature calculée par Pioche.signature_placement.
+
+    Returns
+    -------
+    bool
+        True si la pièce peut être posée sur tout emplacement ayant cette signature.
+    """
+    return piece.peut_etre_posee_masque(*signature)
+
+
+
+
+class EntreePlacement :
+    """
+    Entrée de l'index de placement : les pièces posables pour une signature, et leur arbre de poids.
+
+    Attributs
+    ---------
+    pieces : List[Piece]
+        Modèles compatibles avec la signature (ordre du catalogue).
+    arbre : ArbreFenwick
+        Poids de tirage de chaque modèle (rareté x bonus de couleur).
+    par_couleur : Dict[int, List[int]]
+        Indices (dans pieces) par valeur de couleur, pour répercuter un changement de boost.
+    gratuites : List[int]
+        Indices des modèles sans coût en gemmes.
+    avec_nord : List[int]
+        Indices des modèles ayant une porte au nord.
+
+    Méthodes
+    --------
+    ajouter(piece, poids) -> None
+    choix_pondere(indices, exclus, rng) -> int | None
+    copier() -> EntreePlacement
+        Copie indépendante (listes et arbre dupliqués, modèles partagés).
+    """
+
+    def __init__(self, pieces : List[Piece], poids : List[float]) -> None :
+        self.pieces : List[Piece] = []
+        self.arbre = ArbreFenwick(poids)   # construction en O(n)
+        self.par_couleur : Dict[int, List[int]] = {}
+        self.gratuites : List[int] = []
+        self.avec_nord : List[int] = []
+        for p in pieces :
+            self._referencer(p)
+
+
+
+    def ajouter (self, piece : Piece, poids : float) -> None :
+        """ Ajout incrémental (catalogue qui grandit en cours de partie), O(log n) """
+        self.arbre.ajouter(poids)
+        self._referencer(piece)
+
+
+
+    def _referencer (self, piece : Piece) -> None :
+        i = len(self.pieces)
+        self.pieces.append(piece)
+        self.par_couleur.setdefault(piece.couleur.value, []).append(i)
+        if piece.cout_gemmes == 0 :
+            self.gratuites.append(i)
+        if piece.forme.masque & BITS["N"] :
+            self.avec_nord.append(i)
+
+
+
+    def copier (self) -> 'EntreePlacement' :
+        copie = EntreePlacement.__new__(EntreePlacement)
+        copie.pieces = list(self.pieces)
+        copie.arbre = self.arbre.copier()
+        copie.par_couleur = {c : list(indices) for c, indices in self.par_couleur.items()}
+        copie.gratuites = list(self.gratuites)
+        copie.avec_nord = list(self.avec_nord)
+        return copie
+
+
+
+    def choix_pondere (self, indices : List[int], exclus : List[int], rng) -> Optional[int] :
+        """ Tirage pondéré parmi un petit sous-ensemble d'indices (règles de remplacement du tirage) """
+        candidats = [i for i in indices if i not in exclus]
+        if not candidats :
+            return None
+        return rng.choices(candidats, weights=[self.arbre.poids(i) for i in candidats])[0]
+
+
+
+
+# MODELES PARTAGES
+# les modèles sont immuables : ils sont construits une fois par processus et partagés par toutes les parties
+
+_CATALOGUE : Optional[Tuple[Piece, ...]] = None
+_MODELES_DYNAMIQUES : Dict[str, Piece] = {}
+_PIOCHE_NEUVE : Optional['Pioche'] = None
+
+
+def creer_catalogue () -> List[Piece] :
+    """ Construit les modèles du catalogue de base (appelé une seule fois par processus, cf. catalogue_partage) """
+    return charger_pieces()   # src/donnees/pieces.json, compilé et mis en cache par src.catalogue
+
+
+
+
+def catalogue_partage () -> Tuple[Piece, ...] :
+    """ Modèles du catalogue de base, construits au premier appel (effets résolus au passage, cf. src.effets) """
+    global _CATALOGUE
+    if _CATALOGUE is None :
+        _CATALOGUE = tuple(creer_catalogue())
+        for modele in _CATALOGUE :
+            effets_modele(modele)
+    return _CATALOGUE
+
+
+
+
+def modele_dynamique (cle : str, fabrique : Callable[[], Piece]) -> Piece :
+    """ Modèle ajouté en cours de partie, créé une seule fois par processus pour une clé donnée """
+    modele = _MODELES_DYNAMIQUES.get(cle)
+    if modele is None :
+        modele = _MODELES_DYNAMIQUES[cle] = fabrique()
+    return modele
+
+
 
 
 class Pioche :
@@ -43,241 +177,198 @@ class Pioche :
     ---------
     catalogue : List[Piece]
         Liste des Piece disponibles (modèles).
+    rng : random.Random
+        Flux d'aléa des tirages (un flux propre si non fourni).
     bonus_couleur : Dict[int, float] 
-        Multiplicateur de poids.
+        Multiplicateur de poids (clé : valeur de CouleurPiece), tenu à jour depuis les boosts du jeu.
     _constructeurs : Dict[str, Callable[[], Piece]]
         Constructeurs rapides pour quelques pièces spéciales.
     _par_nom : Dict[str, Piece]
         Index des pièces par nom pour recherches/ajouts rapides.
+    version_catalogue : int
+        Incrémentée à chaque modification du catalogue.
+    ajouts : List[Piece]
+        Modèles ajoutés au catalogue de base en cours de partie, dans l'ordre (ce qu'une sauvegarde doit rejouer).
+    _index_placement : Dict[SignaturePlacement, EntreePlacement]
+        Pièces posables (et leurs poids) par signature d'emplacement, rempli à la demande
+        et mis à jour incrémentalement quand le catalogue ou les boosts changent.
+    _partagee : bool
+        Catalogue, bonus et index sont partagés avec une copie (cf. copier) : à dupliquer avant de les modifier.
 
     Méthodes
     -------
     _creer_catalogue() -> List[Piece]
         Construit la liste initiale de modèles.
+    signature_placement(grille, x, y, dir_entree) -> SignaturePlacement
+        Calcule la signature locale d'un emplacement.
     _garder_pieces_compatibles(grille, x, y, dir_entree): 
-        Filtre les pièces posables.
+        Filtre les pièces posables (via l'index de placement).
     _poids(piece) -> float 
         Calcule le poids de tirage d'une pièce.
+    appliquer_boosts(boosts) -> None
+        Répercute les boosts de couleur du jeu sur les poids (O(log n) par pièce concernée).
     tirage_3_pieces(...) -> List[Piece]
         Renvoie jusqu'à 3 pièces proposées pour un emplacement.
     ajouter_piece_modele(modele) -> None
         Ajoute un modèle par instance ou par nom.
+    copier(rng=None) -> Pioche
+        Copie sur écriture : les structures ne sont dupliquées qu'à la première modification.
     """
 
-    def __init__(self) -> None : 
+    def __init__(self, rng : Optional[random.Random] = None) -> None : 
+        self.rng = rng if rng is not None else random.Random()
         self.catalogue : List[Piece] = self._creer_catalogue()
         self.bonus_couleur : Dict[int, float] = {}   # le int correspond a la couleur
         self._constructeurs = {
-            "couloir_NS": lambda: Piece("Couloir N-S", CouleurPiece.ORANGE, FORME_COULOIR_NS),
-            "couloir_EO": lambda: Piece("Couloir E-O", CouleurPiece.ORANGE, FORME_COULOIR_EO),
-            "salle_tresor": lambda: Piece("Salle au trésor", CouleurPiece.JAUNE, FORME_CROIX, cout_gemmes=2, rarete=3),
+            "couloir_NS": lambda: modele_dynamique("couloir_NS", lambda: Piece("Couloir N-S", CouleurPiece.ORANGE, FORME_COULOIR_NS)),
+            "couloir_EO": lambda: modele_dynamique("couloir_EO", lambda: Piece("Couloir E-O", CouleurPiece.ORANGE, FORME_COULOIR_EO)),
+            "salle_tresor": lambda: modele_dynamique("salle_tresor", lambda: Piece("Salle au trésor", CouleurPiece.JAUNE, FORME_CROIX, cout_gemmes=2, rarete=3)),
         }
         self._par_nom: Dict[str, Piece] = {p.nom: p for p in self.catalogue}
+        self.version_catalogue : int = 0
+        self.ajouts : List[Piece] = []
+        self._index_placement : Dict[SignaturePlacement, EntreePlacement] = {}
+        self._partagee : bool = False
 
 
 
 
-    def _creer_catalogue (self) -> List[Piece] :
-        pieces: List[Piece] = []
+    def copier (self, rng : Optional[random.Random] = None) -> 'Pioche' :
+        """
+        Copie de la pioche qui partage catalogue, bonus et index de placement avec l'original : les deux pioches
+        dupliquent ces structures avant leur première modification (ajout au catalogue, boost de couleur).
+        Un tirage ne les modifie pas ; une signature ajoutée à l'index partagé vaut pour les deux, dont l'état est identique.
 
+        Paramètres
+        ----------
+        rng : random.Random | None
+            Flux d'aléa de la copie (par défaut une copie de celui de l'original, qui poursuit la même suite).
 
-        # ----------------- PIECESS VIOLETTES -----------------
+        Returns
+        -------
+        Pioche
+        """
+        copie = Pioche.__new__(Pioche)
+        copie.rng = rng if rng is not None else copy.copy(self.rng)
+        copie.catalogue = self.catalogue
+        copie.bonus_couleur = self.bonus_couleur
+        copie._constructeurs = self._constructeurs   # jamais modifié
+        copie._par_nom = self._par_nom
+        copie.version_catalogue = self.version_catalogue
+        copie.ajouts = self.ajouts
+        copie._index_placement = self._index_placement
+        copie._partagee = self._partagee = True
+        return copie
 
-        # Bedroom
-        pieces.append(Piece("Bedroom", CouleurPiece.VIOLET, FORME_ANGLE_SO))
-        pieces.append(Piece("Bedroom", CouleurPiece.VIOLET, FORME_ANGLE_ES))
-        pieces.append(Piece("Bedroom", CouleurPiece.VIOLET, FORME_ANGLE_NE))
-        pieces.append(Piece("Bedroom", CouleurPiece.VIOLET, FORME_ANGLE_ON))
 
 
-        # Master Bedroom
-        pieces.append(Piece("Master Bedroom", CouleurPiece.VIOLET, FORME_IMPASSE_S, cout_gemmes=1, rarete=3))
-        pieces.append(Piece("Master Bedroom", CouleurPiece.VIOLET, FORME_IMPASSE_N, cout_gemmes=1, rarete=3))
-        pieces.append(Piece("Master Bedroom", CouleurPiece.VIOLET, FORME_IMPASSE_E, cout_gemmes=1, rarete=3))
-        pieces.append(Piece("Master Bedroom", CouleurPiece.VIOLET, FORME_IMPASSE_O, cout_gemmes=1, rarete=3))
 
+    def _detacher (self) -> None :
+        """ Duplique les structures partagées avec une copie, avant de les modifier """
+        if not self._partagee :
+            return
+        self.catalogue = list(self.catalogue)
+        self.bonus_couleur = dict(self.bonus_couleur)
+        self._par_nom = dict(self._par_nom)
+        self.ajouts = list(self.ajouts)
+        self._index_placement = {signature : entree.copier() for signature, entree in self._index_placement.items()}
+        self._partagee = False
 
-        # Nursery
-        pieces.append(Piece("Nursery", CouleurPiece.VIOLET, FORME_IMPASSE_S))
-        pieces.append(Piece("Nursery", CouleurPiece.VIOLET, FORME_IMPASSE_N))
-        pieces.append(Piece("Nursery", CouleurPiece.VIOLET, FORME_IMPASSE_E))
-        pieces.append(Piece("Nursery", CouleurPiece.VIOLET, FORME_IMPASSE_O))
 
 
 
-        # ----------------- PIECESS BLEUES -----------------
+    def _creer_catalogue (self) -> List[Piece] :
+        """ Catalogue initial d'une partie : une liste propre à la pioche, des modèles partagés """
+        return list(catalogue_partage())
 
-        # Locker
-        pieces.append(Piece("Locker", CouleurPiece.BLEU, FORME_COULOIR_NS))
-        pieces.append(Piece("Locker", CouleurPiece.BLEU, FORME_COULOIR_EO))
 
-        # Pantry
-        pieces.append(Piece("Pantry", CouleurPiece.BLEU, FORME_ANGLE_SO))
-        pieces.append(Piece("Pantry", CouleurPiece.BLEU, FORME_ANGLE_ES))
-        pieces.append(Piece("Pantry", CouleurPiece.BLEU, FORME_ANGLE_NE))
-        pieces.append(Piece("Pantry", CouleurPiece.BLEU, FORME_ANGLE_ON))
 
-        #Parlor
-        pieces.append(Piece("Parlor", CouleurPiece.BLEU, FORME_ANGLE_SO))
-        pieces.append(Piece("Parlor", CouleurPiece.BLEU, FORME_ANGLE_ES))
-        pieces.append(Piece("Parlor", CouleurPiece.BLEU, FORME_ANGLE_NE))
-        pieces.append(Piece("Parlor", CouleurPiece.BLEU, FORME_ANGLE_ON))
 
-        # Office
-        office_so = Piece("Office", CouleurPiece.BLEU, FORME_ANGLE_SO)
-        office_es = Piece("Office", CouleurPiece.BLEU, FORME_ANGLE_ES)
-        office_ne = Piece("Office", CouleurPiece.BLEU, FORME_ANGLE_NE)
-        office_on = Piece("Office", CouleurPiece.BLEU, FORME_ANGLE_ON)
-        for o in (office_so, office_es, office_ne, office_on):
-            o.or_dans_piece = 3 
-            pieces.append(o)
+    def signature_placement (self, grille : 'Grille', x : int, y : int, dir_entree : str) -> SignaturePlacement :
+        """
+        Signature locale de l'emplacement (x, y) : c'est tout ce dont dépend la validité d'une pose.
 
-        pieces.append(office_so)
-        pieces.append(office_es)
-        pieces.append(office_ne)
-        pieces.append(office_on)
-        
-        # Security
-        pieces.append(Piece("Security", CouleurPiece.BLEU, FORME_T_NES))
-        pieces.append(Piece("Security", CouleurPiece.BLEU, FORME_T_ESO))
-        pieces.append(Piece("Security", CouleurPiece.BLEU, FORME_T_SON))
-        pieces.append(Piece("Security", CouleurPiece.BLEU, FORME_T_ONE))
-
-
-        # Vault 
-        vault_s = Piece("Vault", CouleurPiece.BLEU, FORME_IMPASSE_S, cout_gemmes=2, rarete=3)
-        vault_n = Piece("Vault", CouleurPiece.BLEU, FORME_IMPASSE_N, cout_gemmes=2, rarete=3)
-        vault_e = Piece("Vault", CouleurPiece.BLEU, FORME_IMPASSE_E, cout_gemmes=2, rarete=3)
-        vault_o = Piece("Vault", CouleurPiece.BLEU, FORME_IMPASSE_O, cout_gemmes=2, rarete=3)
-        for v in (vault_s, vault_n, vault_e, vault_o):
-            v.or_dans_piece = 40  
-            pieces.append(v)
-
-        # Chamber of Mirrors
-        pieces.append(Piece("Chamber of Mirrors", CouleurPiece.BLEU, FORME_IMPASSE_S, cout_gemmes=2, rarete=2))
-        pieces.append(Piece("Chamber of Mirrors", CouleurPiece.BLEU, FORME_IMPASSE_N, cout_gemmes=2, rarete=2))
-        pieces.append(Piece("Chamber of Mirrors", CouleurPiece.BLEU, FORME_IMPASSE_E, cout_gemmes=2, rarete=2))
-        pieces.append(Piece("Chamber of Mirrors", CouleurPiece.BLEU, FORME_IMPASSE_O, cout_gemmes=2, rarete=2))
-
-        # Pool
-        pieces.append(Piece("Pool", CouleurPiece.BLEU, FORME_T_NES, cout_gemmes=1, rarete=1))
-        pieces.append(Piece("Pool", CouleurPiece.BLEU, FORME_T_ESO, cout_gemmes=1, rarete=1))
-        pieces.append(Piece("Pool", CouleurPiece.BLEU, FORME_T_SON, cout_gemmes=1, rarete=1))
-        pieces.append(Piece("Pool", CouleurPiece.BLEU, FORME_T_ONE, cout_gemmes=1, rarete=1))
-        
+        Paramètres
+        ----------
+        grille : Grille
+        x, y : int
+            Coordonnées de la case cible.
+        dir_entree : str
+            Direction d'arrivée ('N', 'S', 'E', 'O').
 
-        # Gallery
-        pieces.append(Piece("Gallery", CouleurPiece.BLEU, FORME_COULOIR_NS))
-        pieces.append(Piece("Gallery", CouleurPiece.BLEU, FORME_COULOIR_EO))
-
-        # Rotunda
-        pieces.append(Piece("Rotunda", CouleurPiece.BLEU, FORME_ANGLE_SO, cout_gemmes=2, rarete=2))
-        pieces.append(Piece("Rotunda", CouleurPiece.BLEU, FORME_ANGLE_ES, cout_gemmes=2, rarete=2))
-        pieces.append(Piece("Rotunda", CouleurPiece.BLEU, FORME_ANGLE_NE, cout_gemmes=2, rarete=2))
-        pieces.append(Piece("Rotunda", CouleurPiece.BLEU, FORME_ANGLE_ON, cout_gemmes=2, rarete=2))
-
-        # Den
-        pieces.append(Piece("Den", CouleurPiece.BLEU, FORME_T_NES))
-        pieces.append(Piece("Den", CouleurPiece.BLEU, FORME_T_ESO))
-        pieces.append(Piece("Den", CouleurPiece.BLEU, FORME_T_SON))
-        pieces.append(Piece("Den", CouleurPiece.BLEU, FORME_T_ONE))
-
-
-        # ----------------- PIECESS VERTES -----------------
-
-        # Patio
-        pieces.append(Piece("Patio", CouleurPiece.VERT, FORME_ANGLE_SO))
-        pieces.append(Piece("Patio", CouleurPiece.VERT, FORME_ANGLE_ES))
-        pieces.append(Piece("Patio", CouleurPiece.VERT, FORME_ANGLE_NE))
-        pieces.append(Piece("Patio", CouleurPiece.VERT, FORME_ANGLE_ON))
-
-        # Greenhouse
-        pieces.append(Piece("Greenhouse", CouleurPiece.VERT, FORME_IMPASSE_S, cout_gemmes=1))
-        pieces.append(Piece("Greenhouse", CouleurPiece.VERT, FORME_IMPASSE_N, cout_gemmes=1))
-        pieces.append(Piece("Greenhouse", CouleurPiece.VERT, FORME_IMPASSE_E, cout_gemmes=1))
-        pieces.append(Piece("Greenhouse", CouleurPiece.VERT, FORME_IMPASSE_O, cout_gemmes=1))
-
-        # Veranda
-        pieces.append(Piece("Veranda", CouleurPiece.VERT, FORME_COULOIR_NS, rarete=2))
-        pieces.append(Piece("Veranda", CouleurPiece.VERT, FORME_COULOIR_NS, rarete=2)) 
-        pieces.append(Piece("Veranda", CouleurPiece.VERT, FORME_COULOIR_EO, rarete=2))
-        pieces.append(Piece("Veranda", CouleurPiece.VERT, FORME_COULOIR_EO, rarete=2)) 
-
-        # Secret Garden
-        pieces.append(Piece("Garden", CouleurPiece.VERT, FORME_T_NES))
-        pieces.append(Piece("Garden", CouleurPiece.VERT, FORME_T_ESO))
-        pieces.append(Piece("Garden", CouleurPiece.VERT, FORME_T_SON))
-        pieces.append(Piece("Garden", CouleurPiece.VERT, FORME_T_ONE))
-       
+        Returns
+        -------
+        SignaturePlacement
+            (bit de dir_entree, masque hors grille, masque des portes exigées par les voisins)
+        """
+        hors_bornes, requises = grille.masques_voisinage(x, y)
+        return BITS[dir_entree], hors_bornes, requises
 
-        # ----------------- PIECES ROUGES -----------------
 
-        # Furnace 
-        pieces.append(Piece("Furnace", CouleurPiece.ROUGE, FORME_IMPASSE_N, rarete=3))
-        pieces.append(Piece("Furnace", CouleurPiece.ROUGE, FORME_IMPASSE_S, rarete=3)) 
-        pieces.append(Piece("Furnace", CouleurPiece.ROUGE, FORME_IMPASSE_O, rarete=3))
-        pieces.append(Piece("Furnace", CouleurPiece.ROUGE, FORME_IMPASSE_E, rarete=3)) 
 
-        # Maid's Chamber
-        pieces.append(Piece("MaidsChamber", CouleurPiece.ROUGE, FORME_ANGLE_SO))
-        pieces.append(Piece("MaidsChamber", CouleurPiece.ROUGE, FORME_ANGLE_ES))
-        pieces.append(Piece("MaidsChamber", CouleurPiece.ROUGE, FORME_ANGLE_NE))
-        pieces.append(Piece("MaidsChamber", CouleurPiece.ROUGE, FORME_ANGLE_ON))
 
-        # Chapel
-        pieces.append(Piece("Chapel", CouleurPiece.ROUGE, FORME_T_NES))
-        pieces.append(Piece("Chapel", CouleurPiece.ROUGE, FORME_T_ESO))
-        pieces.append(Piece("Chapel", CouleurPiece.ROUGE, FORME_T_SON))
-        pieces.append(Piece("Chapel", CouleurPiece.ROUGE, FORME_T_ONE))
+    def _entree_placement (self, grille : 'Grille', x : int, y : int, dir_entree : str) -> Optional[EntreePlacement] :
+        """
+        Entrée de l'index pour l'emplacement (x, y).
+        Une signature n'est évaluée sur le catalogue qu'une fois ; ensuite c'est une simple lecture de dictionnaire.
+        """
+        if dir_entree not in BITS :
+            return None
+        signature = self.signature_placement(grille, x, y, dir_entree)
+        entree = self._index_placement.get(signature)
+        if entree is None :
+            valides = [p for p in self.catalogue if compatible_signature(p, signature)]
+            entree = EntreePlacement(valides, [self._poids(p) for p in valides])
+            self._index_placement[signature] = entree
+        return entree
 
 
-        # ----------------- PIECESS ORANGES -----------------
-        
-        # Hallway
-        pieces.append(Piece("Hallway", CouleurPiece.ORANGE, FORME_T_NES))
-        pieces.append(Piece("Hallway", CouleurPiece.ORANGE, FORME_T_ESO))
-        pieces.append(Piece("Hallway", CouleurPiece.ORANGE, FORME_T_SON))
-        pieces.append(Piece("Hallway", CouleurPiece.ORANGE, FORME_T_ONE))
-
-        # Passageway
-        pieces.append(Piece("Passageway", CouleurPiece.ORANGE, FORME_CROIX))
-        
-        # Corridor
-        pieces.append(Piece("Corridor", CouleurPiece.ORANGE, FORME_COULOIR_NS))
-        pieces.append(Piece("Corridor", CouleurPiece.ORANGE, FORME_COULOIR_EO))
 
-        
 
+    def _garder_pieces_compatibles (self, grille : 'Grille', x : int, y : int, dir_entree : str) -> List[Piece] :
+        """ Pièces du catalogue posables en (x, y). La liste renvoyée est partagée : ne pas la modifier. """
+        entree = self._entree_placement(grille, x, y, dir_entree)
+        return entree.pieces if entree is not None else []
 
-        # ----------------- PIECESS JAUNES -----------------
-        
-        # Locksmith 
-        pieces.append(Piece("Locksmith", CouleurPiece.JAUNE, FORME_IMPASSE_N))
-        pieces.append(Piece("Locksmith", CouleurPiece.JAUNE, FORME_IMPASSE_S))
-        pieces.append(Piece("Locksmith", CouleurPiece.JAUNE, FORME_IMPASSE_E))
-        pieces.append(Piece("Locksmith", CouleurPiece.JAUNE, FORME_IMPASSE_O))
 
-        # Commissary
-        pieces.append(Piece("Commissary", CouleurPiece.JAUNE, FORME_ANGLE_SO))
-        pieces.append(Piece("Commissary", CouleurPiece.JAUNE, FORME_ANGLE_ES))
-        pieces.append(Piece("Commissary", CouleurPiece.JAUNE, FORME_ANGLE_NE))
-        pieces.append(Piece("Commissary", CouleurPiece.JAUNE, FORME_ANGLE_ON))
 
-        # Kitchen 
-        pieces.append(Piece("Kitchen", CouleurPiece.JAUNE, FORME_ANGLE_SO))
-        pieces.append(Piece("Kitchen", CouleurPiece.JAUNE, FORME_ANGLE_ES))
-        pieces.append(Piece("Kitchen", CouleurPiece.JAUNE, FORME_ANGLE_NE))
-        pieces.append(Piece("Kitchen", CouleurPiece.JAUNE, FORME_ANGLE_ON))
 
+    def _indexer_nouvelle_piece (self, piece : Piece) -> None :
+        """ Le catalogue a grandi : on ajoute la pièce aux entrées déjà construites qu'elle satisfait """
+        self.version_catalogue += 1
+        self.ajouts.append(piece)
+        poids = self._poids(piece)
+        for signature, entree in self._index_placement.items() :
+            if compatible_signature(piece, signature) :
+                entree.ajouter(piece, poids)
 
-        return pieces
-            
 
 
 
-    def _garder_pieces_compatibles (self, grille : 'Grille', x : int, y : int, dir_entree : str) -> List[Piece] :
-        return [p for p in self.catalogue if p.peut_etre_posee(grille, x, y, dir_entree)]
-    
+    def appliquer_boosts (self, boosts : Dict[CouleurPiece, int]) -> None :
+        """
+        Met à jour bonus_couleur à partir des boosts du jeu (Game.boosts_pioche_par_couleur).
+        Seules les couleurs dont le boost a changé sont répercutées dans les arbres de poids.
+
+        Paramètres
+        ----------
+        boosts : Dict[CouleurPiece, int]
+            Nombre de boosts accumulés par couleur.
+
+        Returns
+        -------
+        None
+        """
+        for couleur, n in boosts.items() :
+            bonus = n * BONUS_PAR_BOOST
+            if self.bonus_couleur.get(couleur.value, 0.0) == bonus :
+                continue
+            self._detacher()
+            self.bonus_couleur[couleur.value] = bonus
+            for entree in self._index_placement.values() :
+                for i in entree.par_couleur.get(couleur.value, ()) :
+                    entree.arbre.maj(i, self._poids(entree.pieces[i]))
+
 
 
 
@@ -303,7 +394,7 @@ class Pioche :
         dir_entree : str
             Direction d'entrée ('N', 'S', 'E', 'O').
         boosts : Dict[CouleurPiece, int] Defaults to None
-            Bonus de poids par couleur.
+            Boosts par couleur (Game.boosts_pioche_par_couleur) ; None garde les bonus courants.
 
         Returns
         -------
@@ -313,30 +404,35 @@ class Pioche :
         -----
         on ne garde que les pièces posables à cet endroit
         1) on garde seulement les pièces posables
-        1) pièces posables
+        1) pièces posables (lecture de l'index de placement, cf. _garder_pieces_compatibles)
         """
 
-        valides = [p for p in self.catalogue if p.peut_etre_posee(grille, x, y, dir_entree)]
+        if boosts is not None :
+            self.appliquer_boosts(boosts)
+
+        entree = self._entree_placement(grille, x, y, dir_entree)
        
-        if not valides:
+        if entree is None or not entree.pieces:
             return []
 
-        tirage = random.sample(valides, k=min(3, len(valides)))
+        # 2) tirage pondéré sans remise (rareté x bonus de couleur)
+        indices = entree.arbre.tirer_sans_remise(3, self.rng)
 
-        if not any(p.cout_gemmes == 0 for p in tirage):
-            gratuites = [p for p in valides if p.cout_gemmes == 0]
-            if gratuites:
-                tirage[0] = random.choice(gratuites)
+        if not any(entree.pieces[i].cout_gemmes == 0 for i in indices):
+            i = entree.choix_pondere(entree.gratuites, indices, self.rng)
+            if i is not None:
+                indices[0] = i
 
         
         est_derniere_ligne = (y == grille.hauteur - 1)
         if est_derniere_ligne:
-            if not any(p.a_porte("N") for p in tirage):
+            if not any(entree.pieces[i].a_porte("N") for i in indices):
                 # on cherche parmi les valides une pièce qui a N
-                candidates_nord = [p for p in valides if p.a_porte("N")]
-                if candidates_nord:
-                    tirage[-1] = random.choice(candidates_nord)
+                i = entree.choix_pondere(entree.avec_nord, indices, self.rng)
+                if i is not None:
+                    indices[-1] = i
 
+        tirage = [entree.pieces[i] for i in indices]
         return tirage
     
  
@@ -358,10 +454,13 @@ class Pioche :
         -------
             None
         """
+        self._detacher()
+
         # vraie pièce
         if isinstance(modele, Piece):
             self.catalogue.append(modele)
             self._par_nom[modele.nom] = modele
+            self._indexer_nouvelle_piece(modele)
             return
 
         #  chaîne  
@@ -373,17 +472,33 @@ class Pioche :
         #  interpréteur 
         nom_lower = nom.lower()
 
+        # modèles mis en cache par processus : ajouter deux fois le même nom ne crée pas de nouveau modèle
         if nom_lower in ("couloir_ns", "couloir-ns", "ns"):
-            p = Piece("Couloir NS", CouleurPiece.ORANGE, FORME_COULOIR_NS)
+            p = modele_dynamique("Couloir NS", lambda: Piece("Couloir NS", CouleurPiece.ORANGE, FORME_COULOIR_NS))
         elif nom_lower in ("couloir_eo", "couloir-eo", "eo", "couloir"):
-            p = Piece("Dynamic Corridor EO", CouleurPiece.ORANGE, FORME_COULOIR_EO)
+            p = modele_dynamique("Dynamic Corridor EO", lambda: Piece("Dynamic Corridor EO", CouleurPiece.ORANGE, FORME_COULOIR_EO))
         elif nom_lower in ("carre", "square", "room"):
-            p = Piece("Dynamic Room", CouleurPiece.BLEU, FORME_CARRE)
+            p = modele_dynamique("Dynamic Room", lambda: Piece("Dynamic Room", CouleurPiece.BLEU, FORME_CARRE))
         elif nom_lower in ("croix", "cross", "plus"):
-            p = Piece("Dynamic Cross", CouleurPiece.BLEU, FORME_CROIX)
+            p = modele_dynamique("Dynamic Cross", lambda: Piece("Dynamic Cross", CouleurPiece.BLEU, FORME_CROIX))
         else:
             # valeur inconnue  on fait un carré par défaut
-            p = Piece(nom, CouleurPiece.BLEU, FORME_CARRE)
+            p = modele_dynamique(nom, lambda: Piece(nom, CouleurPiece.BLEU, FORME_CARRE))
 
         self.catalogue.append(p)
         self._par_nom[p.nom] = p
+        self._indexer_nouvelle_piece(p)
+
+
+
+
+def pioche_neuve (rng : Optional[random.Random] = None) -> Pioche :
+    """
+    Pioche de début de partie, copie (sur écriture, cf. Pioche.copier) d'une pioche modèle jamais tirée :
+    toutes les parties du processus partagent l'index de placement déjà rempli tant qu'elles ne modifient
+    ni le catalogue ni les bonus. Même état qu'une Pioche(rng) : les tirages sont identiques.
+    """
+    global _PIOCHE_NEUVE
+    if _PIOCHE_NEUVE is None :
+        _PIOCHE_NEUVE = Pioche()
+    return _PIOCHE_NEUVE.copier(rng=rng if rng is not None else random.Random())
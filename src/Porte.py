@@ -11,6 +11,8 @@ class Porte :
     
     """
 
+    __slots__ = ("__niveau", "ouverte")   # pas de __dict__ par porte
+
     def __init__(self, niveau : int = 0, ouverte : bool =False) :
         self.__niveau = niveau
         self.ouverte = ouverte 
@@ -0,0 +1,295 @@
+# accessibilité : pièces que le joueur peut atteindre par des portes ouvertes, et portes de leur frontière
+#
+# une pièce posée n'est jamais retirée et une porte ouverte ne se referme pas : les composantes ne font que fusionner,
+# un union-find suffit. Les cases modifiées sont lues dans le journal de la grille (Grille.cases_modifiees_depuis) et seules
+# elles sont recalculées ; chaque case apporte à sa composante le compte de ses portes de frontière, par niveau.
+# Le travail après un déplacement dépend donc des cases modifiées, jamais de la taille de la grille.
+
+from __future__ import annotations
+from array import array
+from typing import TYPE_CHECKING, List, Tuple
+
+from src.Grille import MASQUE_NIVEAU, PORTE_OUVERTE
+from src.Piece import MODELES
+from src.directions import BITS_MASQUE, VECT_BIT
+
+if TYPE_CHECKING :
+    from src.Grille import Grille
+    from src.Inventaire import Inventaire
+
+
+NIVEAUX = 3        # portes fermées de niveau 0, 1, 2 : indices 0 à 2 des comptes
+VERS_VIDE = 3      # indice des portes ouvertes sur une case vide (un tirage reste à faire)
+N_COMPTES = 4
+
+
+
+
+class Accessibilite :
+    """
+    Composantes connexes des pièces posées (reliées par un mur ouvert) et portes de frontière de chaque composante,
+    tenues à jour au fil des modifications de la grille.
+
+    Une porte de frontière est une porte de la forme d'une pièce de la composante, vers une case de la grille,
+    qui est fermée (comptée selon son niveau ; un mur pas encore créé compte au niveau 0, le sien n'est tiré qu'à l'ouverture)
+    ou ouverte sur une case vide.
+    Deux pièces séparées par un mur ouvert sont dans la même composante même si une seule des deux a la porte :
+    l'accessibilité est surestimée, jamais sous-estimée (un blocage annoncé est certain).
+
+    Paramètres
+    ----------
+    grille : Grille
+
+    Attributs
+    ---------
+    grille : Grille
+    _parent : array('i')
+        Union-find sur les cases (indice y * largeur + x).
+    _taille : array('i')
+        Nombre de cases des composantes (valable pour les racines).
+    _suivant : array('i')
+        Liste circulaire des cases de chaque composante (parcours en O(taille de la composante)).
+    _comptes : array('i')
+        Portes de frontière de chaque composante, N_COMPTES entiers par case (valables pour les racines).
+    _apports : array('i')
+        Portes de frontière propres à chaque case, même format.
+    _ouverts : bytearray
+        Masque des murs ouverts de chaque case (directions.BITS).
+    _cases : array('H')
+        Modèle de chaque case au dernier recalcul (cf. Grille.ids_cases).
+    _revision : int
+        grille.revision au dernier rafraîchissement.
+
+    Méthodes
+    --------
+    reconstruire() -> None
+        Recalcule tout (grille rechargée, ou modification qui défait une composante).
+    comptes_frontiere(x, y) -> Tuple[int, int, int, int]
+        Portes de frontière de la composante de (x, y) : fermées de niveau 0, 1, 2, puis ouvertes sur une case vide.
+    franchissables(x, y, inventaire) -> int
+        Nombre de portes de frontière que l'inventaire permet encore de passer.
+    meme_composante(a, b) -> bool
+    composante(x, y) -> List[Tuple[int, int]]
+        Cases de la composante de (x, y).
+    copier(grille) -> Accessibilite
+        Même état, rattaché à une copie de la grille (cf. Grille.copier).
+    """
+
+    def __init__ (self, grille : 'Grille') -> None :
+        self.grille = grille
+        self.reconstruire()
+
+
+
+    def reconstruire (self) -> None :
+        grille = self.grille
+        n = grille.largeur * grille.hauteur
+        # tableaux d'entiers plutôt que listes : 4 octets par case au lieu d'un pointeur et d'un objet int (grandes grilles)
+        self._parent = array('i', range(n))
+        self._taille = array('i', [1]) * n
+        self._suivant = array('i', range(n))
+        self._comptes = array('i', bytes(4 * N_COMPTES * n))
+        self._apports = array('i', bytes(4 * N_COMPTES * n))
+        self._ouverts = bytearray(n)
+        self._cases = array('H', bytes(2 * n))
+        self._revision = grille.revision
+        occupees = [i for i in range(n) if grille.ids_cases[i]]   # une case vide n'apporte rien
+        for i in occupees :
+            self._recalculer(i)
+        for i in occupees :
+            self._unir_voisins(i)
+
+
+
+    def copier (self, grille : 'Grille') -> 'Accessibilite' :
+        copie = Accessibilite.__new__(Accessibilite)
+        copie.grille = grille
+        copie._parent = array('i', self._parent)
+        copie._taille = array('i', self._taille)
+        copie._suivant = array('i', self._suivant)
+        copie._comptes = array('i', self._comptes)
+        copie._apports = array('i', self._apports)
+        copie._ouverts = bytearray(self._ouverts)
+        copie._cases = array('H', self._cases)
+        copie._revision = self._revision
+        return copie
+
+
+
+    def _racine (self, i : int) -> int :
+        parent = self._parent
+        while parent[i] != i :
+            parent[i] = parent[parent[i]]   # compression par moitié
+            i = parent[i]
+        return i
+
+
+
+    def _unir (self, a : int, b : int) -> None :
+        a, b = self._racine(a), self._racine(b)
+        if a == b :
+            return
+        if self._taille[a] < self._taille[b] :
+            a, b = b, a
+        self._parent[b] = a
+        self._taille[a] += self._taille[b]
+        suivant = self._suivant
+        suivant[a], suivant[b] = suivant[b], suivant[a]   # deux cycles échangent un successeur : un seul cycle
+        comptes = self._comptes
+        for k in range(N_COMPTES) :
+            comptes[a * N_COMPTES + k] += comptes[b * N_COMPTES + k]
+
+
+
+    def _recalculer (self, i : int) -> bool :
+        """
+        Recalcule les portes de frontière et les murs ouverts de la case i, et reporte la différence sur sa composante.
+
+        Returns
+        -------
+        bool
+            False si la case a perdu sa pièce ou un mur ouvert : les composantes sont à reconstruire.
+        """
+        grille = self.grille
+        L, H = grille.largeur, grille.hauteur
+        cases = grille.ids_cases
+        y, x = divmod(i, L)
+        modele = MODELES[cases[i]]
+        apport = [0] * N_COMPTES
+        ouverts = 0
+
+        if modele is not None :
+            masque = modele.forme.masque
+            murs_h, murs_v = grille.murs_horizontaux, grille.murs_verticaux
+            # (bit, case voisine dans la grille, octet du mur) : même indexation que Grille.mur
+            voisins = []
+            if y > 0 : voisins.append((1, i - L, murs_h[i]))
+            if y < H - 1 : voisins.append((2, i + L, murs_h[i + L]))
+            if x < L - 1 : voisins.append((4, i + 1, murs_v[y * (L + 1) + x + 1]))
+            if x > 0 : voisins.append((8, i - 1, murs_v[y * (L + 1) + x]))
+            for bit, j, etat in voisins :
+                if etat & PORTE_OUVERTE :
+                    ouverts |= bit
+                if not masque & bit :
+                    continue
+                if not etat :
+                    apport[0] += 1
+                elif not etat & PORTE_OUVERTE :
+                    apport[etat & MASQUE_NIVEAU] += 1
+                elif not cases[j] :
+                    apport[VERS_VIDE] += 1
+        elif self._cases[i] :
+            return False   # pièce retirée
+
+        if self._ouverts[i] & ~ouverts :
+            return False   # mur refermé
+        self._ouverts[i] = ouverts
+        self._cases[i] = cases[i]
+
+        r = self._racine(i) * N_COMPTES
+        for k in range(N_COMPTES) :
+            self._comptes[r + k] += apport[k] - self._apports[i * N_COMPTES + k]
+            self._apports[i * N_COMPTES + k] = apport[k]
+        return True
+
+
+
+    def _unir_voisins (self, i : int) -> None :
+        """ Réunit la case i aux pièces voisines dont le mur commun est ouvert """
+        cases = self.grille.ids_cases
+        if not cases[i] :
+            return
+        L = self.grille.largeur
+        for bit in BITS_MASQUE[self._ouverts[i]] :
+            dx, dy = VECT_BIT[bit]
+            j = i + dy * L + dx   # un mur ouvert n'est jamais un mur du bord (_recalculer ne les relève pas)
+            if cases[j] :
+                self._unir(i, j)
+
+
+
+    def _rafraichir (self) -> None :
+        """ Prend en compte les cases modifiées depuis le dernier appel (rien à faire si la grille n'a pas changé) """
+        grille = self.grille
+        if grille.revision == self._revision :
+            return
+        modifiees = grille.cases_modifiees_depuis(self._revision)
+        if modifiees is None :   # trop de modifications depuis le dernier appel
+            self.reconstruire()
+            return
+        L = grille.largeur
+        n = len(self._parent)
+
+        # une pièce posée ou retirée change aussi les portes de ses voisines (ouvertes sur une case qui n'est plus vide) ;
+        # un mur modifié a déjà marqué ses deux cases
+        cases = grille.ids_cases
+        a_recalculer = set(modifiees)
+        for i in modifiees :
+            if cases[i] == self._cases[i] :
+                continue
+            x = i % L
+            if x > 0 : a_recalculer.add(i - 1)
+            if x < L - 1 : a_recalculer.add(i + 1)
+            if i >= L : a_recalculer.add(i - L)
+            if i + L < n : a_recalculer.add(i + L)
+
+        a_recalculer = sorted(a_recalculer)
+        for i in a_recalculer :
+            if not self._recalculer(i) :
+                self.reconstruire()
+                return
+        for i in a_recalculer :
+            self._unir_voisins(i)
+        self._revision = grille.revision
+
+
+
+    def comptes_frontiere (self, x : int, y : int) -> Tuple[int, int, int, int] :
+        self._rafraichir()
+        r = self._racine(y * self.grille.largeur + x) * N_COMPTES
+        return tuple(self._comptes[r : r + N_COMPTES])
+
+
+
+    def franchissables (self, x : int, y : int, inventaire : 'Inventaire') -> int :
+        """
+        Nombre de portes de frontière de la composante de (x, y) que l'inventaire permet encore de passer :
+        portes ouvertes sur une case vide, et portes fermées dont le niveau peut être ouvert (Inventaire.ouvrir_porte, à blanc).
+
+        Paramètres
+        ----------
+        x, y : int
+            Case du joueur.
+        inventaire : Inventaire
+
+        Returns
+        -------
+        int
+            0 si le joueur ne peut plus rien découvrir de nouveau avec son inventaire actuel.
+        """
+        comptes = self.comptes_frontiere(x, y)
+        total = comptes[VERS_VIDE]
+        for niveau in range(NIVEAUX) :
+            if comptes[niveau] and inventaire.ouvrir_porte(niveau, dry_run=True) :
+                total += comptes[niveau]
+        return total
+
+
+
+    def meme_composante (self, a : Tuple[int, int], b : Tuple[int, int]) -> bool :
+        self._rafraichir()
+        L = self.grille.largeur
+        return self._racine(a[1] * L + a[0]) == self._racine(b[1] * L + b[0])
+
+
+
+    def composante (self, x : int, y : int) -> List[Tuple[int, int]] :
+        self._rafraichir()
+        L = self.grille.largeur
+        depart = y * L + x
+        cases = [depart]
+        i = self._suivant[depart]
+        while i != depart :
+            cases.append(i)
+            i = self._suivant[i]
+        return [(i % L, i // L) for i in cases]
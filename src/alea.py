@@ -0,0 +1,123 @@
+# générateur pseudo-aléatoire à état compact (64 bits), compatible avec l'interface de random.Random
+#
+# le Mersenne Twister de random.Random a un état de 2,5 Ko : trop gros pour tenir dans une sauvegarde
+# de quelques centaines d'octets (cf. src.sauvegarde). splitmix64 tient sur un entier de 64 bits.
+# Il n'hérite pas de random.Random, dont chaque instance porte quand même ces 2,5 Ko (4 flux par partie, cf. Game) :
+# les méthodes dérivées (choice, choices, randint ...) sont reprises telles quelles de random.Random.
+
+from __future__ import annotations
+from hashlib import sha512
+from typing import Any
+import os
+import random
+
+
+
+MASQUE_64 = (1 << 64) - 1
+GAMMA = 0x9E3779B97F4A7C15
+ECHELLE_53 = 2.0 ** -53
+
+
+
+
+class AleaCompact :
+    """
+    Générateur splitmix64 : état de 8 octets, même interface que random.Random
+    (random, getrandbits et tout ce qui en dérive : randint, choice, choices, shuffle, sample ...).
+
+    Paramètres
+    ----------
+    graine : int | str | bytes | None
+        Graine ; une chaîne est hachée (sha512), None tire une graine du système.
+
+    Attributs
+    ---------
+    _etat : int
+        Etat courant (entier non signé de 64 bits).
+
+    Méthodes
+    --------
+    seed(graine) -> None
+    random() -> float
+        Flottant uniforme dans [0, 1), 53 bits de précision.
+    getrandbits(k) -> int
+    getstate() -> int
+        L'état, un entier de 64 bits (cf. setstate).
+    setstate(etat) -> None
+    copier() -> AleaCompact
+        Générateur indépendant qui poursuit la même suite (plus rapide que copy.copy).
+    """
+
+    __slots__ = ("_etat", "gauss_next")
+
+    # code Python de random.Random, qui ne dépend que de random, getrandbits et _randbelow : mêmes tirages
+    _randbelow = random.Random._randbelow_with_getrandbits
+    randrange = random.Random.randrange
+    randint = random.Random.randint
+    choice = random.Random.choice
+    choices = random.Random.choices
+    shuffle = random.Random.shuffle
+    sample = random.Random.sample
+    uniform = random.Random.uniform
+    gauss = random.Random.gauss
+
+    def __init__ (self, graine : Any = None) -> None :
+        self.seed(graine)
+
+
+
+    def seed (self, graine : Any = None, version : int = 2) -> None :
+        if graine is None :
+            graine = os.urandom(8)
+        if isinstance(graine, str) :
+            graine = graine.encode("utf-8")
+        if isinstance(graine, (bytes, bytearray)) :
+            graine = int.from_bytes(sha512(graine).digest()[:8], "little")
+        self._etat = int(graine) & MASQUE_64
+        self.gauss_next = None
+
+
+
+    def _suivant (self) -> int :
+        self._etat = etat = (self._etat + GAMMA) & MASQUE_64
+        z = ((etat ^ (etat >> 30)) * 0xBF58476D1CE4E5B9) & MASQUE_64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASQUE_64
+        return z ^ (z >> 31)
+
+
+
+    def random (self) -> float :
+        return (self._suivant() >> 11) * ECHELLE_53
+
+
+
+    def getrandbits (self, k : int) -> int :
+        if k <= 64 :
+            if k < 0 :
+                raise ValueError("le nombre de bits doit être positif")
+            return self._suivant() >> (64 - k)
+        n = 0
+        decalage = 0
+        while decalage < k :
+            n |= self._suivant() << decalage
+            decalage += 64
+        return n & ((1 << k) - 1)
+
+
+
+    def getstate (self) -> int :
+        return self._etat
+
+
+
+    def setstate (self, etat : int) -> None :
+        self._etat = etat & MASQUE_64
+        self.gauss_next = None
+
+
+
+    def copier (self) -> 'AleaCompact' :
+        copie = AleaCompact.__new__(AleaCompact)   # sans __init__ : pas de graine à hacher
+        copie._etat = self._etat
+        copie.gauss_next = self.gauss_next
+        return copie
@@ -0,0 +1,216 @@
+# tables de butin : ce que donnent un casier, un coffre, un endroit à creuser ou un jardin
+#
+# une table est une liste pondérée (objet, poids, chance de l'inventaire qui le favorise). Elle est compilée en table
+# d'alias (méthode de Vose) : un tirage coûte un flottant aléatoire et deux lectures, quelle que soit la taille de la table.
+# Les chances de l'inventaire (Inventaire.chance_objets, chance_cles, chance_piecesOr) multiplient le poids des entrées
+# qu'elles concernent par (1 + chance) ; la table re-pondérée est compilée une fois par valeur des chances, puis gardée.
+#
+# les objets n'ont pas d'état propre (appliquer ne modifie que l'inventaire) : une seule instance de chaque, partagée.
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from src.AutreObjet import AutreObjet, Banane, Gateau, Pomme, Repas, Sandwich
+from src.ObjetPermanent import DetecteurMetaux, KitCrochetage, Marteau, ObjetPermanent, PatteLapin, Pelle
+
+if TYPE_CHECKING :
+    from src.Inventaire import Inventaire
+
+
+CHANCE_MAX = 1.0   # une chance de 100 % double le poids des entrées concernées ; au-delà elle est plafonnée
+
+# chances de l'inventaire (noms d'attributs de Inventaire)
+CHANCE_OBJETS = "chance_objets"
+CHANCE_CLES = "chance_cles"
+CHANCE_OR = "chance_piecesOr"
+
+
+
+
+class Ressource :
+    """
+    Butin compté (clés ou pièces d'or) : même interface que les objets (nom, appliquer).
+
+    Attributs
+    ---------
+    nom : str
+    attribut : str
+        Compteur de l'inventaire augmenté ("cles" ou "piecesOr").
+    quantite : int
+    """
+
+    __slots__ = ("nom", "attribut", "quantite")
+
+    def __init__ (self, nom : str, attribut : str, quantite : int) -> None :
+        self.nom = nom
+        self.attribut = attribut
+        self.quantite = quantite
+
+
+    def appliquer (self, inv : 'Inventaire') -> None :
+        if self.attribut == "cles" :
+            inv.ramasser_cles(self.quantite)
+        else :
+            inv.ramasser_pieceOr(self.quantite)
+
+
+
+
+# OBJETS PARTAGES
+
+POMME, BANANE, GATEAU, SANDWICH, REPAS = Pomme(), Banane(), Gateau(), Sandwich(), Repas()
+PELLE, MARTEAU, KIT_CROCHETAGE, DETECTEUR_METAUX, PATTE_LAPIN = Pelle(), Marteau(), KitCrochetage(), DetecteurMetaux(), PatteLapin()
+CLE = Ressource("clé", "cles", 1)
+OR_2 = Ressource("2 pièces d'or", "piecesOr", 2)
+OR_3 = Ressource("3 pièces d'or", "piecesOr", 3)
+OR_5 = Ressource("5 pièces d'or", "piecesOr", 5)
+
+CONSOMMABLES : Tuple[AutreObjet, ...] = (POMME, BANANE, GATEAU, SANDWICH, REPAS)
+PERMANENTS : Tuple[ObjetPermanent, ...] = (PELLE, MARTEAU, KIT_CROCHETAGE, DETECTEUR_METAUX, PATTE_LAPIN)
+OBJETS : Dict[str, Any] = {o.nom : o for o in CONSOMMABLES + PERMANENTS}   # par nom (achats en magasin, sauvegardes)
+
+
+
+
+class TableAlias :
+    """
+    Tirage pondéré en O(1) par la méthode des alias (Vose).
+
+    La case i (tirée uniformément) rend objets[i] avec la probabilité seuils[i], objets[alias[i]] sinon.
+
+    Paramètres
+    ----------
+    objets : Sequence
+    poids : Sequence[float]
+        Poids positifs ou nuls, pas tous nuls.
+
+    Méthodes
+    --------
+    tirer(rng) -> objet
+        Un appel à rng.random().
+    """
+
+    __slots__ = ("objets", "seuils", "alias")
+
+    def __init__ (self, objets : Sequence, poids : Sequence[float]) -> None :
+        n = len(objets)
+        total = float(sum(poids))
+        if n == 0 or total <= 0 :
+            raise ValueError("table d'alias : il faut au moins un poids strictement positif")
+        echelle = [p * n / total for p in poids]   # moyenne 1
+        self.objets = tuple(objets)
+        self.seuils = [1.0] * n
+        self.alias = list(range(n))
+        petits = [i for i, p in enumerate(echelle) if p < 1.0]
+        grands = [i for i, p in enumerate(echelle) if p >= 1.0]
+        while petits and grands :
+            petit, grand = petits.pop(), grands[-1]
+            self.seuils[petit] = echelle[petit]
+            self.alias[petit] = grand
+            echelle[grand] -= 1.0 - echelle[petit]   # le grand complète la case du petit
+            if echelle[grand] < 1.0 :
+                petits.append(grands.pop())
+        # restes (arrondis flottants) : seuil 1, déjà en place
+
+
+
+    def tirer (self, rng) -> Any :
+        u = rng.random() * len(self.objets)
+        i = int(u)
+        if u - i < self.seuils[i] :
+            return self.objets[i]
+        return self.objets[self.alias[i]]
+
+
+
+
+class TableButin :
+    """
+    Table de butin d'une source (casier, coffre ...), compilée en tables d'alias selon les chances de l'inventaire.
+
+    Paramètres
+    ----------
+    nom : str
+    entrees : Sequence[Tuple[objet | None, float, str | None]]
+        (objet, poids de base, chance de l'inventaire qui le favorise) ; None pour « rien trouvé », que les chances
+        ne changent pas.
+
+    Attributs
+    ---------
+    nom : str
+    objets : Tuple
+    poids : Tuple[float, ...]
+    chances : Tuple[str | None, ...]
+        Chance de chaque entrée (nom d'attribut de Inventaire, cf. CHANCE_OBJETS ...).
+    donne_cles : bool
+        La table peut donner une clé (Game._cles_a_portee en tient compte pour déclarer une partie bloquée).
+    _compilees : Dict[Tuple[float, float, float], TableAlias]
+        Tables d'alias par valeur des chances (chance_objets, chance_cles, chance_piecesOr), telles que lues.
+
+    Méthodes
+    --------
+    table(inv) -> TableAlias
+    tirer(rng, inv) -> objet | None
+    """
+
+    __slots__ = ("nom", "objets", "poids", "chances", "donne_cles", "_compilees")
+
+    def __init__ (self, nom : str, entrees : Sequence[Tuple[Any, float, Optional[str]]]) -> None :
+        self.nom = nom
+        self.objets = tuple(e[0] for e in entrees)
+        self.poids = tuple(float(e[1]) for e in entrees)
+        self.chances = tuple(e[2] for e in entrees)
+        self.donne_cles = any(isinstance(o, Ressource) and o.attribut == "cles" and p > 0 for o, p in zip(self.objets, self.poids))
+        self._compilees : Dict[Tuple[float, float, float], TableAlias] = {}
+
+
+
+    def table (self, inv : Optional['Inventaire'] = None) -> TableAlias :
+        """ Table d'alias pour les chances de l'inventaire (compilée à la première demande pour ces valeurs) """
+        cle = (inv.chance_objets, inv.chance_cles, inv.chance_piecesOr) if inv is not None else (0.0, 0.0, 0.0)
+        table = self._compilees.get(cle)
+        if table is None :
+            valeurs = {a : min(max(v, 0.0), CHANCE_MAX) for a, v in zip((CHANCE_OBJETS, CHANCE_CLES, CHANCE_OR), cle)}
+            poids = [p * (1.0 + valeurs[c]) if c is not None else p for p, c in zip(self.poids, self.chances)]
+            table = self._compilees[cle] = TableAlias(self.objets, poids)
+        return table
+
+
+
+    def tirer (self, rng, inv : Optional['Inventaire'] = None) -> Any :
+        """ Un objet de la table (None : rien trouvé), selon les chances de l'inventaire si fourni """
+        return self.table(inv).tirer(rng)
+
+
+
+
+def _consommables (poids : float = 1.0, contenu : Sequence[AutreObjet] = CONSOMMABLES) -> List[Tuple[Any, float, str]] :
+    return [(o, poids, CHANCE_OBJETS) for o in contenu]
+
+
+
+
+# TABLES DES SOURCES
+
+CASIER = TableButin("casier", _consommables() + [(CLE, 0.5, CHANCE_CLES), (OR_3, 0.5, CHANCE_OR)])
+COFFRE = TableButin("coffre", _consommables() + [(CLE, 0.5, CHANCE_CLES), (OR_5, 0.5, CHANCE_OR)])
+CREUSER = TableButin("creuser", _consommables(contenu=(POMME, BANANE, GATEAU)) + [(CLE, 0.5, CHANCE_CLES), (OR_2, 0.5, CHANCE_OR)])
+# jardin : un consommable une fois sur deux, un objet permanent trois fois sur dix (chances nulles)
+JARDIN_CONSOMMABLE = TableButin("jardin", _consommables() + [(None, 5.0, None)])
+JARDIN_PERMANENT = TableButin("jardin_permanent", [(o, 1.0, CHANCE_OBJETS) for o in PERMANENTS] + [(None, 35 / 3, None)])
+
+TABLES : Dict[str, TableButin] = {t.nom : t for t in (CASIER, COFFRE, CREUSER, JARDIN_CONSOMMABLE, JARDIN_PERMANENT)}
+
+
+
+
+def permanent_manquant (rng, inv : 'Inventaire') -> Optional[ObjetPermanent] :
+    """
+    Objet permanent trouvé dans un jardin, ou None. Un objet déjà possédé est remplacé par un des objets manquants
+    (tirage uniforme) : à chances nulles, le résultat est uniforme parmi les objets manquants.
+    """
+    obj = JARDIN_PERMANENT.tirer(rng, inv)
+    if obj is None or not inv.possede_obj_permanent(obj.nom) :
+        return obj
+    manquants = [o for o in PERMANENTS if not inv.possede_obj_permanent(o.nom)]
+    return rng.choice(manquants) if manquants else None
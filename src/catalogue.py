@@ -0,0 +1,137 @@
+# catalogue des pièces : lu dans un fichier de données (src/donnees/pieces.json), compilé une fois
+#
+# le fichier JSON est la référence, modifiable sans toucher au code. Sa forme compilée (un tuple de tuples, validé) est
+# mise en cache avec pickle dans src/donnees/__pycache__, avec l'empreinte du fichier : tant que le fichier ne change pas,
+# un nouveau processus relit le cache sans relire ni revalider le JSON.
+# L'ordre des modèles est celui du fichier, et l'indice d'un modèle du catalogue est son code dans les sauvegardes
+# (cf. src.sauvegarde) : ajouter les nouvelles pièces en fin de fichier pour garder les sauvegardes existantes lisibles.
+#
+# format : {"version": 1, "pieces": [{"nom": ..., "couleur": "BLEU", "formes": ["angle_so", ...],
+#           "cout_gemmes": 0, "rarete": 0, "tags": [], "or_initial": 0}, ...]}
+# un modèle par forme listée (une forme peut être répétée pour doubler ses chances de tirage).
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import pickle
+from typing import Dict, List, Tuple
+
+from src.Piece import (
+    Piece,
+    CouleurPiece,
+    FormePiece,
+    FORME_COULOIR_NS, FORME_COULOIR_EO, FORME_CROIX, FORME_CARRE,
+    FORME_IMPASSE_N, FORME_IMPASSE_S, FORME_IMPASSE_E, FORME_IMPASSE_O,
+    FORME_ANGLE_NE, FORME_ANGLE_ES, FORME_ANGLE_SO, FORME_ANGLE_ON,
+    FORME_T_NES, FORME_T_ESO, FORME_T_SON, FORME_T_ONE,
+)
+
+
+CHEMIN_PIECES = os.path.join(os.path.dirname(__file__), "donnees", "pieces.json")
+FORMAT_VERSION = 1
+VERSION_CACHE = 1   # à incrémenter si la forme compilée change
+
+FORMES : Dict[str, FormePiece] = {f.nom : f for f in (
+    FORME_COULOIR_NS, FORME_COULOIR_EO, FORME_CROIX, FORME_CARRE,
+    FORME_IMPASSE_N, FORME_IMPASSE_S, FORME_IMPASSE_E, FORME_IMPASSE_O,
+    FORME_ANGLE_NE, FORME_ANGLE_ES, FORME_ANGLE_SO, FORME_ANGLE_ON,
+    FORME_T_NES, FORME_T_ESO, FORME_T_SON, FORME_T_ONE,
+)}
+
+CHAMPS = ("nom", "couleur", "formes", "cout_gemmes", "rarete", "tags", "or_initial")
+
+# un modèle compilé : (nom, couleur, forme, cout_gemmes, rarete, tags, or_initial), couleur et forme par leur nom
+ModeleCompile = Tuple[str, str, str, int, int, Tuple[str, ...], int]
+
+
+
+
+def compiler (donnees : dict) -> Tuple[ModeleCompile, ...] :
+    """
+    Valide le contenu du fichier de pièces et le met à plat : un modèle par forme.
+
+    Paramètres
+    ----------
+    donnees : dict
+        Le fichier JSON décodé.
+
+    Returns
+    -------
+    Tuple[ModeleCompile, ...]
+        Dans l'ordre du fichier.
+    """
+    if donnees.get("version") != FORMAT_VERSION :
+        raise ValueError(f"catalogue : version {donnees.get('version')!r} non prise en charge (attendu : {FORMAT_VERSION})")
+    modeles : List[ModeleCompile] = []
+    for i, entree in enumerate(donnees.get("pieces", ())) :
+        nom = entree.get("nom")
+        inconnus = set(entree) - set(CHAMPS)
+        if not isinstance(nom, str) or not nom :
+            raise ValueError(f"catalogue : pièce n°{i} sans nom")
+        if inconnus :
+            raise ValueError(f"catalogue : {nom} : champs inconnus {sorted(inconnus)}")
+        if entree.get("couleur") not in CouleurPiece.__members__ :
+            raise ValueError(f"catalogue : {nom} : couleur {entree.get('couleur')!r} inconnue")
+        formes = entree.get("formes") or ()
+        if not formes :
+            raise ValueError(f"catalogue : {nom} : aucune forme")
+        for forme in formes :
+            if forme not in FORMES :
+                raise ValueError(f"catalogue : {nom} : forme {forme!r} inconnue")
+        rarete = entree.get("rarete", 0)
+        if rarete not in (0, 1, 2, 3) :
+            raise ValueError(f"catalogue : {nom} : rareté {rarete!r} hors de 0 à 3")
+        tags = tuple(entree.get("tags", ()))
+        for forme in formes :
+            modeles.append((nom, entree["couleur"], forme, int(entree.get("cout_gemmes", 0)), rarete, tags, int(entree.get("or_initial", 0))))
+    return tuple(modeles)
+
+
+
+
+def _chemin_cache (chemin : str) -> str :
+    dossier, nom = os.path.split(chemin)
+    return os.path.join(dossier, "__pycache__", os.path.splitext(nom)[0] + ".pickle")
+
+
+
+
+def charger_compile (chemin : str = CHEMIN_PIECES) -> Tuple[ModeleCompile, ...] :
+    """
+    Forme compilée du fichier de pièces : lue dans le cache si l'empreinte du fichier n'a pas changé,
+    sinon recompilée et réécrite dans le cache (sans erreur si le dossier n'est pas accessible en écriture).
+    """
+    with open(chemin, "rb") as f :
+        contenu = f.read()
+    empreinte = hashlib.sha256(contenu).hexdigest()
+    cache = _chemin_cache(chemin)
+
+    try :
+        with open(cache, "rb") as f :
+            version, empreinte_cache, modeles = pickle.load(f)
+        if version == VERSION_CACHE and empreinte_cache == empreinte :
+            return modeles
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError) :
+        pass   # pas de cache, ou cache illisible : on recompile
+
+    modeles = compiler(json.loads(contenu))
+    try :
+        os.makedirs(os.path.dirname(cache), exist_ok=True)
+        temporaire = f"{cache}.{os.getpid()}"
+        with open(temporaire, "wb") as f :
+            pickle.dump((VERSION_CACHE, empreinte, modeles), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporaire, cache)   # plusieurs processus peuvent compiler en même temps (src.sim --workers)
+    except OSError :
+        pass
+    return modeles
+
+
+
+
+def charger_pieces (chemin : str = CHEMIN_PIECES) -> List[Piece] :
+    """ Modèles du fichier de pièces, dans l'ordre du fichier (cf. Pioche.catalogue_partage, qui les partage) """
+    return [
+        Piece(nom, CouleurPiece[couleur], FORMES[forme], cout_gemmes=cout, rarete=rarete, tags=tags, or_initial=or_initial)
+        for nom, couleur, forme, cout, rarete, tags, or_initial in charger_compile(chemin)
+    ]
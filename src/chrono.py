@@ -0,0 +1,153 @@
+# chronométrage des frames et des handle_* du jeu : fenêtre glissante des dernières durées par série
+#
+# désactivé par défaut (la simulation et le rejeu n'en paient pas le coût) ; l'UI l'active au démarrage.
+# séries de la boucle pygame : "frame", "entrees", "jeu", "rendu", "affichage" ; une série "jeu.<handle>" par handle_*.
+
+from __future__ import annotations
+from bisect import bisect_left
+from collections import deque
+from time import perf_counter_ns
+from typing import Deque, Dict, List
+import csv
+
+
+
+TAILLE_FENETRE = 600   # dernières mesures gardées par série (10 s à 60 images/s)
+BORNES_US = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 33000)   # classes des histogrammes : <= borne, dernière : au-delà
+
+actif : bool = False
+
+maintenant = perf_counter_ns   # horloge des mesures, en nanosecondes
+
+
+
+
+class Serie :
+    """
+    Durées récentes d'une série de mesures.
+
+    Paramètres
+    ----------
+    nom : str
+    taille : int
+        Nombre de mesures gardées (les plus anciennes sont oubliées).
+
+    Attributs
+    ---------
+    nom : str
+    durees : Deque[int]
+        Dernières durées, en nanosecondes.
+    total : int
+        Nombre de mesures depuis le début (pas seulement dans la fenêtre).
+    max_ns : int
+        Durée maximale depuis le début.
+
+    Méthodes
+    --------
+    ajouter(duree_ns) -> None
+    percentile(p) -> float
+        Percentile des durées de la fenêtre, en microsecondes.
+    moyenne_us() -> float
+    histogramme() -> List[int]
+        Nombre de durées de la fenêtre par classe de BORNES_US (len(BORNES_US) + 1 classes).
+    """
+
+    __slots__ = ("nom", "durees", "total", "max_ns")
+
+    def __init__ (self, nom : str, taille : int = TAILLE_FENETRE) -> None :
+        self.nom = nom
+        self.durees : Deque[int] = deque(maxlen=taille)
+        self.total = 0
+        self.max_ns = 0
+
+
+
+    def ajouter (self, duree_ns : int) -> None :
+        self.durees.append(duree_ns)
+        self.total += 1
+        if duree_ns > self.max_ns :
+            self.max_ns = duree_ns
+
+
+
+    def percentile (self, p : float) -> float :
+        if not self.durees :
+            return 0.0
+        triees = sorted(self.durees)
+        return triees[min(len(triees) - 1, int(p / 100 * len(triees)))] / 1e3
+
+
+
+    def moyenne_us (self) -> float :
+        return sum(self.durees) / len(self.durees) / 1e3 if self.durees else 0.0
+
+
+
+    def histogramme (self) -> List[int] :
+        classes = [0] * (len(BORNES_US) + 1)
+        for d in self.durees :
+            classes[bisect_left(BORNES_US, d / 1e3)] += 1
+        return classes
+
+
+
+
+_SERIES : Dict[str, Serie] = {}
+
+
+
+
+def activer (valeur : bool = True) -> None :
+    global actif
+    actif = valeur
+
+
+
+
+def enregistrer (nom : str, duree_ns : int) -> None :
+    """ Ajoute une durée à la série `nom` (créée au premier appel) """
+    serie = _SERIES.get(nom)
+    if serie is None :
+        serie = _SERIES[nom] = Serie(nom)
+    serie.ajouter(duree_ns)
+
+
+
+
+def series () -> Dict[str, Serie] :
+    return _SERIES
+
+
+
+
+def vider () -> None :
+    _SERIES.clear()
+
+
+
+
+def exporter_csv (chemin : str) -> None :
+    """
+    Ecrit une ligne par série : nombre de mesures, moyenne / percentiles / max de la fenêtre (µs), max depuis le début,
+    puis l'histogramme de la fenêtre (une colonne par classe de BORNES_US).
+
+    Paramètres
+    ----------
+    chemin : str
+
+    Returns
+    -------
+    None
+    """
+    classes = [f"<= {b} us" for b in BORNES_US] + [f"> {BORNES_US[-1]} us"]
+    with open(chemin, "w", newline="", encoding="utf-8") as f :
+        ecrivain = csv.writer(f)
+        ecrivain.writerow(["serie", "mesures", "fenetre", "moyenne_us", "p50_us", "p90_us", "p99_us", "max_fenetre_us", "max_us", *classes])
+        for nom in sorted(_SERIES) :
+            s = _SERIES[nom]
+            fenetre_max = max(s.durees) / 1e3 if s.durees else 0.0
+            ecrivain.writerow([
+                nom, s.total, len(s.durees),
+                f"{s.moyenne_us():.1f}", f"{s.percentile(50):.1f}", f"{s.percentile(90):.1f}", f"{s.percentile(99):.1f}",
+                f"{fenetre_max:.1f}", f"{s.max_ns / 1e3:.1f}", *s.histogramme(),
+            ])
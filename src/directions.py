@@ -16,4 +16,38 @@ OPPOSITE = {
 
 def voisin(x: int, y: int, direction: str) -> tuple[int, int]:
     dx, dy = DIR_VECT[direction]
-    return x + dx, y + dy
\ No newline at end of file
+    return x + dx, y + dy
+
+
+# REPRESENTATION EN MASQUE : une porte = un bit, un ensemble de portes = un entier sur 4 bits
+# les tests de compatibilité deviennent de simples ET / comparaisons
+
+BITS = {
+    "N": 1,
+    "S": 2,
+    "E": 4,
+    "O": 8,
+}
+
+ORDRE = ("N", "S", "E", "O")   # ordre d'itération fixe (l'ordre d'un set de str dépend du processus)
+
+BIT_VECT = {DIR_VECT[d]: BITS[d] for d in ORDRE}       # (dx, dy) -> bit
+DIRECTION_BIT = {BITS[d]: d for d in ORDRE}            # bit -> "N"/"S"/"E"/"O"
+VECT_BIT = {BITS[d]: DIR_VECT[d] for d in ORDRE}       # bit -> (dx, dy)
+
+
+def masque (directions) -> int :
+    """ Convertit un ensemble de directions en masque """
+    m = 0
+    for d in directions :
+        m |= BITS[d]
+    return m
+
+
+# tables précalculées indexées par masque (0..15)
+DIRECTIONS_MASQUE = tuple(tuple(d for d in ORDRE if m & BITS[d]) for m in range(16))   # masque -> directions
+BITS_MASQUE = tuple(tuple(BITS[d] for d in ORDRE if m & BITS[d]) for m in range(16))   # masque -> bits
+OPPOSE_MASQUE = tuple(masque(OPPOSITE[d] for d in DIRECTIONS_MASQUE[m]) for m in range(16))
+_HORAIRE = {"N": "E", "E": "S", "S": "O", "O": "N"}
+ROTATION_HORAIRE = tuple(masque(_HORAIRE[d] for d in DIRECTIONS_MASQUE[m]) for m in range(16))
+ROTATION_ANTIHORAIRE = tuple(ROTATION_HORAIRE.index(m) for m in range(16))
@@ -0,0 +1,173 @@
+# tirage pondéré sans remise sur des poids qui évoluent (boosts de couleur, ajouts au catalogue)
+
+from __future__ import annotations
+from typing import Iterable, List
+
+
+
+
+class ArbreFenwick :
+    """
+    Arbre de Fenwick (arbre binaire indexé) sur des poids positifs.
+    Permet de modifier un poids, d'ajouter un élément et de tirer un élément proportionnellement
+    à son poids en O(log n), sans reconstruire de liste de poids à chaque tirage.
+
+    Paramètres
+    ----------
+    poids : Iterable[float]
+        Poids initiaux (>= 0).
+
+    Attributs
+    ---------
+    _poids : List[float]
+        Poids courant de chaque élément (indices 0..n-1).
+    _arbre : List[float]
+        Sommes partielles, indexées à partir de 1.
+
+    Méthodes
+    --------
+    maj(i, poids) -> None
+        Remplace le poids de l'élément i.
+    ajouter(poids) -> int
+        Ajoute un élément en fin d'arbre et retourne son indice.
+    chercher(cible) -> int
+        Indice du premier élément dont la somme cumulée dépasse cible.
+    tirer(rng) -> int
+        Tire un indice proportionnellement aux poids.
+    tirer_sans_remise(k, rng) -> List[int]
+        Tire k indices distincts.
+    copier() -> ArbreFenwick
+    """
+
+    def __init__(self, poids : Iterable[float] = ()) -> None :
+        self._poids : List[float] = [float(p) for p in poids]
+        n = len(self._poids)
+        self._arbre : List[float] = [0.0] * (n + 1)
+        # construction en O(n) : chaque noeud pousse sa somme vers son parent
+        for i in range(1, n + 1) :
+            self._arbre[i] += self._poids[i - 1]
+            parent = i + (i & -i)
+            if parent <= n :
+                self._arbre[parent] += self._arbre[i]
+
+
+
+    def __len__ (self) -> int :
+        return len(self._poids)
+
+
+
+    def copier (self) -> 'ArbreFenwick' :
+        copie = ArbreFenwick.__new__(ArbreFenwick)
+        copie._poids = list(self._poids)
+        copie._arbre = list(self._arbre)
+        return copie
+
+
+
+    def poids (self, i : int) -> float :
+        return self._poids[i]
+
+
+
+    def somme_prefixe (self, n : int) -> float :
+        """ Somme des n premiers poids """
+        s = 0.0
+        while n > 0 :
+            s += self._arbre[n]
+            n -= n & -n
+        return s
+
+
+
+    @property
+    def total (self) -> float :
+        return self.somme_prefixe(len(self._poids))
+
+
+
+    def maj (self, i : int, poids : float) -> None :
+        delta = poids - self._poids[i]
+        if delta == 0 :
+            return
+        self._poids[i] = poids
+        n = len(self._poids)
+        i += 1
+        while i <= n :
+            self._arbre[i] += delta
+            i += i & -i
+
+
+
+    def ajouter (self, poids : float) -> int :
+        """
+        Ajoute un élément en O(log n) : le nouveau noeud i couvre ]i - lowbit(i), i], il vaut donc
+        son poids plus la somme des éléments déjà présents dans cet intervalle.
+        """
+        self._poids.append(float(poids))
+        i = len(self._poids)
+        debut = i - (i & -i)
+        self._arbre.append(poids + self.somme_prefixe(i - 1) - self.somme_prefixe(debut))
+        return i - 1
+
+
+
+    def chercher (self, cible : float) -> int :
+        """ Descente dans l'arbre : premier indice dont la somme cumulée est > cible """
+        n = len(self._poids)
+        pos = 0
+        pas = 1 << n.bit_length()
+        while pas :
+            suivant = pos + pas
+            if suivant <= n and self._arbre[suivant] <= cible :
+                pos = suivant
+                cible -= self._arbre[suivant]
+            pas >>= 1
+        # les erreurs d'arrondi peuvent faire sortir du tableau ou tomber sur un poids nul
+        pos = min(pos, n - 1)
+        while pos > 0 and self._poids[pos] == 0 :
+            pos -= 1
+        return pos
+
+
+
+    def tirer (self, rng) -> int :
+        return self.chercher(rng.random() * self.total)
+
+
+
+    def tirer_sans_remise (self, k : int, rng) -> List[int]:
+        """
+        Tire k indices distincts : chaque indice tiré est mis à poids nul le temps du tirage,
+        puis l'arbre est restauré tel quel (pas de dérive d'arrondi : un tirage ne modifie pas l'arbre,
+        qui peut donc être partagé entre pioches, cf. Pioche.copier). O(k log n + n).
+
+        Paramètres
+        ----------
+        k : int
+            Nombre d'indices voulus (tronqué au nombre d'éléments de poids non nul).
+        rng : random.Random (ou module random)
+            Source d'aléa.
+
+        Returns
+        -------
+        List[int]
+            Indices tirés, dans l'ordre du tirage.
+        """
+        tires : List[int] = []
+        sauvegarde : List[float] = []
+        arbre = self._arbre[:]
+        for _ in range(k) :
+            total = self.total
+            if total <= 0 :
+                break
+            i = self.chercher(rng.random() * total)
+            if self._poids[i] <= 0 :
+                break
+            tires.append(i)
+            sauvegarde.append(self._poids[i])
+            self.maj(i, 0.0)
+        for i, p in zip(tires, sauvegarde) :
+            self._poids[i] = p
+        self._arbre[:] = arbre
+        return tires
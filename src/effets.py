@@ -0,0 +1,423 @@
+# effets des pièces : registre (règle sur le modèle -> effet), résolu une fois par modèle
+#
+# une règle ne regarde que le modèle (nom, tags, couleur...) : les effets d'un modèle ne changent pas d'une partie à l'autre.
+# Ils sont donc résolus une fois, à la construction du catalogue (ou à la première utilisation d'un modèle ajouté en cours
+# de partie), en tuples d'effets rangés par identifiant de modèle (Piece.id_modele) ; entrer dans une pièce ne coûte plus
+# qu'une lecture de table. Pour ajouter un effet sans toucher à Piece :
+#
+#     @effet_entree(par_nom("library"))
+#     def _bibliotheque (game, posee) :
+#         game.inv.ramasser_gemmes(1)
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable, Dict, List
+
+from src import butin
+
+if TYPE_CHECKING :
+    from src.Game import Game
+    from src.Piece import Piece, PiecePosee
+
+
+ENTREE = "entree"   # le joueur entre dans une pièce posée dont la récompense n'a pas été prise : effet(game, posee)
+TIRAGE = "tirage"   # la pièce vient d'être choisie au tirage et posée : effet(game, modele)
+
+Regle = Callable[['Piece'], bool]
+
+
+
+
+class Effet :
+    """
+    Entrée du registre.
+
+    Attributs
+    ---------
+    regle : Regle
+        Le modèle est-il concerné ?
+    fonction : Callable
+        L'effet (signature selon la phase, cf. ENTREE / TIRAGE).
+    final : bool
+        Phase ENTREE : les effets suivants ne s'appliquent pas (la récompense de la pièce est donnée).
+    donne_cles : bool
+        Phase ENTREE : l'effet peut donner une clé, de l'or ou le kit de crochetage (cf. Game._cles_a_portee).
+    """
+
+    __slots__ = ("regle", "fonction", "final", "donne_cles")
+
+    def __init__ (self, regle : Regle, fonction : Callable, final : bool, donne_cles : bool) -> None :
+        self.regle = regle
+        self.fonction = fonction
+        self.final = final
+        self.donne_cles = donne_cles
+
+
+
+
+class EffetsModele :
+    """
+    Effets résolus d'un modèle.
+
+    Attributs
+    ---------
+    entree : Tuple[Callable[[Game, PiecePosee], None], ...]
+        Effets d'entrée, dans l'ordre (aucun après le premier effet final).
+    tirage : Tuple[Callable[[Game, Piece], None], ...]
+    magasin : bool
+        L'entrée ouvre l'écran d'achat (Piece.est_magasin) au lieu des effets d'entrée.
+    donne_cles : bool
+        Un des effets d'entrée peut donner une clé, de l'or ou le kit de crochetage.
+    """
+
+    __slots__ = ("entree", "tirage", "magasin", "donne_cles")
+
+    def __init__ (self, entree : tuple, tirage : tuple, magasin : bool, donne_cles : bool) -> None :
+        self.entree = entree
+        self.tirage = tirage
+        self.magasin = magasin
+        self.donne_cles = donne_cles
+
+
+
+
+_REGISTRE : Dict[str, List[Effet]] = {ENTREE : [], TIRAGE : []}
+_RESOLUS : Dict[int, EffetsModele] = {}   # id_modele -> effets (vidé à chaque enregistrement)
+
+
+
+
+def enregistrer (phase : str, regle : Regle, fonction : Callable, final : bool = False, donne_cles : bool = False) -> None :
+    """
+    Ajoute un effet au registre, après ceux déjà enregistrés pour la phase.
+
+    Paramètres
+    ----------
+    phase : str
+        ENTREE ou TIRAGE.
+    regle : Regle
+        Modèles concernés (cf. par_nom, par_tag).
+    fonction : Callable
+        effet(game, posee) pour ENTREE, effet(game, modele) pour TIRAGE.
+    final, donne_cles : bool
+        Cf. Effet.
+
+    Raises
+    ------
+    ValueError
+        Phase inconnue.
+    """
+    if phase not in _REGISTRE :
+        raise ValueError(f"phase d'effet inconnue : {phase} (choix : {', '.join(_REGISTRE)})")
+    _REGISTRE[phase].append(Effet(regle, fonction, final, donne_cles))
+    _RESOLUS.clear()
+
+
+
+
+def effet_entree (regle : Regle, final : bool = True, donne_cles : bool = False) -> Callable :
+    """ Décorateur : enregistre un effet d'entrée (final par défaut, comme la plupart des récompenses) """
+    def decorer (fonction : Callable) -> Callable :
+        enregistrer(ENTREE, regle, fonction, final, donne_cles)
+        return fonction
+    return decorer
+
+
+
+
+def effet_tirage (regle : Regle) -> Callable :
+    """ Décorateur : enregistre un effet appliqué quand la pièce est choisie au tirage """
+    def decorer (fonction : Callable) -> Callable :
+        enregistrer(TIRAGE, regle, fonction)
+        return fonction
+    return decorer
+
+
+
+
+def par_nom (*fragments : str) -> Regle :
+    """ Modèles dont le nom (en minuscules) contient un des fragments """
+    return lambda modele : any(f in modele.nom.lower() for f in fragments)
+
+
+
+
+def par_tag (tag : str) -> Regle :
+    return lambda modele : tag in modele.tags
+
+
+
+
+def resoudre (modele : 'Piece') -> EffetsModele :
+    """ Applique les règles du registre au modèle (sans cache : cf. effets_modele) """
+    entree = []
+    donne_cles = False
+    for effet in _REGISTRE[ENTREE] :
+        if effet.regle(modele) :
+            entree.append(effet.fonction)
+            donne_cles = donne_cles or effet.donne_cles
+            if effet.final :
+                break
+    tirage = tuple(effet.fonction for effet in _REGISTRE[TIRAGE] if effet.regle(modele))
+    return EffetsModele(tuple(entree), tirage, modele.est_magasin(), donne_cles)
+
+
+
+
+def effets_modele (modele : 'Piece') -> EffetsModele :
+    """ Effets du modèle, résolus à la première demande """
+    effets = _RESOLUS.get(modele.id_modele)
+    if effets is None :
+        effets = _RESOLUS[modele.id_modele] = resoudre(modele)
+    return effets
+
+
+
+
+# EFFETS D'ENTREE (dans l'ordre où ils sont essayés)
+
+def _deposer_autour (game : 'Game', ressource : str, quantite : int) -> None :
+    """ Dépose une ressource sur les cases voisines du joueur (ramassée en y entrant) """
+    x, y = game.joueur.position
+    for dx, dy in ((0, -1), (0, 1), (1, 0), (-1, 0)) :
+        nx, ny = x + dx, y + dy
+        if game.grille.deplacement_permis(nx, ny) :
+            depot = game.ressources_grille.setdefault((nx, ny), {})
+            depot[ressource] = depot.get(ressource, 0) + quantite
+
+
+
+@effet_entree(par_nom("corridor"), final=False, donne_cles=True)
+def _corridor (game : 'Game', posee : 'PiecePosee') -> None :
+    game.inv.ramasser_cles(1)
+    game.inv.ramasser_pieceOr(2)
+    posee.recompense_prise = True
+
+
+
+@effet_entree(par_nom("bedroom"))
+def _bedroom (game : 'Game', posee : 'PiecePosee') -> None :
+    game.inv.ramasser_pas(5)   # regagner des pas
+    posee.recompense_prise = True
+
+
+
+@effet_entree(par_nom("chapel"))
+def _chapel (game : 'Game', posee : 'PiecePosee') -> None :
+    game.inv.depenser_pieceOr(1)
+    posee.recompense_prise = True
+
+
+
+@effet_entree(par_nom("garden", "veranda", "patio", "greenhouse"), donne_cles=True)
+def _jardin (game : 'Game', posee : 'PiecePosee') -> None :
+    inv = game.inv
+    # gemme quasi systématique
+    inv.ramasser_gemmes(1)
+    inv.ramasser_pieceOr(2)
+
+    # parfois un objet consommable de 2.2, parfois un objet permanent (plus souvent avec Inventaire.chance_objets)
+    rng = game.rng_butin
+    obj = butin.JARDIN_CONSOMMABLE.tirer(rng, inv)
+    if obj is not None :
+        obj.appliquer(inv)
+    permanent = butin.permanent_manquant(rng, inv)
+    if permanent is not None :
+        inv.ajouter_obj_permanent(permanent)
+
+    if "Endroit à creuser" not in posee.contenu :
+        posee.contenu.append("Endroit à creuser")
+    posee.recompense_prise = True
+
+
+
+@effet_entree(par_nom("locker"), donne_cles=True)
+def _locker (game : 'Game', posee : 'PiecePosee') -> None :
+    # on ne l'ouvre pas automatiquement, c'est au joueur d'appuyer sur O : on indique juste au game qu'on est sur un casier
+    game.inv.ramasser_cles(5)
+    game.contexte_special = {"type" : "casier", "piece" : posee}
+    if "Casier" not in posee.contenu :
+        posee.contenu.append("Casier")
+    posee.recompense_prise = True
+
+
+
+@effet_entree(par_nom("den"))
+def _den (game : 'Game', posee : 'PiecePosee') -> None :
+    # idem pour le coffre
+    game.contexte_special = {"type" : "coffre", "piece" : posee}
+    if "Coffre" not in posee.contenu :
+        posee.contenu.append("Coffre")
+    posee.recompense_prise = True
+
+
+
+@effet_entree(par_nom("security", "guard room"), donne_cles=True)
+def _security (game : 'Game', posee : 'PiecePosee') -> None :
+    game.inv.ramasser_cles(5)
+    game.inv.ramasser_pieceOr(3)
+    posee.recompense_prise = True
+
+
+
+@effet_entree(par_nom("furnace"))
+def _furnace (game : 'Game', posee : 'PiecePosee') -> None :
+    game.inv.utiliser_pas(1)
+    posee.recompense_prise = True
+
+
+
+@effet_entree(par_nom("maidschamber"))
+def _maids_chamber (game : 'Game', posee : 'PiecePosee') -> None :
+    # boost + gemme (une fois)
+    inv = game.inv
+    inv.chance_objets = max(inv.chance_objets, 0.7)
+    inv.ramasser_gemmes(1)
+    posee.recompense_prise = True
+
+
+
+@effet_entree(par_nom("master bedroom"))
+def _master_bedroom (game : 'Game', posee : 'PiecePosee') -> None :
+    game.inv.ramasser_pas(5)
+    posee.recompense_prise = True
+
+
+
+@effet_entree(par_nom("gallery"), final=False)
+def _gallery (game : 'Game', posee : 'PiecePosee') -> None :
+    game.inv.ramasser_gemmes(game.rng_butin.randint(1, 3))
+    posee.recompense_prise = True
+
+
+
+@effet_entree(par_nom("patio"), donne_cles=True)
+def _patio (game : 'Game', posee : 'PiecePosee') -> None :
+    # gemme + dépôt autour (une seule fois)
+    game.inv.ramasser_gemmes(1)
+    _deposer_autour(game, "gemmes", 1)
+    posee.recompense_prise = True
+
+
+
+@effet_entree(par_nom("office"), donne_cles=True)
+def _office (game : 'Game', posee : 'PiecePosee') -> None :
+    # dépose de l'or dans les cases voisines
+    _deposer_autour(game, "or", 2)
+    game.inv.ramasser_cles(1)
+    posee.recompense_prise = True
+
+
+
+@effet_entree(par_nom("chamber of mirrors"))
+def _chamber_of_mirrors (game : 'Game', posee : 'PiecePosee') -> None :
+    # ajoute des pièces (une fois)
+    if getattr(game, "pioche_pieces", None) :
+        game.pioche_pieces.ajouter_piece_modele("couloir_NS")
+        game.pioche_pieces.ajouter_piece_modele("couloir_EO")
+    posee.recompense_prise = True
+
+
+
+@effet_entree(par_nom("pool"))
+def _pool (game : 'Game', posee : 'PiecePosee') -> None :
+    game.inv.ramasser_pas(4)
+    posee.recompense_prise = True
+
+
+
+@effet_entree(par_nom("nursery"))
+def _nursery (game : 'Game', posee : 'PiecePosee') -> None :
+    game.inv.ramasser_pas(5)
+    posee.recompense_prise = True
+
+
+
+@effet_entree(par_nom("vault"), donne_cles=True)
+def _vault (game : 'Game', posee : 'PiecePosee') -> None :
+    if posee.or_dans_piece > 0 :
+        game.inv.ramasser_pieceOr(posee.or_dans_piece)
+        posee.or_dans_piece = 0
+    posee.recompense_prise = True
+
+
+
+
+# EFFETS DU TIRAGE (tous ceux qui s'appliquent, dans l'ordre)
+
+@effet_tirage(par_nom("master bedroom"))
+def _master_bedroom_tirage (game : 'Game', modele : 'Piece') -> None :
+    game.inv.ramasser_pas(4)   # regagne des pas au moment où on la choisit (en plus de l'effet d'entrée)
+
+
+
+@effet_tirage(par_nom("furnace"))
+def _furnace_tirage (game : 'Game', modele : 'Piece') -> None :
+    game.boosts_pioche_par_couleur[modele.couleur.__class__.ROUGE] += 1   # rend plus probable le rouge après
+
+
+
+@effet_tirage(par_nom("greenhouse"))
+def _greenhouse_tirage (game : 'Game', modele : 'Piece') -> None :
+    game.boosts_pioche_par_couleur[modele.couleur.__class__.VERT] += 1
+
+
+
+@effet_tirage(par_nom("veranda"))
+def _veranda_tirage (game : 'Game', modele : 'Piece') -> None :
+    # booste la découverte d'objets
+    game.boosts_loot["obj_perm"] += 1
+    game.boosts_loot["gemmes"] += 1
+
+
+
+@effet_tirage(par_nom("chamber of mirrors", "chambre des miroirs"))
+def _chamber_of_mirrors_tirage (game : 'Game', modele : 'Piece') -> None :
+    game.pioche_pieces.ajouter_piece_modele("couloir_NS")
+    game.pioche_pieces.ajouter_piece_modele("couloir_EO")
+
+
+
+def _booster_couleur (couleur : str) -> Callable[['Game', 'Piece'], None] :
+    """ Rend plus probable le tirage d'une couleur (nom d'un membre de CouleurPiece) """
+    def booster (game : 'Game', modele : 'Piece') -> None :
+        game.boosts_pioche_par_couleur[modele.couleur.__class__[couleur]] += 1
+    return booster
+
+
+
+def _booster_loot (cle : str) -> Callable[['Game', 'Piece'], None] :
+    """ Augmente les chances de trouver une ressource plus tard (clé de Game.boosts_loot) """
+    def booster (game : 'Game', modele : 'Piece') -> None :
+        game.boosts_loot[cle] += 1
+    return booster
+
+
+
+def _ajouter_au_catalogue (nom : str) -> Callable[['Game', 'Piece'], None] :
+    """ Ajoute une pièce à la pioche (cf. Pioche.ajouter_piece_modele) """
+    def ajouter (game : 'Game', modele : 'Piece') -> None :
+        game.pioche_pieces.ajouter_piece_modele(nom)
+    return ajouter
+
+
+
+for _tag, _couleur in (("boost_vert", "VERT"), ("boost_bleu", "BLEU"), ("boost_rouge", "ROUGE")) :
+    enregistrer(TIRAGE, par_tag(_tag), _booster_couleur(_couleur))
+for _tag, _cle in (("boost_gemmes", "gemmes"), ("boost_obj_perm", "obj_perm"), ("boost_cles", "cles")) :
+    enregistrer(TIRAGE, par_tag(_tag), _booster_loot(_cle))
+for _tag, _nom in (("ajoute_couloir", "couloir_NS"), ("ajoute_piece_rare", "salle_tresor")) :
+    enregistrer(TIRAGE, par_tag(_tag), _ajouter_au_catalogue(_nom))
+
+
+
+@effet_tirage(par_tag("dispersion"))
+def _dispersion (game : 'Game', modele : 'Piece') -> None :
+    """ Jette 1 or dans chaque pièce voisine du joueur (ramassé en y entrant) """
+    grille = game.grille
+    x, y = game.joueur.position
+    for d in ("N", "S", "E", "O") :
+        nx, ny = grille.voisin(x, y, d)
+        if not grille.deplacement_permis(nx, ny) or grille.get_piece(nx, ny) is None :
+            continue
+        depot = game.ressources_grille.setdefault((nx, ny), {})
+        depot["or"] = depot.get("or", 0) + 1
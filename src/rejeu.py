@@ -0,0 +1,356 @@
+# journaux de parties (graine + intentions) et rejeu headless
+# lancement : python -m src.rejeu journaux/ [--workers 8]
+#
+# une partie est entièrement déterminée par sa graine et la suite des intentions passées à Game.handle_intentions :
+# le journal ne garde que cela (2 octets par intention), plus l'empreinte de l'état final pour vérifier le rejeu.
+#
+# format (petit boutiste) : b"BPJ", version, graine (8 octets), nombre d'intentions (4 octets),
+# largeur et hauteur de la grille (2 octets chacune en version 3, 1 octet en version 2 ; 5 x 9 pour la version 1),
+# intentions (2 octets chacune, cf. coder_intentions), empreinte finale (EMPREINTE_TAILLE octets, nuls si absente).
+# L'empreinte hache la sauvegarde de l'état final : format de sauvegarde 2 en version 3, 1 avant (cf. VERSION_SAUVEGARDE).
+
+from __future__ import annotations
+import argparse
+import hashlib
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from struct import Struct
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.Game import Game
+from src import sauvegarde
+
+
+
+MAGIC = b"BPJ"
+FORMAT_VERSION = 3
+EXTENSION = ".bpj"
+EMPREINTE_TAILLE = 16
+
+_ENTETE = Struct("<3sBQI")   # magic, version, graine, nombre d'intentions
+_DIMENSIONS = Struct("<HH")   # largeur, hauteur (version 3)
+_DIMENSIONS_V2 = Struct("<BB")
+VERSION_SAUVEGARDE = {1 : 1, 2 : 1, 3 : 2}   # version du journal -> format de sauvegarde haché par l'empreinte
+
+# codage d'un dictionnaire d'intentions sur 16 bits
+VECTEURS = ((0, -1), (0, 1), (1, 0), (-1, 0))   # N, S, E, O : bits 1-2
+DEPLACER = 0x0001
+DRAPEAUX = {"ouvrir" : 0x0008, "creuser" : 0x0010, "confirmer" : 0x0020, "relancer_tirage" : 0x0040, "annuler" : 0x0080}
+NAV_GAME_OVER = 0x0100
+NAV_DROITE = 0x0200   # nav_game_over = 1 (sinon -1)
+
+_CODES_VECTEURS = {v : i for i, v in enumerate(VECTEURS)}
+_INTENTIONS : Dict[int, Dict[str, Any]] = {}   # code -> dictionnaire d'intentions (partagé : ne pas le modifier)
+
+
+
+
+def coder_intentions (actions : Dict[str, Any]) -> int :
+    """
+    Code 16 bits d'un dictionnaire d'intentions (format InputHandler.actions()).
+
+    Raises
+    ------
+    ValueError
+        Intention que le format ne sait pas coder (clé inconnue, déplacement non unitaire).
+    """
+    code = 0
+    for cle, valeur in actions.items() :
+        if cle == "deplacer" :
+            if tuple(valeur) not in _CODES_VECTEURS :
+                raise ValueError(f"journal : déplacement {valeur!r} non codable")
+            code |= DEPLACER | (_CODES_VECTEURS[tuple(valeur)] << 1)
+        elif cle == "nav_game_over" :
+            code |= NAV_GAME_OVER | (NAV_DROITE if valeur > 0 else 0)
+        elif cle in DRAPEAUX :
+            code |= DRAPEAUX[cle]
+        else :
+            raise ValueError(f"journal : intention inconnue '{cle}'")
+    return code
+
+
+
+
+def decoder_intentions (code : int) -> Dict[str, Any] :
+    """ Dictionnaire d'intentions d'un code (mis en cache : le même objet est renvoyé pour le même code) """
+    actions = _INTENTIONS.get(code)
+    if actions is None :
+        actions = {}
+        if code & DEPLACER :
+            actions["deplacer"] = VECTEURS[(code >> 1) & 0x3]
+        for cle, bit in DRAPEAUX.items() :
+            if code & bit :
+                actions[cle] = True
+        if code & NAV_GAME_OVER :
+            actions["nav_game_over"] = 1 if code & NAV_DROITE else -1
+        _INTENTIONS[code] = actions
+    return actions
+
+
+
+
+def empreinte (game : Game, version_sauvegarde : int = sauvegarde.FORMAT_VERSION) -> bytes :
+    """ Empreinte de l'état complet d'une partie (hachage de sa sauvegarde, cf. src.sauvegarde) """
+    return hashlib.blake2b(sauvegarde.encoder(game, version_sauvegarde), digest_size=EMPREINTE_TAILLE).digest()
+
+
+
+
+class Journal :
+    """
+    Enregistrement d'une session : graine de la partie et intentions dans l'ordre où elles ont été appliquées.
+
+    Paramètres
+    ----------
+    seed : int
+        Graine passée à Game.
+    largeur, hauteur : int
+        Dimensions de la grille passées à Game.
+
+    Attributs
+    ---------
+    seed : int
+    largeur, hauteur : int
+    version : int
+        Version du format lu (FORMAT_VERSION pour un journal enregistré) : elle fixe le calcul de l'empreinte.
+    intentions : array('H')
+        Intentions codées (cf. coder_intentions) ; les dictionnaires vides ne sont pas enregistrés.
+    empreinte_finale : bytes | None
+        Empreinte de l'état à la fin de la session (cf. terminer).
+
+    Méthodes
+    --------
+    enregistrer(actions) -> None
+        Ajoute les intentions d'un tour (à appeler juste avant game.handle_intentions(actions)).
+    terminer(game) -> None
+        Mémorise l'empreinte de l'état final.
+    encoder() -> bytes
+    decoder(donnees) -> Journal
+    """
+
+    def __init__ (self, seed : int, largeur : int = 5, hauteur : int = 9) -> None :
+        self.seed = seed
+        self.largeur = largeur
+        self.hauteur = hauteur
+        self.version = FORMAT_VERSION
+        self.intentions = array('H')
+        self.empreinte_finale : Optional[bytes] = None
+
+
+
+    def __len__ (self) -> int :
+        return len(self.intentions)
+
+
+
+    def enregistrer (self, actions : Dict[str, Any]) -> None :
+        if actions :
+            self.intentions.append(coder_intentions(actions))
+
+
+
+    def terminer (self, game : Game) -> None :
+        self.empreinte_finale = empreinte(game, VERSION_SAUVEGARDE[self.version])
+
+
+
+    def encoder (self) -> bytes :
+        intentions = self.intentions
+        if sys.byteorder != "little" :
+            intentions = array('H', intentions)
+            intentions.byteswap()
+        # réécrit dans sa version de lecture, dont dépend l'empreinte (une version 1 devient une version 2, même sauvegarde)
+        version = max(self.version, 2)
+        dimensions = _DIMENSIONS if version >= 3 else _DIMENSIONS_V2
+        return (_ENTETE.pack(MAGIC, version, self.seed & 0xFFFFFFFFFFFFFFFF, len(intentions))
+                + dimensions.pack(self.largeur, self.hauteur)
+                + intentions.tobytes()
+                + (self.empreinte_finale or bytes(EMPREINTE_TAILLE)))
+
+
+
+    @classmethod
+    def decoder (cls, donnees : bytes) -> 'Journal' :
+        if len(donnees) < _ENTETE.size :
+            raise ValueError("journal tronqué")
+        magic, version, seed, n = _ENTETE.unpack_from(donnees)
+        if magic != MAGIC :
+            raise ValueError("pas un journal de partie")
+        if version not in VERSION_SAUVEGARDE :
+            raise ValueError(f"version de journal {version} non prise en charge (attendu : {FORMAT_VERSION})")
+        debut = _ENTETE.size
+        largeur, hauteur = 5, 9   # version 1 : grille par défaut
+        if version >= 2 :
+            dimensions = _DIMENSIONS if version >= 3 else _DIMENSIONS_V2
+            if len(donnees) < debut + dimensions.size :
+                raise ValueError("journal tronqué")
+            largeur, hauteur = dimensions.unpack_from(donnees, debut)
+            debut += dimensions.size
+        fin = debut + 2 * n
+        if len(donnees) != fin + EMPREINTE_TAILLE :
+            raise ValueError("journal tronqué")
+        journal = cls(seed, largeur, hauteur)
+        journal.version = version
+        journal.intentions.frombytes(donnees[debut : fin])
+        if sys.byteorder != "little" :
+            journal.intentions.byteswap()
+        finale = bytes(donnees[fin:])
+        journal.empreinte_finale = finale if any(finale) else None
+        return journal
+
+
+
+
+def ecrire_journal (chemin : str, journal : Journal) -> None :
+    dossier = os.path.dirname(chemin)
+    if dossier :
+        os.makedirs(dossier, exist_ok=True)
+    with open(chemin, "wb") as f :
+        f.write(journal.encoder())
+
+
+
+
+def lire_journal (chemin : str) -> Journal :
+    with open(chemin, "rb") as f :
+        return Journal.decoder(f.read())
+
+
+
+
+def rejouer (journal : Journal) -> Game :
+    """ Réapplique les intentions du journal sur une partie neuve de même graine et mêmes dimensions, sans affichage """
+    game = Game(journal.seed, journal.largeur, journal.hauteur)
+    handle = game.handle_intentions
+    for code in journal.intentions :
+        handle(decoder_intentions(code))
+    return game
+
+
+
+
+def verifier (journal : Journal) -> bool :
+    """ True si le rejeu aboutit exactement à l'état final enregistré (un journal sans empreinte n'est pas vérifiable) """
+    if journal.empreinte_finale is None :
+        return False
+    return empreinte(rejouer(journal), VERSION_SAUVEGARDE[journal.version]) == journal.empreinte_finale
+
+
+
+
+@dataclass
+class BilanRejeu :
+    """ Résultat du rejeu d'un lot de journaux (fusionné côté parent, comme StatistiquesSimulation dans src.sim) """
+    journaux : int = 0
+    intentions : int = 0
+    divergents : List[str] = field(default_factory=list)
+    sans_empreinte : List[str] = field(default_factory=list)
+    illisibles : List[str] = field(default_factory=list)
+
+
+
+    def fusionner (self, autre : 'BilanRejeu') -> None :
+        self.journaux += autre.journaux
+        self.intentions += autre.intentions
+        self.divergents += autre.divergents
+        self.sans_empreinte += autre.sans_empreinte
+        self.illisibles += autre.illisibles
+
+
+
+
+def _rejouer_lot (chemins : List[str]) -> BilanRejeu :
+    """ Tâche d'un worker : rejoue et vérifie un lot de journaux """
+    bilan = BilanRejeu()
+    for chemin in chemins :
+        try :
+            journal = lire_journal(chemin)
+        except (OSError, ValueError) :
+            bilan.illisibles.append(chemin)
+            continue
+        bilan.journaux += 1
+        bilan.intentions += len(journal)
+        if journal.empreinte_finale is None :
+            bilan.sans_empreinte.append(chemin)
+        elif not verifier(journal) :
+            bilan.divergents.append(chemin)
+    return bilan
+
+
+
+
+def lister_journaux (chemins : Iterable[str]) -> List[str] :
+    """ Fichiers de journaux désignés par des chemins (un dossier est parcouru récursivement), triés """
+    fichiers : List[str] = []
+    for chemin in chemins :
+        if os.path.isdir(chemin) :
+            for racine, _dossiers, noms in os.walk(chemin) :
+                fichiers.extend(os.path.join(racine, n) for n in noms if n.endswith(EXTENSION))
+        else :
+            fichiers.append(chemin)
+    return sorted(fichiers)
+
+
+
+
+def rejouer_journaux (chemins : List[str], workers : Optional[int] = None, taille_lot : int = 256) -> BilanRejeu :
+    """
+    Rejoue et vérifie des journaux, répartis sur un ProcessPoolExecutor.
+
+    Paramètres
+    ----------
+    chemins : List[str]
+        Fichiers de journaux.
+    workers : int | None
+        Nombre de processus (None = nombre de coeurs, 1 = tout dans le processus courant).
+    taille_lot : int
+        Nombre de journaux par tâche envoyée à un worker.
+
+    Returns
+    -------
+    BilanRejeu
+    """
+    lots = [chemins[i : i + taille_lot] for i in range(0, len(chemins), taille_lot)]
+    total = BilanRejeu()
+    if workers == 1 :
+        for lot in lots :
+            total.fusionner(_rejouer_lot(lot))
+        return total
+    with ProcessPoolExecutor(max_workers=workers) as pool :
+        for bilan in pool.map(_rejouer_lot, lots) :
+            total.fusionner(bilan)
+    return total
+
+
+
+
+def main (argv : Optional[List[str]] = None) -> int :
+    parser = argparse.ArgumentParser(prog="python -m src.rejeu", description="Rejeu headless et vérification de journaux de parties")
+    parser.add_argument("chemins", nargs="+", help=f"fichiers {EXTENSION} ou dossiers")
+    parser.add_argument("--workers", type=int, default=None, help="nombre de processus (défaut : nombre de coeurs)")
+    parser.add_argument("--taille-lot", type=int, default=256, help="journaux par tâche envoyée à un worker")
+    args = parser.parse_args(argv)
+
+    fichiers = lister_journaux(args.chemins)
+    debut = time.perf_counter()
+    bilan = rejouer_journaux(fichiers, args.workers, args.taille_lot)
+    duree = time.perf_counter() - debut
+
+    print(f"{bilan.journaux} journaux ({bilan.intentions} intentions) rejoués en {duree:.2f}s"
+          f"  ->  {bilan.intentions / duree if duree > 0 else 0.0:.0f} intentions/s")
+    for titre, liste in (("divergents", bilan.divergents), ("sans empreinte", bilan.sans_empreinte), ("illisibles", bilan.illisibles)) :
+        if liste :
+            print(f"  {titre} : {len(liste)}")
+            for chemin in liste :
+                print(f"    {chemin}")
+    return 1 if bilan.divergents or bilan.illisibles else 0
+
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
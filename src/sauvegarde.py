@@ -0,0 +1,502 @@
+# sauvegarde binaire compacte de l'état complet d'une partie (quelques centaines d'octets)
+#
+# format (petit boutiste), version FORMAT_VERSION :
+#   entête          b"BP" + version du format
+#   partie          graine, version de l'état, état, tour, sélection game over, dimensions et position du joueur
+#   inventaire      compteurs, chances, objets permanents et autres objets (indices dans des tables fixes)
+#   boosts          boosts de pioche par couleur puis boosts de butin
+#   aléa            état (8 octets) des quatre flux de la partie (cf. src.alea)
+#   modèles         modèles hors catalogue de base (ajouts en cours de partie), décrits champ par champ
+#   pioche          codes des modèles ajoutés au catalogue, dans l'ordre
+#   grille          code du modèle de chaque case, état des pièces posées, octets bruts des murs
+#   ressources      ressources_grille
+#   contextes       tirage en cours, achat en cours, contexte spécial
+#   message         last_message
+#
+# un modèle est désigné par un code : 0 = case vide, 1 = pièce d'entrée, puis le catalogue de base dans son ordre,
+# puis les modèles décrits dans la section modèles.
+#
+# dimensions et coordonnées sur 16 bits depuis la version 2 (un octet en version 1 : côtés limités à 255) ;
+# les sauvegardes de version 1 restent lisibles.
+#
+# archives : suite de sauvegardes préfixées par leur longueur, compressée avec lz4 si le module est installé.
+
+from __future__ import annotations
+from struct import Struct
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src import butin
+from src.accessibilite import Accessibilite
+from src.alea import AleaCompact
+from src.AutreObjet import Banane, Gateau, Pomme, Repas, Sandwich
+from src.Game import ENTREE, Game, offres_magasin
+from src.Grille import Grille
+from src.Joueur import Joueur
+from src.ObjetPermanent import DetecteurMetaux, KitCrochetage, Marteau, PatteLapin, Pelle
+from src.Piece import (
+    Piece,
+    PiecePosee,
+    CouleurPiece,
+    FORME_COULOIR_NS,
+    FORME_COULOIR_EO,
+    FORME_CROIX,
+    FORME_CARRE,
+    FORME_IMPASSE_N,
+    FORME_IMPASSE_S,
+    FORME_IMPASSE_E,
+    FORME_IMPASSE_O,
+    FORME_ANGLE_NE,
+    FORME_ANGLE_ES,
+    FORME_ANGLE_SO,
+    FORME_ANGLE_ON,
+    FORME_T_NES,
+    FORME_T_ESO,
+    FORME_T_SON,
+    FORME_T_ONE,
+)
+from src.Pioche import catalogue_partage, modele_dynamique, pioche_neuve
+
+try :
+    import lz4.frame as lz4_frame
+except ImportError :   # dépendance optionnelle : les archives sont alors écrites sans compression
+    lz4_frame = None
+
+
+
+MAGIC = b"BP"
+FORMAT_VERSION = 2
+
+MAGIC_ARCHIVE = b"BPA"
+ARCHIVE_BRUTE = 0
+ARCHIVE_LZ4 = 1
+
+
+# tables fixes : l'indice d'un élément est son code dans la sauvegarde (n'ajouter qu'en fin de table)
+ETATS = ("exploration", "tirage", "victoire", "game_over", "achat", "quit")
+DIRECTIONS = ("N", "S", "E", "O")
+COULEURS = tuple(CouleurPiece)
+CLES_LOOT = ("gemmes", "piecesOr", "cles", "obj_perm")
+FORMES = (
+    FORME_COULOIR_NS, FORME_COULOIR_EO, FORME_CROIX, FORME_CARRE,
+    FORME_IMPASSE_N, FORME_IMPASSE_S, FORME_IMPASSE_E, FORME_IMPASSE_O,
+    FORME_ANGLE_NE, FORME_ANGLE_ES, FORME_ANGLE_SO, FORME_ANGLE_ON,
+    FORME_T_NES, FORME_T_ESO, FORME_T_SON, FORME_T_ONE,
+)
+OBJETS_PERMANENTS = (Pelle, Marteau, KitCrochetage, DetecteurMetaux, PatteLapin)
+AUTRES_OBJETS = (Pomme, Banane, Gateau, Sandwich, Repas)
+CONTENUS = ("Casier", "Coffre", "Endroit à creuser")   # PiecePosee.contenu, un bit chacun après RECOMPENSE_PRISE
+CONTEXTES_SPECIAUX = (None, "casier", "coffre")
+
+RECOMPENSE_PRISE = 0x01
+SANS_POSITION = 0xFFFF
+
+_ENTETE = Struct("<2sB")
+_PARTIE = Struct("<QIBIBHHHH")          # graine, version, état, tour, sélection game over, largeur, hauteur, x, y
+_INVENTAIRE = Struct("<5h3d")           # pas, or, gemmes, clés, dés, chances (clés, or, objets)
+_BOOSTS = Struct(f"<{len(COULEURS) + len(CLES_LOOT)}H")
+_ALEA = Struct("<4Q")                   # portes, tirage, butin, contenants
+_MODELE = Struct("<BBBBH")              # couleur, forme, coût en gemmes, rareté, or initial
+_POSEE = Struct("<BH")                  # drapeaux (récompense, contenu), or dans la pièce
+_TIRAGE = Struct("<HHBBB")              # cible x, cible y, direction d'entrée, index, nombre de pièces
+_POSITION = Struct("<HH")
+_U8 = Struct("<B")
+_U16 = Struct("<H")
+_U32 = Struct("<I")
+
+# version 1 : mêmes champs, dimensions et coordonnées sur un octet
+_PARTIE_V1 = Struct("<QIBIBBBBB")
+_TIRAGE_V1 = Struct("<BBBBB")
+_POSITION_V1 = Struct("<BB")
+
+# par version du format : (partie, tirage, position, position absente, nombre de cases de ressources_grille)
+_DISPOSITIONS = {
+    1 : (_PARTIE_V1, _TIRAGE_V1, _POSITION_V1, 0xFF, _U8),
+    2 : (_PARTIE, _TIRAGE, _POSITION, SANS_POSITION, _U16),
+}
+
+_CODES_FORMES = {id(f) : i for i, f in enumerate(FORMES)}
+_CODES_PERMANENTS = {c.nom : i for i, c in enumerate(OBJETS_PERMANENTS)}
+_CODES_AUTRES = {c.nom : i for i, c in enumerate(AUTRES_OBJETS)}
+
+_BASE : Optional[Tuple[Piece, ...]] = None
+_CODES_BASE : Dict[Piece, int] = {}
+
+
+
+
+def _modeles_base () -> Tuple[Piece, ...] :
+    """ Modèles à code fixe (entrée + catalogue de base), construits au premier appel """
+    global _BASE
+    if _BASE is None :
+        _BASE = (ENTREE,) + catalogue_partage()
+        _CODES_BASE.update((m, i + 1) for i, m in enumerate(_BASE))
+    return _BASE
+
+
+
+
+def _ecrire_texte (tampon : bytearray, texte : str, longueur : Struct = _U8) -> None :
+    octets = texte.encode("utf-8")
+    tampon += longueur.pack(len(octets))
+    tampon += octets
+
+
+
+
+def _position_piece (game : Game, posee : Optional[PiecePosee], sans_position : int = SANS_POSITION) -> Tuple[int, int] :
+    """ Case où se trouve une pièce posée (les contextes la désignent par sa position) """
+    position = game.grille.position_piece(posee) if posee is not None else None
+    return position if position is not None else (sans_position, sans_position)
+
+
+
+
+def encoder (game : Game, version_format : int = FORMAT_VERSION) -> bytes :
+    """
+    Sauvegarde binaire de l'état complet d'une partie.
+
+    Paramètres
+    ----------
+    game : Game
+    version_format : int
+        Version du format écrit ; une version antérieure sert à recalculer l'empreinte d'anciens journaux (cf. src.rejeu).
+
+    Returns
+    -------
+    bytes
+        Sauvegarde, à relire avec decoder().
+
+    Raises
+    ------
+    ValueError
+        Partie que la version demandée ne peut pas coder (côté de grille > 255 en version 1, trop de modèles).
+    """
+    s_partie, s_tirage, s_position, sans_position, n_ressources = _DISPOSITIONS[version_format]
+    base = _modeles_base()
+    codes = dict(_CODES_BASE)
+    extras : List[Piece] = []
+
+    def code (modele : Piece) -> int :
+        c = codes.get(modele)
+        if c is None :
+            extras.append(modele)
+            c = codes[modele] = len(base) + len(extras)
+        return c
+
+    grille = game.grille
+    inv = game.inv
+    pioche = game.pioche_pieces
+    L, H = grille.largeur, grille.hauteur
+
+    # premier passage : codes de tous les modèles utilisés (les modèles hors base sont décrits avant d'être cités)
+    codes_ajouts = [code(m) for m in pioche.ajouts]
+    instances = [grille.get_piece(x, y) for y in range(H) for x in range(L)]
+    codes_cases = [0 if p is None else code(p.modele) for p in instances]
+    tirage = game.tirage_en_cours
+    codes_tirage = [code(p) for p in tirage["pieces"]] if tirage else []
+    if len(base) + len(extras) > 0xFF :
+        raise ValueError("sauvegarde : trop de modèles distincts pour un code sur un octet")
+
+    if L > sans_position or H > sans_position :   # coordonnées < côté : la valeur maximale reste libre pour « sans position »
+        raise ValueError(f"sauvegarde : grille {L} x {H} trop grande pour le format {version_format} (côté maximal {sans_position})")
+
+    t = bytearray(_ENTETE.pack(MAGIC, version_format))
+    x, y = game.joueur.position
+    t += s_partie.pack(game.seed & 0xFFFFFFFFFFFFFFFF, game.version, ETATS.index(game.state), game.tour,
+                      game.game_over_selection, L, H, x, y)
+
+    t += _INVENTAIRE.pack(inv.pas, inv.piecesOr, inv.gemmes, inv.cles, inv.des,
+                          inv.chance_cles, inv.chance_piecesOr, inv.chance_objets)
+    t += _U8.pack(len(inv.objets_permanents))
+    t += bytes(_CODES_PERMANENTS[o.nom] for o in inv.objets_permanents)
+    t += _U8.pack(len(inv.autres_objets))
+    t += bytes(_CODES_AUTRES[o.nom] for o in inv.autres_objets)
+
+    t += _BOOSTS.pack(*(game.boosts_pioche_par_couleur.get(c, 0) for c in COULEURS),
+                      *(game.boosts_loot.get(k, 0) for k in CLES_LOOT))
+    t += _ALEA.pack(game.rng_portes.getstate(), game.rng_tirage.getstate(),
+                    game.rng_butin.getstate(), game.rng_contenants.getstate())
+
+    t += _U8.pack(len(extras))
+    for m in extras :
+        _ecrire_texte(t, m.nom)
+        t += _MODELE.pack(COULEURS.index(m.couleur), _CODES_FORMES[id(m.forme)], m.cout_gemmes, m.rarete, m.or_initial)
+        t += _U8.pack(len(m.tags))
+        for tag in m.tags :
+            _ecrire_texte(t, tag)
+
+    t += _U8.pack(len(codes_ajouts))
+    t += b"".join(_U16.pack(c) for c in codes_ajouts)
+
+    t += bytes(codes_cases)
+    for p in instances :
+        if p is not None :
+            drapeaux = RECOMPENSE_PRISE if p.recompense_prise else 0
+            for i, nom in enumerate(CONTENUS) :
+                if nom in p.contenu :
+                    drapeaux |= 2 << i
+            t += _POSEE.pack(drapeaux, p.or_dans_piece)
+    t += grille.murs_horizontaux
+    t += grille.murs_verticaux
+
+    t += n_ressources.pack(len(game.ressources_grille))
+    for (rx, ry), ressources in game.ressources_grille.items() :
+        t += s_position.pack(rx, ry)
+        t += _U8.pack(len(ressources))
+        for nom, n in ressources.items() :
+            _ecrire_texte(t, nom)
+            t += _U16.pack(n)
+
+    if tirage :
+        cx, cy = tirage["cible"]
+        t += _U8.pack(1)
+        t += s_tirage.pack(cx, cy, DIRECTIONS.index(tirage["dir_entree"]), tirage["index"], len(codes_tirage))
+        t += bytes(codes_tirage)
+    else :
+        t += _U8.pack(0)
+
+    achat = game.contexte_achat
+    if achat :
+        t += _U8.pack(1)
+        t += s_position.pack(*_position_piece(game, achat["piece"], sans_position))
+        t += _U8.pack(achat.get("index", 0))
+    else :
+        t += _U8.pack(0)
+
+    special = game.contexte_special
+    t += _U8.pack(CONTEXTES_SPECIAUX.index(special.get("type") if special else None))
+    if special :
+        t += s_position.pack(*_position_piece(game, special.get("piece"), sans_position))
+
+    _ecrire_texte(t, game.last_message, _U16)
+    return bytes(t)
+
+
+
+
+class _Lecteur :
+    """ Lecture séquentielle d'une sauvegarde """
+
+    __slots__ = ("donnees", "pos")
+
+    def __init__ (self, donnees : bytes) -> None :
+        self.donnees = memoryview(donnees)
+        self.pos = 0
+
+    def lire (self, s : Struct) -> tuple :
+        valeurs = s.unpack_from(self.donnees, self.pos)
+        self.pos += s.size
+        return valeurs
+
+    def octet (self) -> int :
+        v = self.donnees[self.pos]
+        self.pos += 1
+        return v
+
+    def octets (self, n : int) -> bytes :
+        fin = self.pos + n
+        if fin > len(self.donnees) :
+            raise ValueError("sauvegarde tronquée")
+        v = bytes(self.donnees[self.pos : fin])
+        self.pos = fin
+        return v
+
+    def texte (self, longueur : Struct = _U8) -> str :
+        n, = self.lire(longueur)
+        return self.octets(n).decode("utf-8")
+
+
+
+
+def _modele_lu (nom : str, couleur : CouleurPiece, forme, cout : int, rarete : int, or_initial : int, tags : Tuple[str, ...]) -> Piece :
+    """ Modèle décrit dans une sauvegarde : on réutilise le modèle dynamique du processus s'il est identique """
+    champs = (nom, couleur, forme, cout, rarete, or_initial, tags)
+    fabrique = lambda : Piece(nom, couleur, forme, cout_gemmes=cout, rarete=rarete, tags=tags, or_initial=or_initial)
+    modele = modele_dynamique(nom, fabrique)
+    if (modele.nom, modele.couleur, modele.forme, modele.cout_gemmes, modele.rarete, modele.or_initial, modele.tags) != champs :
+        modele = modele_dynamique(repr(champs), fabrique)
+    return modele
+
+
+
+
+def decoder (donnees : bytes) -> Game :
+    """
+    Partie reconstruite à partir d'une sauvegarde (cf. encoder).
+
+    Paramètres
+    ----------
+    donnees : bytes
+
+    Returns
+    -------
+    Game
+        Partie dans l'état sauvegardé, flux d'aléa compris : elle se poursuit exactement comme l'originale.
+
+    Raises
+    ------
+    ValueError
+        Données qui ne sont pas une sauvegarde, ou d'une version de format inconnue.
+    """
+    base = _modeles_base()
+    lecteur = _Lecteur(donnees)
+    try :
+        magic, version_format = lecteur.lire(_ENTETE)
+    except Exception as e :
+        raise ValueError("sauvegarde tronquée") from e
+    if magic != MAGIC :
+        raise ValueError("pas une sauvegarde de partie")
+    if version_format not in _DISPOSITIONS :
+        raise ValueError(f"version de sauvegarde {version_format} non prise en charge (attendu : {FORMAT_VERSION})")
+    s_partie, s_tirage, s_position, sans_position, n_ressources = _DISPOSITIONS[version_format]
+
+    game = Game.__new__(Game)
+    seed, game.version, etat, game.tour, game.game_over_selection, L, H, x, y = lecteur.lire(s_partie)
+    game.seed = seed
+    game.state = ETATS[etat]
+    game.rejouer_options = ["Oui", "Non"]
+
+    game.joueur = Joueur((x, y))
+    inv = game.inv = game.joueur.inventaire
+    inv.pas, inv.piecesOr, inv.gemmes, inv.cles, inv.des, inv.chance_cles, inv.chance_piecesOr, inv.chance_objets = lecteur.lire(_INVENTAIRE)
+    for i in lecteur.octets(lecteur.octet()) :   # les effets (chances) sont déjà dans les compteurs lus
+        obj = butin.OBJETS[OBJETS_PERMANENTS[i].nom]   # objets partagés (cf. src.butin)
+        inv.noms_objets_permanents.add(obj.nom)
+        inv.objets_permanents.append(obj)
+    for i in lecteur.octets(lecteur.octet()) :
+        obj = butin.OBJETS[AUTRES_OBJETS[i].nom]
+        inv.noms_autres_objets.add(obj.nom)
+        inv.autres_objets.append(obj)
+
+    boosts = lecteur.lire(_BOOSTS)
+    game.boosts_pioche_par_couleur = dict(zip(COULEURS, boosts))
+    game.boosts_loot = dict(zip(CLES_LOOT, boosts[len(COULEURS):]))
+
+    flux = []
+    for etat_alea in lecteur.lire(_ALEA) :
+        rng = AleaCompact(0)
+        rng.setstate(etat_alea)
+        flux.append(rng)
+    game.rng_portes, game.rng_tirage, game.rng_butin, game.rng_contenants = flux
+
+    modeles : List[Optional[Piece]] = [None, *base]
+    for _ in range(lecteur.octet()) :
+        nom = lecteur.texte()
+        couleur, forme, cout, rarete, or_initial = lecteur.lire(_MODELE)
+        tags = tuple(lecteur.texte() for _ in range(lecteur.octet()))
+        modeles.append(_modele_lu(nom, COULEURS[couleur], FORMES[forme], cout, rarete, or_initial, tags))
+
+    game.pioche_pieces = pioche_neuve(game.rng_tirage)
+    for _ in range(lecteur.octet()) :
+        game.pioche_pieces.ajouter_piece_modele(modeles[lecteur.lire(_U16)[0]])
+    game.pioche_pieces.appliquer_boosts(game.boosts_pioche_par_couleur)
+
+    game.grille = Grille(L, H, rng=game.rng_portes)
+    instances : List[Optional[PiecePosee]] = []
+    for c in lecteur.octets(L * H) :
+        if c == 0 :
+            instances.append(None)
+            continue
+        posee = PiecePosee(modeles[c])
+        instances.append(posee)
+    for posee in instances :
+        if posee is None :
+            continue
+        drapeaux, posee.or_dans_piece = lecteur.lire(_POSEE)
+        posee.recompense_prise = bool(drapeaux & RECOMPENSE_PRISE)
+        posee.contenu = [nom for i, nom in enumerate(CONTENUS) if drapeaux & (2 << i)]
+    murs_h = lecteur.octets(L * (H + 1))
+    murs_v = lecteur.octets((L + 1) * H)
+    game.grille.restaurer(instances, murs_h, murs_v)
+    game.accessibilite = Accessibilite(game.grille)
+
+    game.ressources_grille = {}
+    for _ in range(lecteur.lire(n_ressources)[0]) :
+        position = lecteur.lire(s_position)
+        game.ressources_grille[position] = {lecteur.texte() : lecteur.lire(_U16)[0] for _ in range(lecteur.octet())}
+
+    game.tirage_en_cours = None
+    if lecteur.octet() :
+        cx, cy, direction, index, n = lecteur.lire(s_tirage)
+        game.tirage_en_cours = {
+            "cible" : (cx, cy),
+            "dir_entree" : DIRECTIONS[direction],
+            "pieces" : [modeles[c] for c in lecteur.octets(n)],
+            "index" : index,
+        }
+
+    def piece_a (position : Tuple[int, int]) -> Optional[PiecePosee] :
+        px, py = position
+        return None if px == sans_position else game.grille.get_piece(px, py)
+
+    game.contexte_achat = None
+    if lecteur.octet() :
+        piece = piece_a(lecteur.lire(s_position))
+        index = lecteur.octet()
+        game.contexte_achat = {
+            "piece" : piece,
+            "offres" : offres_magasin(piece.nom if piece is not None else ""),
+            "index" : index,
+        }
+
+    game.contexte_special = None
+    type_special = CONTEXTES_SPECIAUX[lecteur.octet()]
+    if type_special is not None :
+        game.contexte_special = {"type" : type_special, "piece" : piece_a(lecteur.lire(s_position))}
+
+    game.last_message = lecteur.texte(_U16)
+    return game
+
+
+
+
+def ecrire_archive (chemin : str, sauvegardes : Iterable[bytes], compresser : Optional[bool] = None) -> None :
+    """
+    Ecrit une suite de sauvegardes dans un fichier.
+
+    Paramètres
+    ----------
+    chemin : str
+    sauvegardes : Iterable[bytes]
+        Résultats d'encoder().
+    compresser : bool | None
+        Compression lz4 ; None = si le module lz4 est installé. True sans lz4 lève RuntimeError.
+
+    Returns
+    -------
+    None
+    """
+    if compresser is None :
+        compresser = lz4_frame is not None
+    if compresser and lz4_frame is None :
+        raise RuntimeError("compression demandée mais le module lz4 n'est pas installé (pip install lz4)")
+    contenu = b"".join(_U32.pack(len(s)) + s for s in sauvegardes)
+    if compresser :
+        contenu = lz4_frame.compress(contenu)
+    with open(chemin, "wb") as f :
+        f.write(MAGIC_ARCHIVE + _U8.pack(ARCHIVE_LZ4 if compresser else ARCHIVE_BRUTE))
+        f.write(contenu)
+
+
+
+
+def lire_archive (chemin : str) -> List[bytes] :
+    """ Sauvegardes d'une archive écrite par ecrire_archive (à passer à decoder) """
+    with open(chemin, "rb") as f :
+        donnees = f.read()
+    if donnees[:len(MAGIC_ARCHIVE)] != MAGIC_ARCHIVE :
+        raise ValueError(f"{chemin} : pas une archive de sauvegardes")
+    mode = donnees[len(MAGIC_ARCHIVE)]
+    contenu = donnees[len(MAGIC_ARCHIVE) + 1:]
+    if mode == ARCHIVE_LZ4 :
+        if lz4_frame is None :
+            raise RuntimeError(f"{chemin} : archive compressée avec lz4, module lz4 non installé (pip install lz4)")
+        contenu = lz4_frame.decompress(contenu)
+    sauvegardes : List[bytes] = []
+    pos = 0
+    while pos < len(contenu) :
+        n, = _U32.unpack_from(contenu, pos)
+        pos += _U32.size
+        sauvegardes.append(contenu[pos : pos + n])
+        pos += n
+    return sauvegardes
@@ -0,0 +1,535 @@
+# serveur de parties : une partie (Game) par connexion, protocole JSON ligne à ligne, sur TCP ou socket Unix
+# lancement : python -m src.server serve [--port 8765 | --socket /tmp/blueprince.sock]
+#             python -m src.server client                         (client texte, pour jouer à la main)
+#             python -m src.server charge -n 2000 --demarrer      (générateur de charge, avec son propre serveur)
+#
+# protocole : un objet JSON par ligne, dans chaque sens.
+#   client -> serveur : intentions au format InputHandler.actions() ({"deplacer": [0, -1]}, {"confirmer": true} ...),
+#                       ou {"nouvelle": {"seed": 3, "largeur": 5, "hauteur": 9}} pour (re)commencer une partie.
+#                       Le premier message crée la partie (graine au hasard s'il ne s'agit pas de "nouvelle").
+#   serveur -> client : une réponse par message, qui ne contient que ce qui a changé depuis la réponse précédente
+#                       (cf. Session.delta) ; {"erreur": "..."} si le message est refusé (la connexion reste ouverte).
+#
+# tout tourne dans une seule boucle asyncio : une partie ne coûte qu'une coroutine et quelques dizaines de Ko,
+# et un message n'est traité que par Game.handle_intentions (aucun parcours de la grille, cf. Grille.cases_modifiees_depuis).
+
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.Game import Game
+from src.Piece import MODELES
+from src.rejeu import coder_intentions, decoder_intentions
+
+try :
+    import resource
+except ImportError :   # Windows : pas de limite de descripteurs à relever
+    resource = None
+
+
+
+HOTE = "127.0.0.1"
+PORT = 8765
+LIMITE_LIGNE = 1 << 16   # taille maximale d'un message reçu (octets)
+ATTENTE_CONNEXIONS = 4096   # file d'attente des connexions (listen) : des milliers de clients peuvent arriver d'un coup
+
+SEPARATEURS = (",", ":")   # JSON sans espaces
+_ABSENT = object()
+
+Adresse = Tuple[str, Any, Any]   # ("tcp", hôte, port) ou ("unix", chemin, None)
+
+
+
+
+class Session :
+    """
+    Une partie hébergée par le serveur et ce qui en a déjà été envoyé au client.
+
+    Paramètres
+    ----------
+    seed : int | None
+    largeur, hauteur : int
+        Passés à Game.
+
+    Attributs
+    ---------
+    game : Game
+    _envoye : Dict[str, Any]
+        Dernière valeur envoyée de chaque clé de l'état (cf. delta).
+    _grille : Grille | None
+        Grille de la dernière réponse (une nouvelle partie en crée une autre : tout est renvoyé).
+    _revision : int
+        Grille.revision à la dernière réponse.
+    _modeles : set[int]
+        Modèles de pièces (Piece.id_modele) déjà décrits au client.
+
+    Méthodes
+    --------
+    appliquer(message) -> Dict[str, Any]
+        Traite un message du client et renvoie la réponse.
+    delta() -> Dict[str, Any]
+        Ce qui a changé depuis la réponse précédente.
+    """
+
+    __slots__ = ("game", "_envoye", "_grille", "_revision", "_modeles")
+
+    def __init__ (self, seed : Optional[int] = None, largeur : int = 5, hauteur : int = 9) -> None :
+        self.game = Game(seed, largeur, hauteur)
+        self._envoye : Dict[str, Any] = {}
+        self._grille = None
+        self._revision = 0
+        self._modeles : set = set()
+
+
+
+    def appliquer (self, message : Dict[str, Any]) -> Dict[str, Any] :
+        """
+        Paramètres
+        ----------
+        message : Dict[str, Any]
+            Intentions, ou {"nouvelle": {...}}.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Delta de l'état après le message.
+
+        Raises
+        ------
+        ValueError, TypeError
+            Message mal formé (intention inconnue, déplacement non unitaire, paramètres de partie invalides).
+        """
+        if "nouvelle" in message :
+            self.__init__(**_parametres_partie(message["nouvelle"]))
+        elif message :
+            if "deplacer" in message :
+                message = dict(message, deplacer=tuple(message["deplacer"]))
+            # même validation que le journal de session ; le dictionnaire décodé est partagé et déjà au bon format
+            self.game.handle_intentions(decoder_intentions(coder_intentions(message)))
+        return self.delta()
+
+
+
+    def delta (self) -> Dict[str, Any] :
+        """
+        Clés de la réponse (absentes si inchangées) :
+        grille [largeur, hauteur] (nouvelle partie : le client repart de zéro), modeles [[id, nom, forme], ...] (pièces pas
+        encore décrites), cases [[indice, id modèle, mur N, S, E, O], ...] (octets des murs, cf. Grille), etat, tour, pos [x, y],
+        msg, inv [pas, or, gemmes, clés, dés], objets (permanents), tirage {pieces [[nom, forme, coût], ...], index},
+        achat {offres [[libellé, prix], ...], index}, fin (sélection de l'écran de fin de partie).
+        """
+        game = self.game
+        grille = game.grille
+        reponse : Dict[str, Any] = {}
+
+        modifiees = None
+        if grille is self._grille :
+            modifiees = grille.cases_modifiees_depuis(self._revision)
+        if modifiees is None :   # nouvelle partie, ou trop de modifications depuis la réponse précédente : pièces posées
+            if grille is not self._grille :
+                self._grille = grille
+                self._envoye.clear()
+                self._modeles.clear()
+                reponse["grille"] = [grille.largeur, grille.hauteur]
+            modifiees = [i for i, id_modele in enumerate(grille.ids_cases) if id_modele]
+        self._revision = grille.revision
+
+        if modifiees :
+            cases = [self._case(i) for i in sorted(modifiees)]
+            nouveaux = sorted({c[1] for c in cases if c[1]} - self._modeles)
+            if nouveaux :
+                self._modeles.update(nouveaux)
+                reponse["modeles"] = [[i, MODELES[i].nom, MODELES[i].forme.nom] for i in nouveaux]
+            reponse["cases"] = cases
+
+        for cle, valeur in self._etat().items() :
+            if self._envoye.get(cle, _ABSENT) != valeur :
+                self._envoye[cle] = valeur
+                reponse[cle] = valeur
+        return reponse
+
+
+
+    def _case (self, i : int) -> List[int] :
+        grille = self.game.grille
+        y, x = divmod(i, grille.largeur)
+        murs = [murs[j] for murs, j in (grille.mur(x, y, bit) for bit in (1, 2, 4, 8))]   # N, S, E, O
+        return [i, grille.ids_cases[i], *murs]
+
+
+
+    def _etat (self) -> Dict[str, Any] :
+        """ Valeurs comparées d'une réponse à l'autre (types JSON, pour que la comparaison ne dépende pas du codage) """
+        game = self.game
+        inv = game.inv
+        etat : Dict[str, Any] = {
+            "etat" : game.state,
+            "tour" : game.tour,
+            "pos" : list(game.joueur.position),
+            "msg" : game.last_message,
+            "inv" : [inv.pas, inv.piecesOr, inv.gemmes, inv.cles, inv.des],
+            "objets" : sorted(inv.noms_objets_permanents),
+            "tirage" : None,
+            "achat" : None,
+            "fin" : game.game_over_selection if game.state == "game_over" else None,
+        }
+        if game.state == "tirage" and game.tirage_en_cours :
+            data = game.tirage_en_cours
+            etat["tirage"] = {"pieces" : [[p.nom, p.forme.nom, p.cout_gemmes] for p in data["pieces"]], "index" : data["index"]}
+        if game.state == "achat" and game.contexte_achat :
+            ctx = game.contexte_achat
+            etat["achat"] = {"offres" : [[libelle, prix] for libelle, prix, _code in ctx["offres"]], "index" : ctx.get("index", 0)}
+        return etat
+
+
+
+
+def _parametres_partie (parametres : Any) -> Dict[str, Any] :
+    """ Arguments de Session à partir du contenu d'un message "nouvelle" """
+    if parametres is None :
+        return {}
+    if not isinstance(parametres, dict) :
+        raise TypeError("nouvelle : objet attendu")
+    inconnus = set(parametres) - {"seed", "largeur", "hauteur"}
+    if inconnus :
+        raise ValueError(f"nouvelle : paramètres inconnus {sorted(inconnus)}")
+    seed = parametres.get("seed")
+    if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)) :
+        raise ValueError("nouvelle : seed entière attendue")
+    for cle in ("largeur", "hauteur") :
+        if cle in parametres and not (isinstance(parametres[cle], int) and 2 <= parametres[cle] <= 255) :
+            raise ValueError(f"nouvelle : {cle} entre 2 et 255")
+    return parametres
+
+
+
+
+def encoder (message : Dict[str, Any]) -> bytes :
+    return json.dumps(message, separators=SEPARATEURS, ensure_ascii=False).encode() + b"\n"
+
+
+
+
+class Serveur :
+    """
+    Sessions ouvertes et compteurs du serveur.
+
+    Attributs
+    ---------
+    sessions : int
+        Connexions ouvertes.
+    connexions : int
+        Connexions depuis le démarrage.
+    messages : int
+        Messages traités depuis le démarrage.
+
+    Méthodes
+    --------
+    servir_connexion(reader, writer)
+        Coroutine d'une connexion (passée à asyncio.start_server / start_unix_server).
+    demarrer(adresse) -> asyncio.AbstractServer
+    """
+
+    def __init__ (self) -> None :
+        self.sessions = 0
+        self.connexions = 0
+        self.messages = 0
+
+
+
+    async def servir_connexion (self, reader : asyncio.StreamReader, writer : asyncio.StreamWriter) -> None :
+        self.sessions += 1
+        self.connexions += 1
+        session : Optional[Session] = None
+        try :
+            while True :
+                try :
+                    ligne = await reader.readline()
+                except (ValueError, ConnectionError) :   # ligne trop longue, ou client parti
+                    break
+                if not ligne :
+                    break
+                self.messages += 1
+                try :
+                    message = json.loads(ligne)
+                    if not isinstance(message, dict) :
+                        raise TypeError("objet JSON attendu")
+                    if session is None :   # la partie est créée au premier message (avec ses paramètres si c'est "nouvelle")
+                        session = Session(**_parametres_partie(message.get("nouvelle")))
+                        if "nouvelle" in message :
+                            message = {}
+                    reponse = session.appliquer(message)
+                except (ValueError, TypeError) as e :
+                    reponse = {"erreur" : str(e)}
+                writer.write(encoder(reponse))
+                await writer.drain()
+        except ConnectionError :
+            pass
+        finally :
+            self.sessions -= 1
+            writer.close()
+
+
+
+    async def demarrer (self, adresse : Adresse) -> asyncio.AbstractServer :
+        genre, hote, port = adresse
+        if genre == "unix" :
+            return await asyncio.start_unix_server(self.servir_connexion, path=hote, limit=LIMITE_LIGNE, backlog=ATTENTE_CONNEXIONS)
+        return await asyncio.start_server(self.servir_connexion, hote, port, limit=LIMITE_LIGNE, backlog=ATTENTE_CONNEXIONS)
+
+
+
+
+async def ouvrir (adresse : Adresse) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter] :
+    genre, hote, port = adresse
+    if genre == "unix" :
+        return await asyncio.open_unix_connection(hote, limit=LIMITE_LIGNE)
+    return await asyncio.open_connection(hote, port, limit=LIMITE_LIGNE)
+
+
+
+
+def relever_limite_fichiers () -> None :
+    """ Une connexion = un descripteur de fichier : on monte la limite souple jusqu'à la limite dure (Unix) """
+    if resource is None :
+        return
+    souple, dure = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if dure == resource.RLIM_INFINITY or dure > souple :
+        try :
+            resource.setrlimit(resource.RLIMIT_NOFILE, (dure if dure != resource.RLIM_INFINITY else max(souple, 65536), dure))
+        except (ValueError, OSError) :
+            pass
+
+
+
+
+async def servir (adresse : Adresse) -> None :
+    relever_limite_fichiers()
+    serveur = Serveur()
+    instance = await serveur.demarrer(adresse)
+    print(f"serveur à l'écoute : {_texte_adresse(adresse)}", flush=True)
+    async with instance :
+        try :
+            while True :
+                await asyncio.sleep(10)
+                print(f"sessions {serveur.sessions}   connexions {serveur.connexions}   messages {serveur.messages}", flush=True)
+        finally :
+            instance.close()
+
+
+
+
+# CLIENT TEXTE
+
+COMMANDES = {
+    "n" : {"deplacer" : [0, -1]}, "s" : {"deplacer" : [0, 1]}, "e" : {"deplacer" : [1, 0]}, "o" : {"deplacer" : [-1, 0]},
+    "c" : {"confirmer" : True}, "r" : {"relancer_tirage" : True}, "x" : {"ouvrir" : True}, "a" : {"annuler" : True},
+    "g" : {"nav_game_over" : -1}, "d" : {"nav_game_over" : 1},
+}
+
+
+
+
+async def client (adresse : Adresse, seed : Optional[int], largeur : int, hauteur : int) -> None :
+    """ Lit des commandes sur l'entrée standard (cf. COMMANDES, ou une ligne JSON) et affiche les réponses """
+    reader, writer = await ouvrir(adresse)
+    boucle = asyncio.get_running_loop()
+    premier : Dict[str, Any] = {"nouvelle" : {"seed" : seed, "largeur" : largeur, "hauteur" : hauteur}}
+    print("commandes : " + "  ".join(f"{c}={json.dumps(m)}" for c, m in COMMANDES.items()) + "  (ou une ligne JSON, vide pour quitter)")
+    try :
+        message : Optional[Dict[str, Any]] = premier
+        while message is not None :
+            writer.write(encoder(message))
+            await writer.drain()
+            reponse = await reader.readline()
+            if not reponse :
+                break
+            print(reponse.decode().rstrip())
+            message = None
+            while message is None :
+                ligne = (await boucle.run_in_executor(None, sys.stdin.readline)).strip()
+                if not ligne :
+                    return
+                if ligne.startswith("{") :
+                    message = json.loads(ligne)
+                elif ligne in COMMANDES :
+                    message = COMMANDES[ligne]
+                else :
+                    print(f"commande inconnue : {ligne}")
+    finally :
+        writer.close()
+
+
+
+
+# GENERATEUR DE CHARGE
+
+def intentions_aleatoires (etat : str, rng : random.Random) -> Dict[str, Any] :
+    """ Intentions plausibles dans l'état donné (le client de charge ne connaît la partie que par les réponses) """
+    if etat == "exploration" :
+        if rng.random() < 0.15 :
+            return {"ouvrir" : True}
+        return {"deplacer" : rng.choice(((0, -1), (0, 1), (1, 0), (-1, 0)))}
+    if etat == "tirage" :
+        tirage = rng.random()
+        if tirage < 0.7 :
+            return {"confirmer" : True}
+        if tirage < 0.9 :
+            return {"deplacer" : rng.choice(((1, 0), (-1, 0)))}
+        return {"relancer_tirage" : True}
+    if etat == "achat" :
+        return {"confirmer" : True} if rng.random() < 0.3 else {"annuler" : True}
+    if etat == "game_over" :
+        return {"confirmer" : True}   # "Oui" est sélectionné par défaut : nouvelle partie
+    return {"nouvelle" : {"seed" : rng.getrandbits(32)}}   # victoire : l'écran ne lit plus d'intentions
+
+
+
+
+class BilanCharge :
+    """ Mesures côté clients : latence de chaque aller-retour (ns), octets reçus, erreurs, durée de la mesure (s) """
+
+    def __init__ (self) -> None :
+        self.latences : List[int] = []
+        self.octets = 0
+        self.erreurs = 0
+        self.ouvertes = 0
+        self.echecs_connexion = 0
+        self.duree = 0.0
+
+
+
+    def percentile (self, p : float) -> float :
+        if not self.latences :
+            return 0.0
+        triees = sorted(self.latences)
+        return triees[min(len(triees) - 1, int(p / 100 * len(triees)))] / 1e3
+
+
+
+
+async def _client_charge (adresse : Adresse, seed : int, n_intentions : int, largeur : int, hauteur : int,
+                          bilan : BilanCharge, depart : asyncio.Event) -> None :
+    try :
+        reader, writer = await ouvrir(adresse)
+    except OSError :
+        bilan.echecs_connexion += 1
+        return
+    rng = random.Random(seed)
+    etat = "exploration"
+    try :
+        writer.write(encoder({"nouvelle" : {"seed" : seed, "largeur" : largeur, "hauteur" : hauteur}}))
+        await writer.drain()
+        await reader.readline()
+        bilan.ouvertes += 1
+        await depart.wait()   # toutes les sessions sont ouvertes avant de mesurer
+        for _ in range(n_intentions) :
+            debut = time.perf_counter_ns()
+            writer.write(encoder(intentions_aleatoires(etat, rng)))
+            await writer.drain()
+            ligne = await reader.readline()
+            bilan.latences.append(time.perf_counter_ns() - debut)
+            if not ligne :
+                bilan.erreurs += 1
+                return
+            bilan.octets += len(ligne)
+            reponse = json.loads(ligne)
+            if "erreur" in reponse :
+                bilan.erreurs += 1
+            etat = reponse.get("etat", etat)
+    finally :
+        writer.close()
+
+
+
+
+async def charge (adresse : Adresse, n_sessions : int, n_intentions : int, seed : int, largeur : int, hauteur : int,
+                  demarrer : bool) -> BilanCharge :
+    """
+    Ouvre n_sessions connexions simultanées, puis chacune envoie n_intentions intentions aléatoires (une à la fois, en
+    attendant la réponse) ; avec demarrer, un serveur est lancé dans un processus à part le temps de la mesure.
+
+    Returns
+    -------
+    BilanCharge
+    """
+    relever_limite_fichiers()
+    processus = None
+    if demarrer :
+        genre, hote, port = adresse
+        options = ["--socket", hote] if genre == "unix" else ["--hote", hote, "--port", str(port)]
+        processus = await asyncio.create_subprocess_exec(sys.executable, "-m", "src.server", "serve", *options,
+                                                         stdout=asyncio.subprocess.PIPE)
+        await processus.stdout.readline()   # "serveur à l'écoute"
+    try :
+        bilan = BilanCharge()
+        depart = asyncio.Event()
+        taches = [asyncio.create_task(_client_charge(adresse, seed + i, n_intentions, largeur, hauteur, bilan, depart))
+                  for i in range(n_sessions)]
+        while bilan.ouvertes + bilan.echecs_connexion < n_sessions and not all(t.done() for t in taches) :
+            await asyncio.sleep(0.05)
+        debut = time.perf_counter()
+        depart.set()
+        await asyncio.gather(*taches)
+        bilan.duree = time.perf_counter() - debut
+        return bilan
+    finally :
+        if processus is not None :
+            processus.terminate()
+            await processus.wait()
+
+
+
+
+def _texte_adresse (adresse : Adresse) -> str :
+    genre, hote, port = adresse
+    return f"unix:{hote}" if genre == "unix" else f"{hote}:{port}"
+
+
+
+
+def main (argv : Optional[List[str]] = None) -> int :
+    parser = argparse.ArgumentParser(prog="python -m src.server", description="Serveur de parties BluePrince (JSON ligne à ligne)")
+    parser.add_argument("mode", choices=("serve", "client", "charge"))
+    parser.add_argument("--hote", default=HOTE)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--socket", default=None, help="chemin d'une socket Unix (à la place de TCP)")
+    parser.add_argument("--seed", type=int, default=None, help="graine (client : de la partie ; charge : de la première session)")
+    parser.add_argument("--largeur", type=int, default=5)
+    parser.add_argument("--hauteur", type=int, default=9)
+    parser.add_argument("-n", "--sessions", type=int, default=1000, help="charge : connexions simultanées")
+    parser.add_argument("--intentions", type=int, default=100, help="charge : intentions envoyées par session")
+    parser.add_argument("--demarrer", action="store_true", help="charge : lancer un serveur le temps de la mesure")
+    args = parser.parse_args(argv)
+
+    adresse : Adresse = ("unix", args.socket, None) if args.socket else ("tcp", args.hote, args.port)
+
+    if args.mode == "serve" :
+        try :
+            asyncio.run(servir(adresse))
+        except KeyboardInterrupt :
+            pass
+        return 0
+
+    if args.mode == "client" :
+        asyncio.run(client(adresse, args.seed, args.largeur, args.hauteur))
+        return 0
+
+    bilan = asyncio.run(charge(adresse, args.sessions, args.intentions, args.seed or 0, args.largeur, args.hauteur, args.demarrer))
+    n = len(bilan.latences)
+    print(f"{bilan.ouvertes} sessions ({bilan.echecs_connexion} connexions refusées), {n} intentions en {bilan.duree:.2f}s"
+          f"  ->  {n / bilan.duree if bilan.duree > 0 else 0.0:.0f} intentions/s")
+    print(f"  latence   p50 {bilan.percentile(50):>8.0f} us   p90 {bilan.percentile(90):>8.0f} us   p99 {bilan.percentile(99):>8.0f} us")
+    print(f"  réponses  {bilan.octets / n if n else 0.0:.1f} octets en moyenne   erreurs {bilan.erreurs}")
+    return 1 if bilan.erreurs or bilan.echecs_connexion else 0
+
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
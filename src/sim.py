@@ -0,0 +1,446 @@
+# simulation headless : on pilote Game sans pygame pour tester l'équilibrage
+# lancement : python -m src.sim -n 10000 --workers 8
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.Game import Game
+from src.rejeu import EXTENSION, Journal, ecrire_journal
+
+
+ORDRE_DIRECTIONS = ("N", "S", "E", "O")   # ordre fixe : l'ordre d'un set de str change d'un processus à l'autre
+VECTEURS = {"N" : (0,-1), "S" : (0,1), "E" : (1,0), "O" : (-1,0)}
+ETATS_FINAUX = ("victoire", "game_over", "quit")
+
+
+
+
+class Politique (ABC) :
+    """
+    Politique de jeu : décide des intentions à envoyer au jeu à chaque pas de simulation.
+    Les intentions ont le même format que InputHandler.actions(), on passe donc par Game.handle_intentions
+    exactement comme la boucle pygame.
+
+    Attributs
+    ---------
+    rng : random.Random
+        Générateur propre à la politique (indépendant de celui du jeu).
+    _refus : Set[Tuple]
+        Déplacements déjà refusés (position, direction, clés) : on évite de buter indéfiniment sur la même porte.
+
+    Méthodes
+    --------
+    choisir(game) -> Dict[str, Any]
+        Retourne les intentions pour l'état courant ; un dict vide signifie que la politique abandonne.
+    choisir_exploration(game) -> Dict[str, Any]
+        Intentions en exploration : propre à chaque politique (méthode abstraite).
+    """
+
+    nom : str = "politique"
+
+    def __init__(self, seed : Optional[int] = None) -> None :
+        self.rng = random.Random(seed)
+        self._refus : Set[Tuple] = set()
+        self._dernier_deplacement : Optional[Tuple] = None
+
+
+
+    def choisir(self, game : Game) -> Dict[str, Any] :
+        if game.state == "exploration" :
+            # le déplacement précédent n'a rien donné : on le mémorise
+            if self._dernier_deplacement is not None and self._dernier_deplacement[0] == game.joueur.position :
+                self._refus.add(self._dernier_deplacement)
+            self._dernier_deplacement = None
+            intentions = self.choisir_exploration(game)
+            if "deplacer" in intentions :
+                self._dernier_deplacement = (game.joueur.position, intentions["deplacer"], game.inv.cles)
+            return intentions
+        self._dernier_deplacement = None
+        if game.state == "tirage" :
+            return self.choisir_tirage(game)
+        if game.state == "achat" :
+            return self.choisir_achat(game)
+        return {}
+
+
+
+    @abstractmethod
+    def choisir_exploration(self, game : Game) -> Dict[str, Any] :
+        raise NotImplementedError
+
+
+
+    def choisir_tirage(self, game : Game) -> Dict[str, Any] :
+        """ On vise une pièce abordable, on relance avec un dé si aucune ne l'est """
+        tirage = game.tirage_en_cours
+        pieces = tirage["pieces"]
+        abordables = [i for i, p in enumerate(pieces) if p.cout_gemmes <= game.inv.gemmes]
+        if not abordables :
+            if game.inv.des > 0 :
+                return {"relancer_tirage" : True}
+            return {}
+        cible = self.choisir_index_tirage(game, abordables)
+        return self._aller_vers_index(tirage["index"], cible, len(pieces))
+
+
+
+    def choisir_index_tirage(self, game : Game, abordables : List[int]) -> int :
+        return self.rng.choice(abordables)
+
+
+
+    def choisir_achat(self, game : Game) -> Dict[str, Any] :
+        """ Achète une offre abordable au hasard (une fois sur deux), sinon quitte le magasin """
+        ctx = game.contexte_achat
+        offres = ctx["offres"]
+        abordables = [i for i, (_nom, prix, _code) in enumerate(offres) if prix <= game.inv.piecesOr]
+        if not abordables or self.rng.random() < 0.5 :
+            return {"annuler" : True}
+        cible = self.rng.choice(abordables)
+        return self._aller_vers_index(ctx.get("index", 0), cible, len(offres))
+
+
+
+    def _aller_vers_index(self, index : int, cible : int, n : int) -> Dict[str, Any] :
+        """ L'UI ne sait que décaler le curseur d'un cran : on avance d'un cran ou on valide """
+        if index == cible :
+            return {"confirmer" : True}
+        return {"deplacer" : (1, 0) if (cible - index) % n <= n // 2 else (-1, 0)}
+
+
+
+    def _directions_possibles(self, game : Game) -> List[str] :
+        """ Directions où la pièce courante a une porte qui reste dans la grille (hors déplacements déjà refusés) """
+        x, y = game.joueur.position
+        piece = game.grille.get_piece(x, y)
+        directions = []
+        for d in ORDRE_DIRECTIONS :
+            if piece is not None and not piece.a_porte(d) :
+                continue
+            nx, ny = game.grille.voisin(x, y, d)
+            if game.grille.deplacement_permis(nx, ny) :
+                directions.append(d)
+        # tout a été refusé avec les clés actuelles : plus rien à tenter, la politique abandonnera
+        return [d for d in directions if ((x, y), VECTEURS[d], game.inv.cles) not in self._refus]
+
+
+
+
+class PolitiqueAleatoire (Politique) :
+    """ Se déplace au hasard parmi les portes de la pièce courante """
+
+    nom = "aleatoire"
+
+    def choisir_exploration(self, game : Game) -> Dict[str, Any] :
+        if game.contexte_special and self.rng.random() < 0.5 :
+            return {"ouvrir" : True}
+        directions = self._directions_possibles(game)
+        if not directions :
+            return {}
+        return {"deplacer" : VECTEURS[self.rng.choice(directions)]}
+
+
+
+
+class PolitiqueNord (Politique) :
+    """
+    Cherche la sortie : privilégie le nord, puis les côtés, le sud en dernier recours.
+    Au tirage, préfère les pièces gratuites qui ont une porte au nord.
+    """
+
+    nom = "nord"
+    POIDS = {"N" : 6.0, "E" : 2.0, "O" : 2.0, "S" : 1.0}
+
+    def choisir_exploration(self, game : Game) -> Dict[str, Any] :
+        if game.contenant_ouvrable() :   # un contenant qu'on ne peut pas ouvrir resterait en attente : on continue d'explorer
+            return {"ouvrir" : True}
+        directions = self._directions_possibles(game)
+        if not directions :
+            return {}
+        d = self.rng.choices(directions, weights=[self.POIDS[d] for d in directions])[0]
+        return {"deplacer" : VECTEURS[d]}
+
+
+
+    def choisir_index_tirage(self, game : Game, abordables : List[int]) -> int :
+        pieces = game.tirage_en_cours["pieces"]
+        return max(abordables, key=lambda i : (pieces[i].a_porte("N"), -pieces[i].cout_gemmes, -i))
+
+
+
+
+POLITIQUES = {
+    PolitiqueAleatoire.nom : PolitiqueAleatoire,
+    PolitiqueNord.nom : PolitiqueNord,
+}
+
+
+
+
+@dataclass
+class ResultatPartie :
+    """ Résultat d'une partie simulée """
+    seed : int
+    issue : str   # "victoire", "game_over" ou "abandon" (politique bloquée ou budget d'actions épuisé)
+    actions : int
+    deplacements : int
+    pieces_posees : int
+    pas : int
+    piecesOr : int
+    gemmes : int
+    cles : int
+    des : int
+    objets_permanents : int
+
+
+
+
+# métriques agrégées (moyenne, min, max) dans les statistiques
+METRIQUES = ("actions", "deplacements", "pieces_posees", "pas", "piecesOr", "gemmes", "cles", "des", "objets_permanents")
+
+
+
+
+@dataclass
+class StatistiquesSimulation :
+    """
+    Statistiques agrégées d'un lot de parties.
+    Les lots calculés par les workers sont fusionnés côté parent : seules ces sommes transitent entre processus.
+    """
+    parties : int = 0
+    issues : Dict[str, int] = field(default_factory=dict)
+    sommes : Dict[str, int] = field(default_factory=dict)
+    minimums : Dict[str, int] = field(default_factory=dict)
+    maximums : Dict[str, int] = field(default_factory=dict)
+
+
+
+    def ajouter(self, r : ResultatPartie) -> None :
+        self.parties += 1
+        self.issues[r.issue] = self.issues.get(r.issue, 0) + 1
+        for m in METRIQUES :
+            v = getattr(r, m)
+            self.sommes[m] = self.sommes.get(m, 0) + v
+            self.minimums[m] = min(self.minimums.get(m, v), v)
+            self.maximums[m] = max(self.maximums.get(m, v), v)
+
+
+
+    def fusionner(self, autre : 'StatistiquesSimulation') -> None :
+        self.parties += autre.parties
+        for issue, n in autre.issues.items() :
+            self.issues[issue] = self.issues.get(issue, 0) + n
+        for m, v in autre.sommes.items() :
+            self.sommes[m] = self.sommes.get(m, 0) + v
+        for m, v in autre.minimums.items() :
+            self.minimums[m] = min(self.minimums.get(m, v), v)
+        for m, v in autre.maximums.items() :
+            self.maximums[m] = max(self.maximums.get(m, v), v)
+
+
+
+    def moyennes(self) -> Dict[str, float] :
+        if not self.parties :
+            return {}
+        return {m : v / self.parties for m, v in self.sommes.items()}
+
+
+
+    def resume(self) -> Dict[str, Any] :
+        d = asdict(self)
+        d["moyennes"] = self.moyennes()
+        d["taux_victoire"] = self.issues.get("victoire", 0) / self.parties if self.parties else 0.0
+        return d
+
+
+
+
+def jouer_partie(seed : int, politique : str = "aleatoire", max_actions : int = 2000,
+                 journal : Optional[Journal] = None, largeur : int = 5, hauteur : int = 9) -> ResultatPartie :
+    """
+    Joue une partie complète sans affichage.
+
+    Paramètres
+    ----------
+    seed : int
+        Graine de la partie (jeu et politique).
+    politique : str
+        Nom de la politique (clé de POLITIQUES).
+    max_actions : int
+        Budget d'intentions : au-delà, la partie est comptée comme abandonnée.
+    journal : Journal | None
+        Si fourni, reçoit les intentions jouées et l'empreinte finale (cf. src.rejeu).
+    largeur, hauteur : int
+        Dimensions de la grille.
+
+    Returns
+    -------
+    ResultatPartie
+        Issue et ressources finales de la partie.
+    """
+    pol = POLITIQUES[politique](seed ^ 0x5EED)
+
+    game = Game(seed, largeur, hauteur)
+    actions = 0
+    deplacements = 0
+    issue = "abandon"
+
+    while actions < max_actions :
+        if game.state in ETATS_FINAUX :
+            issue = "victoire" if game.state == "victoire" else "game_over"
+            break
+
+        intentions = pol.choisir(game)
+        if not intentions :
+            break
+
+        position = game.joueur.position
+        if journal is not None :
+            journal.enregistrer(intentions)
+        game.handle_intentions(intentions)
+        actions += 1
+        if game.joueur.position != position :
+            deplacements += 1
+    else :
+        if game.state in ETATS_FINAUX :
+            issue = "victoire" if game.state == "victoire" else "game_over"
+
+    if journal is not None :
+        journal.terminer(game)
+
+    grille = game.grille
+    pieces_posees = sum(1 for ligne in grille.pieces for p in ligne if p is not None) - 1   # l'entrée est posée d'office
+    inv = game.inv
+    return ResultatPartie(
+        seed=seed,
+        issue=issue,
+        actions=actions,
+        deplacements=deplacements,
+        pieces_posees=pieces_posees,
+        pas=inv.pas,
+        piecesOr=inv.piecesOr,
+        gemmes=inv.gemmes,
+        cles=inv.cles,
+        des=inv.des,
+        objets_permanents=len(inv.noms_objets_permanents),
+    )
+
+
+
+
+def _jouer_lot(seeds : range, politique : str, max_actions : int, journaux : Optional[str] = None,
+               largeur : int = 5, hauteur : int = 9) -> StatistiquesSimulation :
+    """ Tâche d'un worker : joue un lot de parties et ne renvoie que l'agrégat (les journaux éventuels sont écrits par le worker) """
+    stats = StatistiquesSimulation()
+    for seed in seeds :
+        journal = Journal(seed, largeur, hauteur) if journaux is not None else None
+        stats.ajouter(jouer_partie(seed, politique, max_actions, journal, largeur, hauteur))
+        if journal is not None :
+            ecrire_journal(os.path.join(journaux, f"{politique}_{seed}{EXTENSION}"), journal)
+    return stats
+
+
+
+
+def simuler(n_parties : int, seed : int = 0, politique : str = "aleatoire", workers : Optional[int] = None,
+            max_actions : int = 2000, taille_lot : int = 256, journaux : Optional[str] = None,
+            largeur : int = 5, hauteur : int = 9) -> StatistiquesSimulation :
+    """
+    Répartit n_parties sur un ProcessPoolExecutor et agrège les résultats.
+
+    Paramètres
+    ----------
+    n_parties : int
+        Nombre de parties à jouer.
+    seed : int
+        Graine de base : la partie i utilise la graine seed + i, le résultat ne dépend donc pas du nombre de workers.
+    politique : str
+        Nom de la politique (clé de POLITIQUES).
+    workers : int | None
+        Nombre de processus (None = nombre de coeurs, 1 = tout dans le processus courant).
+    max_actions : int
+        Budget d'intentions par partie.
+    taille_lot : int
+        Nombre de parties par tâche envoyée à un worker.
+    journaux : str | None
+        Dossier où écrire le journal de chaque partie (à rejouer avec python -m src.rejeu).
+    largeur, hauteur : int
+        Dimensions de la grille de chaque partie.
+
+    Returns
+    -------
+    StatistiquesSimulation
+        Statistiques agrégées.
+    """
+    if politique not in POLITIQUES :
+        raise ValueError(f"politique inconnue : {politique} (choix : {', '.join(POLITIQUES)})")
+
+    lots = [range(debut, min(debut + taille_lot, seed + n_parties)) for debut in range(seed, seed + n_parties, taille_lot)]
+    total = StatistiquesSimulation()
+
+    if workers == 1 :
+        for lot in lots :
+            total.fusionner(_jouer_lot(lot, politique, max_actions, journaux, largeur, hauteur))
+        return total
+
+    with ProcessPoolExecutor(max_workers=workers) as pool :
+        futures = [pool.submit(_jouer_lot, lot, politique, max_actions, journaux, largeur, hauteur) for lot in lots]
+        for f in futures :
+            total.fusionner(f.result())
+    return total
+
+
+
+
+def main(argv : Optional[List[str]] = None) -> None :
+    parser = argparse.ArgumentParser(prog="python -m src.sim", description="Simulation headless de parties BluePrince")
+    parser.add_argument("-n", "--parties", type=int, default=1000, help="nombre de parties")
+    parser.add_argument("--seed", type=int, default=0, help="graine de base")
+    parser.add_argument("--politique", choices=sorted(POLITIQUES), default="aleatoire")
+    parser.add_argument("--workers", type=int, default=None, help="nombre de processus (défaut : nombre de coeurs)")
+    parser.add_argument("--max-actions", type=int, default=2000, help="budget d'intentions par partie")
+    parser.add_argument("--taille-lot", type=int, default=256, help="parties par tâche envoyée à un worker")
+    parser.add_argument("--journaux", default=None, help="dossier où écrire le journal de chaque partie")
+    parser.add_argument("--largeur", type=int, default=5, help="largeur de la grille")
+    parser.add_argument("--hauteur", type=int, default=9, help="hauteur de la grille")
+    parser.add_argument("--json", action="store_true", help="sortie JSON")
+    args = parser.parse_args(argv)
+    if args.parties < 1 :
+        parser.error("il faut au moins une partie (-n 1)")
+
+    debut = time.perf_counter()
+    stats = simuler(args.parties, args.seed, args.politique, args.workers, args.max_actions, args.taille_lot, args.journaux,
+                    args.largeur, args.hauteur)
+    duree = time.perf_counter() - debut
+
+    resume = stats.resume()
+    resume["duree_s"] = duree
+    resume["parties_par_heure"] = stats.parties / duree * 3600 if duree > 0 else 0.0
+    resume["workers"] = args.workers or os.cpu_count()
+
+    if args.json :
+        json.dump(resume, sys.stdout, indent=2)
+        print()
+        return
+
+    print(f"{stats.parties} parties ({args.politique}) en {duree:.2f}s  ->  {resume['parties_par_heure']:.0f} parties/heure")
+    for issue, n in sorted(stats.issues.items()) :
+        print(f"  {issue:<10} {n:>8}  ({n / stats.parties:.1%})")
+    moyennes = stats.moyennes()
+    for m in METRIQUES :
+        print(f"  {m:<18} moy {moyennes[m]:>8.2f}   min {stats.minimums[m]:>6}   max {stats.maximums[m]:>6}")
+
+
+
+
+if __name__ == "__main__":
+    main()
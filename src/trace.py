@@ -0,0 +1,217 @@
+# traces structurées : niveaux, une catégorie par sous-système, tampon circulaire des derniers événements
+#
+# un canal désactivé pour un niveau a la méthode correspondante remplacée par une fonction vide :
+# l'appel ne coûte que l'évaluation des arguments, et le message n'est formaté que s'il est lu.
+#
+# configuration par variable d'environnement, ex :
+#   BLUEPRINCE_TRACE=DEBUG                 tout au niveau DEBUG
+#   BLUEPRINCE_TRACE=portes:DEBUG,rendu:OFF
+#   BLUEPRINCE_TRACE_ECHO=1                recopie aussi les événements sur la sortie d'erreur
+
+from __future__ import annotations
+from collections import deque
+from itertools import count
+from typing import Deque, Dict, List, Optional, TextIO, Tuple
+import os
+import sys
+
+
+
+DEBUG = 10
+INFO = 20
+ALERTE = 30
+ERREUR = 40
+AUCUN = 100   # canal muet
+
+NIVEAUX = {"DEBUG" : DEBUG, "INFO" : INFO, "ALERTE" : ALERTE, "ERREUR" : ERREUR, "OFF" : AUCUN}
+NOMS_NIVEAUX = {DEBUG : "DEBUG", INFO : "INFO", ALERTE : "ALERTE", ERREUR : "ERREUR"}
+
+CATEGORIES = ("grille", "portes", "inventaire", "pioche", "jeu", "rendu")
+NIVEAU_DEFAUT = INFO   # par défaut les événements INFO et plus sont gardés en mémoire, les DEBUG ne coûtent rien
+TAILLE_TAMPON = 512
+
+VARIABLE_ENV = "BLUEPRINCE_TRACE"
+VARIABLE_ECHO = "BLUEPRINCE_TRACE_ECHO"
+
+
+# (numéro, catégorie, niveau, format, arguments) : le formatage est différé jusqu'à la lecture
+Evenement = Tuple[int, str, int, str, tuple]
+
+_TAMPON : Deque[Evenement] = deque(maxlen=TAILLE_TAMPON)
+_NUMEROS = count()
+_echo : bool = False
+
+
+
+
+def _rien (*args, **kwargs) -> None :
+    return None
+
+
+
+
+def formater (evenement : Evenement) -> str :
+    """ Texte d'un événement du tampon """
+    numero, categorie, niveau, message, args = evenement
+    try :
+        texte = message % args if args else message
+    except (TypeError, ValueError) :
+        texte = f"{message} {args!r}"
+    return f"#{numero} [{categorie}] {NOMS_NIVEAUX.get(niveau, niveau)} : {texte}"
+
+
+
+
+class Canal :
+    """
+    Emetteur de traces d'une catégorie.
+
+    Paramètres
+    ----------
+    categorie : str
+        Nom du sous-système (cf. CATEGORIES).
+    niveau : int
+        Niveau minimal enregistré.
+
+    Attributs
+    ---------
+    categorie : str
+    niveau : int
+    debug, info, alerte, erreur : Callable[..., None]
+        Emetteurs par niveau, appelés comme `canal.debug("porte (%d,%d) niveau %d", x, y, n)`.
+        Un niveau inférieur au seuil est une fonction vide.
+
+    Méthodes
+    --------
+    regler(niveau) -> None
+        Change le seuil et recâble les émetteurs.
+    actif(niveau) -> bool
+        Indique si un niveau est enregistré (pour éviter de calculer des arguments coûteux).
+    """
+
+    __slots__ = ("categorie", "niveau", "debug", "info", "alerte", "erreur")
+
+    def __init__ (self, categorie : str, niveau : int = NIVEAU_DEFAUT) -> None :
+        self.categorie = categorie
+        self.regler(niveau)
+
+
+
+    def regler (self, niveau : int) -> None :
+        self.niveau = niveau
+        self.debug = self._emetteur(DEBUG) if DEBUG >= niveau else _rien
+        self.info = self._emetteur(INFO) if INFO >= niveau else _rien
+        self.alerte = self._emetteur(ALERTE) if ALERTE >= niveau else _rien
+        self.erreur = self._emetteur(ERREUR) if ERREUR >= niveau else _rien
+
+
+
+    def actif (self, niveau : int) -> bool :
+        return niveau >= self.niveau
+
+
+
+    def _emetteur (self, niveau : int) :
+        categorie = self.categorie
+        tampon = _TAMPON
+        numeros = _NUMEROS
+
+        def emettre (message : str, *args) -> None :
+            evenement = (next(numeros), categorie, niveau, message, args)
+            tampon.append(evenement)
+            if _echo :
+                print(formater(evenement), file=sys.stderr)
+
+        return emettre
+
+
+
+
+_CANAUX : Dict[str, Canal] = {}
+
+
+
+
+def canal (categorie : str) -> Canal :
+    """ Canal d'une catégorie (créé au premier appel, avec le niveau configuré) """
+    c = _CANAUX.get(categorie)
+    if c is None :
+        c = _CANAUX[categorie] = Canal(categorie, _niveaux.get(categorie, _niveaux.get("*", NIVEAU_DEFAUT)))
+    return c
+
+
+
+
+def configurer (reglages : Optional[str | Dict[str, int]] = None, echo : Optional[bool] = None) -> None :
+    """
+    Règle les niveaux des canaux.
+
+    Paramètres
+    ----------
+    reglages : str | Dict[str, int] | None
+        Chaîne au format de BLUEPRINCE_TRACE ("DEBUG", "portes:DEBUG,rendu:OFF") ou dictionnaire
+        catégorie -> niveau ("*" pour toutes les catégories).
+    echo : bool | None
+        Recopie des événements sur la sortie d'erreur (inchangé si None).
+
+    Returns
+    -------
+    None
+    """
+    global _echo
+    if echo is not None :
+        _echo = echo
+    if reglages is None :
+        return
+    if isinstance(reglages, str) :
+        reglages = _lire_reglages(reglages)
+    _niveaux.update(reglages)
+    for nom, c in _CANAUX.items() :
+        c.regler(_niveaux.get(nom, _niveaux.get("*", NIVEAU_DEFAUT)))
+
+
+
+
+def _lire_reglages (texte : str) -> Dict[str, int] :
+    reglages : Dict[str, int] = {}
+    for morceau in texte.split(",") :
+        morceau = morceau.strip()
+        if not morceau :
+            continue
+        categorie, _, niveau = morceau.rpartition(":")
+        niveau = niveau.strip().upper()
+        if niveau not in NIVEAUX :
+            raise ValueError(f"{VARIABLE_ENV} : niveau inconnu '{niveau}' (attendu : {', '.join(NIVEAUX)})")
+        reglages[categorie.strip() or "*"] = NIVEAUX[niveau]
+    return reglages
+
+
+
+
+def derniers (n : Optional[int] = None, categorie : Optional[str] = None) -> List[str] :
+    """ Textes des n derniers événements du tampon (tous si n est None), éventuellement filtrés par catégorie """
+    evenements = [e for e in _TAMPON if categorie is None or e[1] == categorie]
+    if n is not None :
+        evenements = evenements[-n:]
+    return [formater(e) for e in evenements]
+
+
+
+
+def vider () -> None :
+    _TAMPON.clear()
+
+
+
+
+def dump (fichier : Optional[TextIO] = None, n : Optional[int] = None) -> None :
+    """ Ecrit les derniers événements du tampon (sortie d'erreur par défaut) """
+    fichier = fichier if fichier is not None else sys.stderr
+    for ligne in derniers(n) :
+        print(ligne, file=fichier)
+
+
+
+
+_niveaux : Dict[str, int] = _lire_reglages(os.environ.get(VARIABLE_ENV, ""))
+_echo = os.environ.get(VARIABLE_ECHO, "") not in ("", "0")
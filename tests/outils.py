@@ -0,0 +1,38 @@
+# outils communs aux tests : parties pilotées par une politique de src.sim, sans affichage
+
+from __future__ import annotations
+from typing import Any, Dict, Iterator, Optional
+
+from src.Game import Game
+from src.rejeu import Journal
+from src.sim import ETATS_FINAUX, POLITIQUES, Politique
+
+
+
+
+def intentions (game : Game, pol : Politique, n : int = 2000) -> Iterator[Dict[str, Any]] :
+    """ Intentions de la politique pour la partie, au plus n, jusqu'à la fin de partie ; c'est l'appelant qui les applique """
+    for _ in range(n) :
+        if game.state in ETATS_FINAUX :
+            return
+        actions = pol.choisir(game)
+        if not actions :
+            return
+        yield actions
+
+
+
+def jouer (game : Game, pol : Politique, n : int = 2000, journal : Optional[Journal] = None) -> Game :
+    """ Continue la partie avec la politique : au plus n intentions, arrêt en fin de partie ; journal : reçoit les intentions jouées """
+    for actions in intentions(game, pol, n) :
+        if journal is not None :
+            journal.enregistrer(actions)
+        game.handle_intentions(actions)
+    return game
+
+
+
+def partie (seed : int, politique : str = "aleatoire", n : int = 2000, largeur : int = 5, hauteur : int = 9,
+            journal : Optional[Journal] = None) -> Game :
+    """ Partie neuve de graine seed sur une grille largeur x hauteur, jouée par la politique nommée (même graine) """
+    return jouer(Game(seed, largeur, hauteur), POLITIQUES[politique](seed), n, journal)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+from collections import deque
+from typing import Set, Tuple
+
+import pytest
+
+from src import butin
+from src.Game import Game
+from src.Grille import MASQUE_NIVEAU, PORTE_OUVERTE
+from src.accessibilite import Accessibilite
+from src.directions import BITS_MASQUE, VECT_BIT
+from src.sim import POLITIQUES
+from tests.outils import intentions
+
+
+
+
+def _force_brute (grille, x : int, y : int) -> Tuple[Set[Tuple[int, int]], Tuple[int, int, int, int]] :
+    """ Composante de (x, y) par parcours en largeur, et ses portes de frontière (niveaux 0 à 2, ouvertes sur le vide) """
+    L, H = grille.largeur, grille.hauteur
+    vues = {(x, y)}
+    file = deque(vues)
+    comptes = [0, 0, 0, 0]
+    while file :
+        cx, cy = file.popleft()
+        masque = grille.get_modele(cx, cy).forme.masque
+        for bit in BITS_MASQUE[15] :
+            dx, dy = VECT_BIT[bit]
+            nx, ny = cx + dx, cy + dy
+            if not (0 <= nx < L and 0 <= ny < H) :
+                continue
+            murs, i = grille.mur(cx, cy, bit)
+            etat = murs[i]
+            voisin_pose = grille.get_modele(nx, ny) is not None
+            if etat & PORTE_OUVERTE and voisin_pose and (nx, ny) not in vues :
+                vues.add((nx, ny))
+                file.append((nx, ny))
+            if not masque & bit :
+                continue
+            if not etat :
+                comptes[0] += 1
+            elif not etat & PORTE_OUVERTE :
+                comptes[etat & MASQUE_NIVEAU] += 1
+            elif not voisin_pose :
+                comptes[3] += 1
+    return vues, tuple(comptes)
+
+
+
+@pytest.mark.parametrize("seed, largeur, hauteur", [(s, 5, 9) for s in range(8)] + [(s, 12, 7) for s in range(4)] + [(s, 50, 90) for s in range(4)])
+def test_comme_parcours_en_largeur (seed : int, largeur : int, hauteur : int) -> None :
+    """ Après chaque intention : mêmes composante et portes de frontière qu'un parcours complet et qu'une reconstruction """
+    game = Game(seed, largeur, hauteur)
+    for actions in intentions(game, POLITIQUES["aleatoire"](seed), 400) :
+        game.handle_intentions(actions)
+        x, y = game.joueur.position
+        composante, comptes = _force_brute(game.grille, x, y)
+        assert set(game.accessibilite.composante(x, y)) == composante
+        assert game.accessibilite.comptes_frontiere(x, y) == comptes
+        assert Accessibilite(game.grille).comptes_frontiere(x, y) == comptes
+
+
+
+def test_depart () -> None :
+    game = Game(0)
+    x, y = game.joueur.position
+    assert game.accessibilite.composante(x, y) == [(x, y)]
+    assert game.accessibilite.meme_composante((x, y), (x, y))
+    assert game.accessibilite.franchissables(x, y, game.inv) > 0
+
+
+
+def test_cles_a_portee_contenant () -> None :
+    """ Un contenant en attente que l'inventaire peut ouvrir peut donner une clé : la partie n'est pas bloquée """
+    game = Game(0)
+    game.inv.cles = 0
+    posee = game.grille.get_piece(*game.joueur.position)
+    assert not game._cles_a_portee()
+
+    game.contexte_special = {"type" : "coffre", "piece" : posee}
+    assert not game._cles_a_portee()   # ni clé ni marteau
+    game.inv.ajouter_obj_permanent(butin.MARTEAU)
+    assert game._cles_a_portee()
+
+    game.contexte_special = {"type" : "casier", "piece" : posee}
+    assert not game._cles_a_portee()   # un casier ne s'ouvre qu'avec une clé
@@ -0,0 +1,81 @@
+from __future__ import annotations
+import random
+from collections import Counter
+
+import pytest
+
+from src import butin
+from src.Game import Game
+from src.butin import TableAlias, TableButin
+
+
+
+
+@pytest.mark.parametrize("poids", [[1.0, 1.0, 1.0], [1.0, 2.0, 0.0, 5.0], [0.1, 10.0, 3.3, 0.6, 2.0], [7.0]])
+def test_table_alias_frequences (poids) -> None :
+    objets = list("abcde"[:len(poids)])
+    table = TableAlias(objets, poids)
+    rng = random.Random(1)
+    n = 60_000
+    tirages = Counter(table.tirer(rng) for _ in range(n))
+    for o, p in zip(objets, poids) :
+        assert abs(tirages[o] / n - p / sum(poids)) < 0.01
+
+
+
+def test_table_alias_probabilites_exactes () -> None :
+    """ Probabilité de chaque objet reconstituée à partir des seuils et des alias """
+    poids = [3.0, 0.5, 1.5, 0.0, 5.0]
+    table = TableAlias(range(len(poids)), poids)
+    n = len(poids)
+    probas = [0.0] * n
+    for i in range(n) :
+        probas[i] += table.seuils[i] / n
+        probas[table.alias[i]] += (1.0 - table.seuils[i]) / n
+    for p, attendu in zip(probas, poids) :
+        assert abs(p - attendu / sum(poids)) < 1e-12
+
+
+
+def test_table_alias_vide () -> None :
+    with pytest.raises(ValueError) :
+        TableAlias([], [])
+    with pytest.raises(ValueError) :
+        TableAlias(["a"], [0.0])
+
+
+
+def _chance_cles (valeur : float) :
+    inv = Game(0).inv
+    inv.chance_cles = valeur
+    return inv
+
+
+
+def test_chances_inventaire () -> None :
+    table = TableButin("essai", [("objet", 1.0, butin.CHANCE_OBJETS), ("cle", 1.0, butin.CHANCE_CLES), (None, 2.0, None)])
+    inv = _chance_cles(1.0)
+    rng = random.Random(2)
+    n = 40_000
+    tirages = Counter(table.tirer(rng, inv) for _ in range(n))
+    assert abs(tirages["cle"] / n - 0.4) < 0.01   # poids doublé : 2 sur 5
+    assert abs(tirages[None] / n - 0.4) < 0.01
+    assert table.table(_chance_cles(5.0)).seuils == table.table(inv).seuils   # plafonnée à CHANCE_MAX
+
+
+
+def test_tables_avec_cles () -> None :
+    """ Game._cles_a_portee compte sur donne_cles pour les contenants (cf. contexte_special) """
+    assert butin.CASIER.donne_cles and butin.COFFRE.donne_cles and butin.CREUSER.donne_cles
+    assert not butin.JARDIN_CONSOMMABLE.donne_cles
+    assert not TableButin("sans", [(butin.CLE, 0.0, None), (butin.OR_2, 1.0, None)]).donne_cles
+
+
+
+def test_permanent_manquant () -> None :
+    inv = Game(0).inv
+    for obj in butin.PERMANENTS[1:] :
+        inv.ajouter_obj_permanent(obj)
+    rng = random.Random(3)
+    trouves = {butin.permanent_manquant(rng, inv) for _ in range(500)}
+    assert trouves == {None, butin.PERMANENTS[0]}
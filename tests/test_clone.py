@@ -0,0 +1,56 @@
+from __future__ import annotations
+import copy
+
+import pytest
+
+from src import sauvegarde
+from src.Game import Game
+from src.sim import POLITIQUES
+from tests.outils import jouer, partie
+
+
+
+
+@pytest.mark.parametrize("seed, politique, n", [(0, "aleatoire", 0), (1, "nord", 25), (2, "aleatoire", 60), (3, "nord", 120)])
+def test_clone_independant (seed : int, politique : str, n : int) -> None :
+    game = partie(seed, politique, n)
+    avant = sauvegarde.encoder(game)
+    clone = game.clone()
+    assert sauvegarde.encoder(clone) == avant
+
+    jouer(clone, POLITIQUES["aleatoire"](seed + 1), 80)
+    assert sauvegarde.encoder(game) == avant   # l'original n'a pas bougé
+
+    # l'original joue ensuite sans toucher au clone
+    apres_clone = sauvegarde.encoder(clone)
+    jouer(game, POLITIQUES["nord"](seed + 2), 80)
+    assert sauvegarde.encoder(clone) == apres_clone
+
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_clone_meme_suite (seed : int) -> None :
+    """ Les mêmes intentions jouées sur l'original et sur le clone donnent la même partie (flux d'aléa copiés) """
+    game = partie(seed, "nord", 30)
+    clone = game.clone()
+    pol = POLITIQUES["aleatoire"](seed)
+    pol_clone = copy.deepcopy(pol)
+    jouer(game, pol, 100)
+    jouer(clone, pol_clone, 100)
+    assert sauvegarde.encoder(clone) == sauvegarde.encoder(game)
+
+
+
+def test_clone_de_clone () -> None :
+    game = partie(9, "aleatoire", 50)
+    avant = sauvegarde.encoder(game)
+    jouer(game.clone().clone(), POLITIQUES["nord"](9), 60)
+    assert sauvegarde.encoder(game) == avant
+
+
+
+def test_clone_accessibilite () -> None :
+    game = Game(3)
+    jouer(game.clone(), POLITIQUES["nord"](3), 40)
+    x, y = game.joueur.position
+    assert game.accessibilite.composante(x, y) == [(x, y)]
@@ -0,0 +1,69 @@
+from __future__ import annotations
+import random
+from collections import Counter
+
+from src.echantillonnage import ArbreFenwick
+
+
+
+
+def test_sommes_prefixes () -> None :
+    rng = random.Random(1)
+    poids = [rng.choice((0.0, 0.5, 1.0, 3.0)) for _ in range(37)]
+    arbre = ArbreFenwick(poids[:20])
+    for p in poids[20:] :
+        arbre.ajouter(p)
+    arbre.maj(4, 2.5)
+    poids[4] = 2.5
+    for n in range(len(poids) + 1) :
+        assert abs(arbre.somme_prefixe(n) - sum(poids[:n])) < 1e-9
+
+
+
+def test_tirer_sans_remise_distincts () -> None :
+    rng = random.Random(2)
+    arbre = ArbreFenwick([1.0, 0.0, 2.0, 0.5, 0.0, 4.0, 1.0])
+    for _ in range(500) :
+        tires = arbre.tirer_sans_remise(3, rng)
+        assert len(tires) == 3
+        assert len(set(tires)) == 3
+        assert not {1, 4} & set(tires)   # poids nuls jamais tirés
+
+
+
+def test_tirer_sans_remise_tronque () -> None :
+    arbre = ArbreFenwick([0.0, 1.0, 0.0, 1.0])
+    assert sorted(arbre.tirer_sans_remise(3, random.Random(3))) == [1, 3]
+
+
+
+def test_tirer_sans_remise_restaure () -> None :
+    """ Le tirage rend l'arbre exactement tel quel (mêmes sommes partielles, pas d'arrondi accumulé) : il peut être partagé """
+    arbre = ArbreFenwick([0.1, 0.7, 0.2, 1.3, 0.0, 0.9])
+    poids, sommes = list(arbre._poids), list(arbre._arbre)
+    rng = random.Random(4)
+    for _ in range(1000) :
+        arbre.tirer_sans_remise(3, rng)
+    assert arbre._poids == poids
+    assert arbre._arbre == sommes
+
+
+
+def test_premier_tirage_proportionnel () -> None :
+    poids = [1.0, 2.0, 0.0, 5.0]
+    arbre = ArbreFenwick(poids)
+    rng = random.Random(5)
+    n = 40_000
+    premiers = Counter(arbre.tirer_sans_remise(2, rng)[0] for _ in range(n))
+    for i, p in enumerate(poids) :
+        assert abs(premiers[i] / n - p / sum(poids)) < 0.01
+
+
+
+def test_copier_independant () -> None :
+    arbre = ArbreFenwick([1.0, 2.0, 3.0])
+    copie = arbre.copier()
+    copie.maj(0, 10.0)
+    copie.ajouter(1.0)
+    assert arbre.total == 6.0 and len(arbre) == 3
+    assert copie.total == 16.0
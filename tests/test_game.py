@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from src.Game import Game
+from src.Piece import FORME_CROIX, CouleurPiece, Piece
+from src.sim import POLITIQUES
+from tests.outils import intentions, partie
+
+
+
+
+def test_version_avance_a_chaque_action () -> None :
+    game = Game(1)
+    pol = POLITIQUES["aleatoire"](1)
+    n = 0
+    for actions in intentions(game, pol, 300) :
+        version = game.version
+        game.handle_intentions(actions)
+        assert game.version > version
+        n += 1
+    assert n > 0
+
+
+
+def test_version_sans_action () -> None :
+    game = Game(2)
+    version = game.version
+    game.handle_intentions({})
+    assert game.version == version
+
+
+
+def test_version_croissante_apres_nouvelle_partie () -> None :
+    """ Rejouer depuis l'écran de game over rappelle __init__ : la version ne repart pas de zéro """
+    game = partie(3, "aleatoire", 100)
+    version = game.version
+    game.__init__(4)
+    assert game.version > version
+
+
+
+def test_entree_magasin_une_version () -> None :
+    """ Entrer dans un magasin est une seule action : Game.version n'avance que d'une unité """
+    entrees = 0
+    for seed in range(20) :
+        game = Game(seed)
+        for actions in intentions(game, POLITIQUES["aleatoire"](seed), 500) :
+            if game.state == "exploration" and list(actions) == ["deplacer"] :
+                version = game.version
+                game.handle_deplacement(*actions["deplacer"])
+                if game.state == "achat" :
+                    assert game.version == version + 1
+                    entrees += 1
+            else :
+                game.handle_intentions(actions)
+    assert entrees > 0
+
+
+
+def test_sortie_avec_le_dernier_pas () -> None :
+    """ Franchir la porte de la sortie avec exactement un pas restant : victoire, pas game over """
+    game = Game(0)
+    x, _ = game.grille.sortie
+    game.grille.placer_piece(x, 1, Piece("Hall", CouleurPiece.BLEU, FORME_CROIX))
+    game.joueur.position = (x, 1)
+    game.inv.pas = 1
+    game.inv.cles = 5   # de quoi ouvrir la porte nord, quel que soit son niveau
+    game.handle_deplacement(0, -1)
+    assert game.joueur.position == game.grille.sortie
+    assert game.inv.pas == 0
+    assert game.state == "victoire"
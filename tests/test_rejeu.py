@@ -0,0 +1,96 @@
+from __future__ import annotations
+import os
+
+import pytest
+
+from src import rejeu
+from src.rejeu import Journal
+from src.sim import jouer_partie
+from tests.outils import partie
+
+
+
+
+def test_codage_intentions () -> None :
+    exemples = [{"deplacer" : v} for v in rejeu.VECTEURS] + [
+        {"ouvrir" : True}, {"confirmer" : True, "relancer_tirage" : True},
+        {"nav_game_over" : 1}, {"nav_game_over" : -1, "annuler" : True}, {"deplacer" : (0, 1), "creuser" : True},
+    ]
+    for actions in exemples :
+        assert rejeu.decoder_intentions(rejeu.coder_intentions(actions)) == actions
+    with pytest.raises(ValueError) :
+        rejeu.coder_intentions({"deplacer" : (2, 0)})
+    with pytest.raises(ValueError) :
+        rejeu.coder_intentions({"voler" : True})
+
+
+
+@pytest.mark.parametrize("seed, politique", [(0, "aleatoire"), (1, "nord"), (2, "aleatoire"), (3, "nord")])
+def test_rejeu_identique (seed : int, politique : str) -> None :
+    journal = Journal(seed)
+    game = partie(seed, politique, journal=journal)
+    journal.terminer(game)
+    relu = Journal.decoder(journal.encoder())
+    assert list(relu.intentions) == list(journal.intentions)
+    assert rejeu.empreinte(rejeu.rejouer(relu)) == rejeu.empreinte(game)
+    assert rejeu.verifier(relu)
+
+
+
+def test_divergence_detectee () -> None :
+    journal = Journal(5)
+    jouer_partie(5, "aleatoire", journal=journal)
+    journal.intentions.pop()
+    assert not rejeu.verifier(journal)
+    assert not rejeu.verifier(Journal(5))   # sans empreinte
+
+
+
+def test_rejouer_journaux (tmp_path) -> None :
+    for seed in range(6) :
+        journal = Journal(seed)
+        jouer_partie(seed, "nord", journal=journal)
+        rejeu.ecrire_journal(str(tmp_path / f"partie_{seed}{rejeu.EXTENSION}"), journal)
+    with open(tmp_path / f"abime{rejeu.EXTENSION}", "wb") as f :
+        f.write(b"BPJ")
+    bilan = rejeu.rejouer_journaux(rejeu.lister_journaux([str(tmp_path)]), workers=1)
+    assert bilan.journaux == 6
+    assert bilan.divergents == [] and bilan.sans_empreinte == []
+    assert [os.path.basename(c) for c in bilan.illisibles] == [f"abime{rejeu.EXTENSION}"]
+
+
+
+def test_dimensions () -> None :
+    journal = Journal(11, 12, 20)
+    jouer_partie(11, "aleatoire", journal=journal, largeur=12, hauteur=20)
+    relu = Journal.decoder(journal.encoder())
+    assert (relu.largeur, relu.hauteur) == (12, 20)
+    assert rejeu.verifier(relu)
+
+
+
+def test_anciennes_versions () -> None :
+    """ Journaux de version 1 (grille 5 x 9 implicite) et 2 (dimensions sur un octet) : empreinte de sauvegarde version 1 """
+    journal = Journal(12)
+    jouer_partie(12, "nord", journal=journal)
+    empreinte_v1 = rejeu.empreinte(rejeu.rejouer(journal), 1)
+
+    v1 = (rejeu._ENTETE.pack(rejeu.MAGIC, 1, journal.seed, len(journal)) + journal.intentions.tobytes() + empreinte_v1)
+    v2 = (rejeu._ENTETE.pack(rejeu.MAGIC, 2, journal.seed, len(journal)) + rejeu._DIMENSIONS_V2.pack(5, 9)
+          + journal.intentions.tobytes() + empreinte_v1)
+    for donnees, version in ((v1, 1), (v2, 2)) :
+        relu = Journal.decoder(donnees)
+        assert relu.version == version and (relu.largeur, relu.hauteur) == (5, 9)
+        assert rejeu.verifier(relu)
+    assert Journal.decoder(v2).encoder() == v2
+    assert Journal.decoder(v1).encoder() == v2   # réécrit en version 2, même empreinte
+
+
+
+@pytest.mark.parametrize("largeur, hauteur", [(300, 20), (20, 300)])
+def test_grande_grille (largeur : int, hauteur : int) -> None :
+    journal = Journal(11, largeur, hauteur)
+    jouer_partie(11, "aleatoire", journal=journal, largeur=largeur, hauteur=hauteur)
+    relu = Journal.decoder(journal.encoder())
+    assert (relu.largeur, relu.hauteur) == (largeur, hauteur)
+    assert rejeu.verifier(relu)
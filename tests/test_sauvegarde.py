@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import pytest
+
+from src import sauvegarde
+from src.sim import POLITIQUES
+from tests.outils import jouer, partie
+
+
+
+
+def _suite_identique (game, seed : int) -> None :
+    """ La partie relue continue exactement comme l'originale (mêmes intentions, mêmes flux d'aléa) """
+    relue = sauvegarde.decoder(sauvegarde.encoder(game))
+    jouer(game, POLITIQUES["aleatoire"](seed + 1), 60)
+    jouer(relue, POLITIQUES["aleatoire"](seed + 1), 60)
+    assert sauvegarde.encoder(relue) == sauvegarde.encoder(game)
+
+
+
+@pytest.mark.parametrize("seed, politique, n", [(0, "aleatoire", 0), (1, "aleatoire", 40), (2, "nord", 80), (3, "aleatoire", 2000)])
+def test_aller_retour (seed : int, politique : str, n : int) -> None :
+    game = partie(seed, politique, n)
+    donnees = sauvegarde.encoder(game)
+    assert sauvegarde.encoder(sauvegarde.decoder(donnees)) == donnees
+    _suite_identique(game, seed)
+
+
+
+def test_donnees_invalides () -> None :
+    donnees = sauvegarde.encoder(partie(4, n=30))
+    with pytest.raises(ValueError) :
+        sauvegarde.decoder(b"XX" + donnees[2:])
+    with pytest.raises(ValueError) :
+        sauvegarde.decoder(donnees[:2] + bytes([99]) + donnees[3:])
+
+
+
+def test_archive (tmp_path) -> None :
+    sauvegardes = [sauvegarde.encoder(partie(seed, n=20 * seed)) for seed in range(5)]
+    chemin = str(tmp_path / "parties.bpa")
+    sauvegarde.ecrire_archive(chemin, sauvegardes, compresser=False)
+    assert sauvegarde.lire_archive(chemin) == sauvegardes
+
+
+
+@pytest.mark.parametrize("largeur, hauteur", [(3, 4), (12, 20), (255, 6), (50, 90), (300, 20), (20, 300)])
+def test_aller_retour_dimensions (largeur : int, hauteur : int) -> None :
+    game = partie(6, "aleatoire", 150, largeur, hauteur)
+    donnees = sauvegarde.encoder(game)
+    relue = sauvegarde.decoder(donnees)
+    assert (relue.grille.largeur, relue.grille.hauteur) == (largeur, hauteur)
+    assert relue.joueur.position == game.joueur.position
+    assert sauvegarde.encoder(relue) == donnees
+    _suite_identique(game, 6)
+
+
+
+def test_version_1_lisible () -> None :
+    """ Les sauvegardes de version 1 (dimensions et coordonnées sur un octet) restent lisibles """
+    game = partie(7, "nord", 60)
+    ancienne = sauvegarde.encoder(game, 1)
+    assert ancienne[2] == 1
+    assert len(ancienne) < len(sauvegarde.encoder(game))
+    relue = sauvegarde.decoder(ancienne)
+    assert sauvegarde.encoder(relue) == sauvegarde.encoder(game)
+    assert sauvegarde.encoder(relue, 1) == ancienne
+
+
+
+def test_version_1_trop_petite () -> None :
+    with pytest.raises(ValueError) :
+        sauvegarde.encoder(partie(8, n=0, largeur=300, hauteur=20), 1)
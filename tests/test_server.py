@@ -0,0 +1,93 @@
+from __future__ import annotations
+import asyncio
+import json
+
+import pytest
+
+from src.server import Serveur, Session, encoder
+from src.sim import POLITIQUES
+from tests.outils import intentions
+
+
+
+
+def test_premiere_reponse_complete () -> None :
+    session = Session(3)
+    reponse = session.appliquer({})
+    assert reponse["grille"] == [5, 9]
+    for cle in ("modeles", "cases", "etat", "tour", "pos", "msg", "inv", "objets") :
+        assert cle in reponse, cle
+    x, y = session.game.joueur.position
+    assert [y * 5 + x, session.game.grille.ids_cases[y * 5 + x]] in [c[:2] for c in reponse["cases"]]
+
+
+
+def test_reponses_suivantes_differentielles () -> None :
+    session = Session(4)
+    session.appliquer({})
+    assert session.delta() == {}   # rien n'a changé
+    assert session.appliquer({}) == {}
+
+    game = session.game
+    for actions in intentions(game, POLITIQUES["aleatoire"](4), 150) :
+        avant = dict(session._envoye)
+        reponse = session.appliquer(json.loads(json.dumps(actions)))   # listes JSON, comme sur le réseau
+        assert "grille" not in reponse
+        for cle, valeur in reponse.items() :
+            if cle not in ("cases", "modeles") :
+                assert avant.get(cle) != valeur, cle   # une clé n'est renvoyée que si elle a changé
+        assert reponse.get("pos", avant["pos"]) == list(game.joueur.position)
+        assert reponse.get("etat", avant["etat"]) == game.state
+
+
+
+def test_nouvelle_partie () -> None :
+    session = Session(5)
+    session.appliquer({})
+    session.appliquer({"deplacer" : [0, -1]})
+    reponse = session.appliquer({"nouvelle" : {"seed" : 6, "largeur" : 7, "hauteur" : 4}})
+    assert session.game.seed == 6
+    assert reponse["grille"] == [7, 4]
+    assert reponse["tour"] == 0 and "cases" in reponse and "inv" in reponse
+    session.appliquer({"nouvelle" : {"seed" : None}})   # graine au hasard
+    session.appliquer({"nouvelle" : None})
+
+
+
+@pytest.mark.parametrize("message", [
+    {"deplacer" : [2, 0]}, {"voler" : True}, {"deplacer" : 3},
+    {"nouvelle" : {"largeur" : 1}}, {"nouvelle" : {"taille" : 4}}, {"nouvelle" : [5]},
+    {"nouvelle" : {"seed" : [1]}}, {"nouvelle" : {"seed" : {"a" : 1}}}, {"nouvelle" : {"seed" : "3"}}, {"nouvelle" : {"seed" : True}},
+])
+def test_message_refuse (message) -> None :
+    session = Session(7)
+    session.appliquer({})
+    with pytest.raises((ValueError, TypeError)) :
+        session.appliquer(message)
+
+
+
+def test_connexion_reste_ouverte () -> None :
+    """ Un message refusé reçoit {"erreur": ...} et la connexion continue de servir """
+    async def scenario () :
+        serveur = Serveur()
+        tcp = await serveur.demarrer(("tcp", "127.0.0.1", 0))
+        port = tcp.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        reponses = []
+        for ligne in (encoder({"nouvelle" : {"seed" : 8}}), b"pas du json\n", b"[1, 2]\n", encoder({"voler" : True}),
+                      encoder({"deplacer" : [0, -1]})) :
+            writer.write(ligne)
+            await writer.drain()
+            reponses.append(json.loads(await reader.readline()))
+        writer.close()
+        await writer.wait_closed()
+        tcp.close()
+        await tcp.wait_closed()
+        return serveur, reponses
+
+    serveur, reponses = asyncio.run(scenario())
+    assert reponses[0]["grille"] == [5, 9]
+    assert all("erreur" in r for r in reponses[1:4])
+    assert "erreur" not in reponses[4] and reponses[4]["etat"] == "tirage"   # la porte nord de l'entrée mène à un tirage
+    assert serveur.messages == 5
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import pytest
+
+from src.sim import Politique, jouer_partie, main, simuler
+
+
+
+
+def test_aleatoire_termine () -> None :
+    for seed in range(30) :
+        assert jouer_partie(seed, "aleatoire").issue != "abandon", seed
+
+
+
+def test_deterministe () -> None :
+    assert jouer_partie(7, "nord") == jouer_partie(7, "nord")
+    assert jouer_partie(8, "aleatoire") == jouer_partie(8, "aleatoire")
+    assert jouer_partie(9, "aleatoire", largeur=12, hauteur=20) == jouer_partie(9, "aleatoire", largeur=12, hauteur=20)
+
+
+
+def test_independant_du_nombre_de_workers () -> None :
+    seul = simuler(40, seed=100, politique="nord", workers=1, taille_lot=7)
+    pool = simuler(40, seed=100, politique="nord", workers=2, taille_lot=7)
+    assert seul.resume() == pool.resume()
+    assert sum(seul.issues.values()) == 40
+
+
+
+def test_nord_ne_bloque_pas () -> None :
+    """ La politique nord n'ouvre un contenant que si elle le peut : ses parties se terminent toutes """
+    for seed in range(60) :
+        assert jouer_partie(seed, "nord").issue in ("victoire", "game_over"), seed
+    assert simuler(40, seed=100, politique="nord", workers=1).issues.get("abandon", 0) == 0
+
+
+
+def test_politique_abstraite () -> None :
+    with pytest.raises(TypeError) :
+        Politique(0)
+
+
+
+def test_main_sans_partie (capsys) -> None :
+    with pytest.raises(SystemExit) as sortie :
+        main(["-n", "0"])
+    assert sortie.value.code == 2
+    assert "au moins une partie" in capsys.readouterr().err
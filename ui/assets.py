@@ -0,0 +1,177 @@
+from __future__ import annotations
+# ui/assets.py
+# index des images des pièces (un seul parcours du dossier au démarrage) et atlas de textures par taille
+
+import math
+import os
+from typing import Optional
+
+import pygame
+
+
+# orientation -> porte "principale" : image de repli quand il n'existe pas d'image pour l'orientation exacte
+PRINCIPAUX = {
+    "NS": "N",
+    "EO": "E",
+    "NE": "N",
+    "ES": "E",
+    "SO": "S",
+    "ON": "O",
+    "NES": "N",
+    "ESO": "E",
+    "SON": "S",
+    "ONE": "O",
+    "NSEO": "N",
+}
+
+
+
+
+class IndexAssets :
+    """
+    Index des images d'un dossier, construit une fois : nom de base -> orientation -> fichier.
+    "Bedroom_SO.png" est rangé sous ("Bedroom", "SO"), "Bedroom.png" sous ("Bedroom", "").
+
+    Paramètres
+    ----------
+    dossier : str
+        Dossier des images (ex : assets/images_pieces2).
+
+    Attributs
+    ---------
+    dossier : str
+    fichiers : list[str]
+        Noms des fichiers .png trouvés (ordre trié).
+    par_nom : dict[str, dict[str, str]]
+        nom de base -> {orientation : fichier}.
+
+    Méthodes
+    --------
+    fichier(nom_base, orientation) -> str | None
+        Fichier à utiliser : orientation exacte, sinon porte principale, sinon image sans orientation.
+    """
+
+    def __init__(self, dossier : str) -> None :
+        self.dossier = dossier
+        try :
+            fichiers = sorted(f for f in os.listdir(dossier) if f.lower().endswith(".png"))
+        except FileNotFoundError :
+            fichiers = []
+        self.fichiers : list[str] = fichiers
+        self.par_nom : dict[str, dict[str, str]] = {}
+        for f in fichiers :
+            base = f[:-4]
+            nom, _, suffixe = base.rpartition("_")
+            if not nom or not suffixe or not set(suffixe) <= set("NSEO") :   # pas de suffixe d'orientation ("Chamber_of_Mirrors")
+                nom, suffixe = base, ""
+            self.par_nom.setdefault(nom, {})[suffixe] = f
+
+
+
+    def fichier (self, nom_base : str, orientation : str = "") -> Optional[str] :
+        variantes = self.par_nom.get(nom_base)
+        if not variantes :
+            return None
+        if orientation and orientation in variantes :
+            return variantes[orientation]
+        principal = PRINCIPAUX.get(orientation)
+        if principal and principal in variantes :
+            return variantes[principal]
+        return variantes.get("")
+
+
+
+
+class AtlasTextures :
+    """
+    Toutes les images de l'index, mises à une même taille et rangées dans une seule surface.
+    Chaque image est une sous-zone (pygame.Rect) précalculée : un blit avec `area` suffit pour l'afficher.
+
+    Paramètres
+    ----------
+    originaux : dict[str, pygame.Surface]
+        Images décodées (fichier -> surface), chargées une seule fois.
+    taille : int
+        Côté (en pixels) des images dans l'atlas.
+
+    Attributs
+    ---------
+    taille : int
+    surface : pygame.Surface
+        L'atlas.
+    zones : dict[str, pygame.Rect]
+        Fichier -> sous-zone de l'atlas.
+    """
+
+    def __init__(self, originaux : dict[str, pygame.Surface], taille : int) -> None :
+        self.taille = taille
+        n = max(1, len(originaux))
+        colonnes = math.ceil(math.sqrt(n))
+        lignes = math.ceil(n / colonnes)
+        self.surface = pygame.Surface((colonnes * taille, lignes * taille), pygame.SRCALPHA)
+        self.zones : dict[str, pygame.Rect] = {}
+        for k, (fichier, img) in enumerate(originaux.items()) :
+            ligne, colonne = divmod(k, colonnes)
+            if img.get_width() != taille or img.get_height() != taille :
+                img = pygame.transform.smoothscale(img, (taille, taille))
+            zone = pygame.Rect(colonne * taille, ligne * taille, taille, taille)
+            self.surface.blit(img, zone)
+            self.zones[fichier] = zone
+
+
+
+    def blit (self, ecran : pygame.Surface, fichier : str, pos : tuple[int, int]) -> None :
+        ecran.blit(self.surface, pos, self.zones[fichier])
+
+
+
+
+class BanqueImages :
+    """
+    Index + images décodées + un atlas par taille demandée.
+    Le disque n'est lu qu'à la construction : ensuite, afficher une image ne fait aucun appel au système de fichiers.
+
+    Paramètres
+    ----------
+    dossier : str
+        Dossier des images.
+
+    Attributs
+    ---------
+    index : IndexAssets
+    originaux : dict[str, pygame.Surface]
+        Images décodées, à leur taille d'origine.
+    atlas : dict[int, AtlasTextures]
+        Atlas par taille (construit au premier usage d'une taille, à partir des images en mémoire).
+
+    Méthodes
+    --------
+    atlas_taille(taille) -> AtlasTextures
+    dessiner(ecran, nom_base, orientation, pos, taille) -> bool
+        Affiche l'image correspondante ; False s'il n'y en a pas (l'appelant dessine un repli).
+    """
+
+    def __init__(self, dossier : str) -> None :
+        self.index = IndexAssets(dossier)
+        self.originaux : dict[str, pygame.Surface] = {}
+        for f in self.index.fichiers :
+            img = pygame.image.load(os.path.join(dossier, f))
+            self.originaux[f] = img.convert_alpha() if pygame.display.get_surface() is not None else img
+        self.atlas : dict[int, AtlasTextures] = {}
+
+
+
+    def atlas_taille (self, taille : int) -> AtlasTextures :
+        atlas = self.atlas.get(taille)
+        if atlas is None :
+            atlas = self.atlas[taille] = AtlasTextures(self.originaux, taille)
+        return atlas
+
+
+
+    def dessiner (self, ecran : pygame.Surface, nom_base : str, orientation : str, pos : tuple[int, int], taille : int) -> bool :
+        fichier = self.index.fichier(nom_base, orientation)
+        if fichier is None :
+            return False
+        self.atlas_taille(taille).blit(ecran, fichier, pos)
+        return True
@@ -29,25 +29,35 @@ class InputHandler :
     ---------
     _quit : bool
         Indique si le joueur a demandé à quitter le jeu.
+    _chrono_visible : bool
+        Affichage des chronométrages (basculé par F3) ; ce n'est pas une intention de jeu, elle n'est pas transmise à Game.
     """
 
     def __init__(self) -> None:
         self._quit = False
+        self._chrono_visible = False
     
 
     @property
     def quit_requested(self) -> bool :
         """ getter self._quit """
         return self._quit
+
+
+    @property
+    def chrono_visible(self) -> bool :
+        """ getter self._chrono_visible """
+        return self._chrono_visible
     
 
-    def actions (self) -> dict :
+    def actions (self, evenements : list | None = None) -> dict :
         """
         Lit les événements pygame et détermine les intentions du joueur.
 
         Paramètres
         ----------
-        None
+        evenements : list[pygame.event.Event] | None
+            Evénements déjà retirés de la file (boucle événementielle) ; si None, on vide la file.
 
         Returns
         -------
@@ -65,7 +75,10 @@ class InputHandler :
 
         intentions = {}
 
-        for event in pygame.event.get() :
+        if evenements is None :
+            evenements = pygame.event.get()
+
+        for event in evenements :
             
             if event.type == pygame.QUIT :  # on ferme la fenetre
                 self._quit = True
@@ -75,7 +88,10 @@ class InputHandler :
                 
                 touche = event.key
 
-                if touche == pygame.K_ESCAPE:  # sortir
+                if touche == pygame.K_F3:  # affichage des chronométrages (debug)
+                    self._chrono_visible = not self._chrono_visible
+
+                elif touche == pygame.K_ESCAPE:  # sortir
                     intentions['annuler'] = True
 
                 elif touche in (pygame.K_LEFT, pygame.K_RIGHT):
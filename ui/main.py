@@ -1,9 +1,15 @@
 # point d'entrée du programme 
 # boucle principale pygame
 
+import argparse
+import os
 import pygame
+import random
 import sys
+import time
+from src import chrono
 from src.Game import Game
+from src.rejeu import EXTENSION, Journal, ecrire_journal
 from ui.input_handler import InputHandler
 from src.AutreObjet import Pomme, Banane, Gateau, Sandwich, Repas, Coffre, Casier, EndroitCreuser
 from ui.renderer import Renderer
@@ -13,16 +19,41 @@ LARGEUR_ECRAN = 900
 HAUTEUR_ECRAN = 720
 FPS = 60 
 
+# BOUCLE
+MODE_EVENEMENTS = "evenements"   # on dort jusqu'au prochain événement, on ne redessine que si le jeu a changé
+MODE_FIXE = "fixe"               # ancienne boucle : lecture des touches et rendu à FPS fixe
+ATTENTE_MAX_MS = 1000            # réveil périodique du mode événementiel, même sans événement
+ATTENTE_CHRONO_MS = 250          # réveil plus fréquent quand le panneau des chronométrages est affiché (F3)
+EVENEMENTS_REAFFICHAGE = tuple(
+    getattr(pygame, nom) for nom in ("VIDEOEXPOSE", "VIDEORESIZE", "WINDOWEXPOSED", "WINDOWRESTORED") if hasattr(pygame, nom)
+)
 
+# JOURNAL DE SESSION (graine + intentions, à rejouer avec python -m src.rejeu)
+DOSSIER_JOURNAUX = "journaux"
 
-def main() :
+
+
+def main(mode : str = MODE_EVENEMENTS, fps : int = FPS, seed = None, chemin_journal = None, chemin_chrono = None,
+         largeur : int = 5, hauteur : int = 9) :
     """
     Fonction principale du jeu.
     Initialise pygame, crée les objets principaux et lance la boucle de jeu.
 
     Paramètres
     ----------
-    None
+    mode : str
+        MODE_EVENEMENTS (défaut) : attente bloquante des événements, rendu seulement quand game.version change.
+        MODE_FIXE : lecture et rendu à chaque frame, cadencés à fps.
+    fps : int
+        Cadence du mode fixe.
+    seed : int | None
+        Graine de la partie (tirée au hasard si None).
+    chemin_journal : str | None
+        Fichier où écrire le journal de la session en quittant (pas de journal si None).
+    chemin_chrono : str | None
+        Fichier CSV où exporter les chronométrages en quittant (cf. src.chrono ; pas d'export si None).
+    largeur, hauteur : int
+        Dimensions du manoir (la taille des cases à l'écran s'adapte, cf. ui.renderer.taille_case).
 
     Returns
     -------
@@ -33,9 +64,12 @@ def main() :
     pygame.display.set_caption('BluePrince')  # caption pour l'écran
 
     clock = pygame.time.Clock()
-    game = Game()
+    game = Game(seed, largeur, hauteur)
+    journal = Journal(game.seed, largeur, hauteur) if chemin_journal else None
     input_handler = InputHandler()
     renderer = Renderer()
+    version_affichee = None
+    chrono.activer()   # séries frame / entrees / jeu / rendu / affichage, et jeu.handle_* (cf. Game.modifie_etat)
     
 
     # --------------- BOUCLE DE JEU ---------------
@@ -43,81 +77,96 @@ def main() :
     running = True
 
     while running :
-        
-        actions = input_handler.actions()
+
+        if mode == MODE_EVENEMENTS :
+            # le jeu ne change que sur une touche : on dort jusqu'au prochain événement
+            premier = pygame.event.wait(ATTENTE_CHRONO_MS if renderer.afficher_chrono else ATTENTE_MAX_MS)
+            debut_frame = chrono.maintenant()   # l'attente ne compte pas dans la frame
+            evenements = [] if premier.type == pygame.NOEVENT else [premier]
+            evenements.extend(pygame.event.get())
+            if any(e.type in EVENEMENTS_REAFFICHAGE for e in evenements) :
+                renderer.invalider()
+                version_affichee = None
+            actions = input_handler.actions(evenements)
+        else :
+            debut_frame = chrono.maintenant()
+            actions = input_handler.actions()
+        fin_entrees = chrono.maintenant()
+        chrono.enregistrer("entrees", fin_entrees - debut_frame)
 
         # SORTIE DU JEU
         if input_handler.quit_requested :  
             running = False
             break
         
-        # GAME OVER 
-        if game.state == "game_over":
-            if 'nav_game_over' in actions:
-                game.handle_navigation_game_over(actions['nav_game_over'])
-            if actions.get('confirmer'):
-                game.handle_confirmation_game_over()
-        else :
-            
-            
-            # EXECUTER LES ACTIONS DEMANDEES
-
-            if game.state == "exploration" :
-
-                if "deplacer" in actions :
-                    dx, dy = actions["deplacer"]
-                    game.handle_deplacement(dx, dy)
-
-                if "ouvrir" in actions:
-                    game.handle_ouvrir_sur_piece_courante()
-                    
-                if "creuser" in actions :
-                    game.handle_ouvrir_sur_piece_courante()
-
-            
-            if game.state == "tirage" :
-                if "deplacer" in actions :
-                    dx, dy = actions["deplacer"]
-                    
-                    if dx == -1 :  # gauche
-                        game.handle_choix_tirage(-1)
-
-                    if dx == 1 :  # droite
-                        game.handle_choix_tirage(1)
-
-                if 'confirmer' in actions :
-                    game.handle_confirmation_tirage()
-
-                if 'relancer_tirage' in actions :
-                    game.handle_re_tirage()
-
-                if 'annuler' in actions :
-                    pass
-            
-
-            elif game.state == "achat":
-                
-
-                # ENTER : acheter l'offre sélectionnée
-                if "confirmer" in actions or "ouvrir" in actions:
-                    game.handle_confirmation_magasin()
-
-                # ESC : quitter le magasin
-                if "annuler" in actions:
-                    # on revient à l'exploration
-                    game.handle_quitter_magasin()
-                elif "deplacer" in actions:
-                    dx, dy = actions["deplacer"]
-                    if dx != 0 or dy !=0:
-                        game.handle_navigation_magasin(dx)
-
-        # affichage
-        renderer.render(ecran, game)
-        pygame.display.flip()  # on eneregistre les changememts
-        clock.tick(FPS)   
+        # EXECUTER LES ACTIONS DEMANDEES
+        if journal is not None :
+            journal.enregistrer(actions)
+        game.handle_intentions(actions)
+        chrono.enregistrer("jeu", chrono.maintenant() - fin_entrees)
+
+        renderer.afficher_chrono = input_handler.chrono_visible
+
+        # affichage : seulement si le jeu a changé (mode événementiel), et seulement les zones modifiées
+        # (le panneau des chronométrages, s'il est affiché, est rafraîchi à chaque réveil)
+        if mode == MODE_FIXE or game.version != version_affichee or renderer.afficher_chrono or renderer.chrono_a_effacer() :
+            version_affichee = game.version
+            debut_rendu = chrono.maintenant()
+            zones = renderer.render(ecran, game)
+            fin_rendu = chrono.maintenant()
+            chrono.enregistrer("rendu", fin_rendu - debut_rendu)
+            if zones :
+                pygame.display.update(zones)
+            chrono.enregistrer("affichage", chrono.maintenant() - fin_rendu)
+
+        chrono.enregistrer("frame", chrono.maintenant() - debut_frame)
+
+        if mode == MODE_FIXE :
+            clock.tick(fps)   
     
     pygame.quit()
 
+    if journal is not None :
+        journal.terminer(game)
+        ecrire_journal(chemin_journal, journal)
+        print(f"journal de la session : {chemin_journal}")
+
+    if chemin_chrono :
+        dossier = os.path.dirname(chemin_chrono)
+        if dossier :
+            os.makedirs(dossier, exist_ok=True)
+        chrono.exporter_csv(chemin_chrono)
+        print(f"chronométrages : {chemin_chrono}")
+
+
+
+
+def lire_arguments(argv = None) -> argparse.Namespace :
+    parser = argparse.ArgumentParser(prog="python -m ui.main", description="BluePrince")
+    parser.add_argument("--mode", choices=(MODE_EVENEMENTS, MODE_FIXE), default=MODE_EVENEMENTS,
+                        help="boucle pilotée par les événements (défaut) ou à cadence fixe")
+    parser.add_argument("--fps", type=int, default=FPS, help="cadence du mode fixe")
+    parser.add_argument("--seed", type=int, default=None, help="graine de la partie (au hasard par défaut)")
+    parser.add_argument("--largeur", type=int, default=5, help="largeur du manoir")
+    parser.add_argument("--hauteur", type=int, default=9, help="hauteur du manoir")
+    parser.add_argument("--journal", default=None,
+                        help=f"fichier du journal de session (défaut : {DOSSIER_JOURNAUX}/session_<date>_<graine>{EXTENSION})")
+    parser.add_argument("--sans-journal", action="store_true", help="ne pas enregistrer la session")
+    parser.add_argument("--chrono-csv", default=None,
+                        help=f"CSV des chronométrages écrit en quittant (défaut : {DOSSIER_JOURNAUX}/chrono_<date>.csv, \"\" : pas d'export)")
+    return parser.parse_args(argv)
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = lire_arguments()
+    chemin_journal = None
+    if not args.sans_journal :
+        chemin_journal = args.journal
+        if chemin_journal is None :
+            if args.seed is None :
+                args.seed = random.getrandbits(32)   # comme Game : on la tire ici pour la mettre dans le nom du fichier
+            chemin_journal = os.path.join(DOSSIER_JOURNAUX, f"session_{time.strftime('%Y%m%d-%H%M%S')}_{args.seed}{EXTENSION}")
+    chemin_chrono = args.chrono_csv
+    if chemin_chrono is None :
+        chemin_chrono = os.path.join(DOSSIER_JOURNAUX, f"chrono_{time.strftime('%Y%m%d-%H%M%S')}.csv")
+    main(args.mode, args.fps, args.seed, chemin_journal, chemin_chrono or None, args.largeur, args.hauteur)
@@ -1,17 +1,27 @@
 from __future__ import annotations
 # ui/renderer.py
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from src.Game import Game
 
 import os
 import pygame
-
-CELL = 64  # taille d'une case de la grille
+from src import chrono
+from src.trace import canal
+from ui.assets import BanqueImages
+from ui.textes import CacheTextes
+
+CELL = 64  # taille maximale d'une case de la grille (celle de la grille 5 x 9)
+CELL_MIN = 4             # en dessous, la grille déborde de l'écran
+CELL_TEXTE_PORTES = 32   # plus petit que cela, le niveau des portes et le nom des pièces sans image ne sont pas écrits
+LARGEUR_PANNEAU_MIN = 400   # place gardée à droite de la grille pour les panneaux de tirage et de magasin
 OFFSET_X = 20
 OFFSET_Y = 120
+HAUTEUR_HUD = 110
+COULEUR_FOND = (10, 10, 15)
+ETATS_PANNEAU = ("tirage", "achat")   # panneaux à droite de la grille : redessinés seuls
 ORIENTATION = {
     "couloir_ns": "NS",
     "couloir_eo": "EO",
@@ -34,6 +44,25 @@ ORIENTATION = {
     "t_one": "ONE",
 }
 
+TRACE_RENDU = canal("rendu")
+
+# panneau des chronométrages (F3), en bas à droite de l'écran
+SERIES_BOUCLE = ("frame", "entrees", "jeu", "rendu", "affichage")   # cf. ui.main
+N_HANDLERS_AFFICHES = 3   # séries "jeu.handle_*" les plus lentes (p99) ajoutées au panneau
+LARGEUR_CHRONO = 430
+LIGNE_CHRONO = 16
+LARGEUR_CLASSE = 5        # largeur d'une barre d'histogramme
+
+
+
+
+def taille_case(largeur: int, hauteur: int, largeur_ecran: int, hauteur_ecran: int) -> int:
+    """ Plus grande taille de case (au plus CELL) pour que la grille tienne sous le HUD, à gauche des panneaux """
+    place_x = (largeur_ecran - OFFSET_X - 40 - LARGEUR_PANNEAU_MIN) // largeur
+    place_y = (hauteur_ecran - OFFSET_Y - 20) // hauteur
+    return max(CELL_MIN, min(CELL, place_x, place_y))
+
+
 
 
 class Renderer :
@@ -48,19 +77,42 @@ class Renderer :
         Police pour le texte standard.
     small : pygame.font.Font
         Police pour le texte petit.
-    images_cache : dict[tuple[str, int], pygame.Surface]
-        Cache d'images pour éviter de recharger les images à chaque frame.
     dir_images : str
         Répertoire contenant les images des pièces.
+    textes : CacheTextes
+        Cache LRU des surfaces de texte (HUD, niveaux des portes, écrans en overlay).
+    images : BanqueImages
+        Index des images (dossier parcouru une fois au démarrage) et atlas de textures par taille.
+    _fichiers_pieces : dict[tuple[str, str], str | None]
+        (nom de la pièce, nom de la forme) -> fichier image résolu (None : pas d'image, repli texte).
+    cell : int
+        Taille d'une case à l'écran, choisie pour que la grille tienne (cf. taille_case).
+    _fond_grille : pygame.Surface | None
+        Rendu en cache des cases de la grille (pièces + portes, sans le joueur).
+    _revision : int | None
+        Grille.revision au moment où _fond_grille a été mis à jour (None : tout est à dessiner).
+    _grille, _ecran : objets affichés à la dernière frame (un changement force un rendu complet).
+    _cle_hud, _cle_overlay, _etat, _pos_joueur :
+        Ce qui a été affiché à la dernière frame, pour ne redessiner que ce qui a changé.
+    afficher_chrono : bool
+        Panneau des chronométrages (src.chrono) dessiné par-dessus l'écran, à chaque frame.
+    _textes_chrono : CacheTextes
+        Cache à part pour les textes du panneau, qui changent à chaque frame (ils n'évincent pas ceux du jeu).
+    _chrono_affiche : bool
+        Le panneau était affiché à la dernière frame (le masquer demande un rendu complet).
     
     Méthodes
     -------
-    render -> None
-        Point d'entrée pour dessiner l'écran de jeu.
+    render -> list[pygame.Rect]
+        Point d'entrée : dessine ce qui a changé et renvoie les zones à mettre à jour.
+    invalider -> None
+        Force un rendu complet à la prochaine frame.
+    chrono_a_effacer -> bool
+        Indique que le panneau des chronométrages vient d'être masqué.
     render_hud -> None
         Dessine le HUD en haut de l'écran.
-    render_grille -> None 
-        Dessine la grille de jeu et les éléments.
+    render_grille -> list[pygame.Rect]
+        Met à jour les cases modifiées de la grille et le joueur.
     render_ecran_tirage -> None  
         Affiche l'écran de tirage des pièces.
     render_magasin -> None 
@@ -69,6 +121,8 @@ class Renderer :
         Affiche l'écran de fin de jeu.
     render_victoire -> None  
         affiche l'écran de victoire.
+    render_chrono -> pygame.Rect
+        Dessine le panneau des chronométrages (histogrammes glissants).
     """
 
     def __init__(self) -> None:
@@ -76,17 +130,37 @@ class Renderer :
         self.font_title = pygame.font.SysFont("Arial", 22, bold=True)
         self.font = pygame.font.SysFont("Arial", 18)
         self.small = pygame.font.SysFont("Arial", 14)
+        self.textes = CacheTextes()
 
-        # cache d'images pour ne pas recharger à chaque frame
-        self.images_cache: dict[tuple[str, int], pygame.Surface] = {}
+        # images lues une seule fois : aucun accès disque pendant le rendu
         self.dir_images = os.path.join("assets", "images_pieces2")
+        self.images = BanqueImages(self.dir_images)
+        self._fichiers_pieces : dict[tuple[str, str], str | None] = {}
 
+        # régions sales : état de la dernière frame affichée
+        self.cell = CELL
+        self._fond_grille : Optional[pygame.Surface] = None
+        self._revision : Optional[int] = None
+        self._grille = None
+        self._ecran : Optional[pygame.Surface] = None
+        self._cle_hud = None
+        self._cle_overlay = None
+        self._etat : Optional[str] = None
+        self._pos_joueur : Optional[tuple[int, int]] = None
 
+        self.afficher_chrono = False
+        self._textes_chrono = CacheTextes(capacite=128)
+        self._chrono_affiche = False
 
 
-    def render(self, ecran: pygame.Surface, game: "Game") -> None:
+
+
+    def render(self, ecran: pygame.Surface, game: "Game") -> list[pygame.Rect]:
         """
         Point d'entrée pour dessiner l'écran de jeu.
+        Seules les zones qui ont changé depuis la frame précédente sont redessinées : HUD si son contenu a changé,
+        cases de la grille dont la révision a bougé, cases quittée/atteinte par le joueur, panneau de tirage/magasin.
+        Un changement d'état (ouverture/fermeture d'un écran), de grille (nouvelle partie) ou d'écran force un rendu complet.
 
         Paramètres
         ----------
@@ -97,19 +171,73 @@ class Renderer :
 
         Returns
         -------
-        None
+        list[pygame.Rect]
+            Zones de l'écran modifiées, à passer à pygame.display.update (vide si rien n'a changé).
         """
 
-        # fond global
-        ecran.fill((10, 10, 15))
+        cle_hud = self._cle_render_hud(game)
+        cle_overlay = self._cle_render_overlay(game)
+        complet = (
+            ecran is not self._ecran
+            or game.grille is not self._grille
+            or game.state != self._etat
+            or (cle_overlay != self._cle_overlay and game.state not in ETATS_PANNEAU)   # écrans plein écran
+            or self.chrono_a_effacer()
+        )
+        self._chrono_affiche = self.afficher_chrono
+
+        if complet :
+            self._ecran = ecran
+            self._etat = game.state
+            self._pos_joueur = None
+            ecran.fill(COULEUR_FOND)
+            self.render_hud(ecran, game)
+            self.render_grille(ecran, game, complet=True)
+            self._render_overlay(ecran, game)
+            self._cle_hud = cle_hud
+            self._cle_overlay = cle_overlay
+            if self.afficher_chrono :
+                self.render_chrono(ecran)
+            return [ecran.get_rect()]
+
+        zones : list[pygame.Rect] = []
+
+        if cle_hud != self._cle_hud :
+            self._cle_hud = cle_hud
+            self.render_hud(ecran, game)
+            zones.append(pygame.Rect(0, 0, ecran.get_width(), HAUTEUR_HUD))
+
+        zones.extend(self.render_grille(ecran, game))
+
+        if cle_overlay != self._cle_overlay :   # panneau de tirage ou de magasin : il couvre sa propre zone
+            self._cle_overlay = cle_overlay
+            self._render_overlay(ecran, game)
+            zones.append(self._rect_panneau(ecran, game))
+
+        if self.afficher_chrono :
+            zones.append(self.render_chrono(ecran))
+
+        return zones
+
+
+
+
+    def chrono_a_effacer(self) -> bool:
+        """ Le panneau des chronométrages vient d'être masqué : il faut un rendu (complet) pour l'effacer """
+        return self._chrono_affiche and not self.afficher_chrono
 
-        # HUD en haut
-        self.render_hud(ecran, game)
 
-        # grille + joueur
-        self.render_grille(ecran, game)
 
-        # écrans en overlay selon l'état
+
+    def invalider(self) -> None:
+        """ Force un rendu complet à la prochaine frame (ex : fenêtre redimensionnée ou réexposée) """
+        self._ecran = None
+
+
+
+
+    def _render_overlay(self, ecran: pygame.Surface, game: "Game") -> None:
+        """ écrans en overlay selon l'état """
         if game.state == "tirage":
             self.render_ecran_tirage(ecran, game)
         elif game.state == "achat":
@@ -121,6 +249,45 @@ class Renderer :
 
 
 
+
+    def _cle_render_hud(self, game: "Game") -> tuple:
+        """ Tout ce qu'affiche le HUD : s'il est inchangé, le HUD n'est pas redessiné """
+        inv = game.inv
+        x, y = game.joueur.position
+        piece = game.grille.get_piece(x, y)
+        return (
+            inv.pas, inv.piecesOr, inv.gemmes, inv.cles, inv.des,
+            frozenset(inv.noms_objets_permanents), tuple(getattr(o, "nom", None) for o in inv.autres_objets),
+            None if piece is None else piece.nom, x, y, game.state, game.last_message,
+        )
+
+
+
+
+    def _cle_render_overlay(self, game: "Game") -> tuple | None:
+        """ Contenu de l'écran en overlay (None hors tirage/achat/fin de partie) """
+        if game.state == "tirage" and game.tirage_en_cours:
+            data = game.tirage_en_cours
+            return ("tirage", id(data), tuple(id(p) for p in data["pieces"]), data["index"])
+        if game.state == "achat" and game.contexte_achat:
+            ctx = game.contexte_achat
+            return ("achat", id(ctx), ctx.get("index", 0))
+        if game.state == "game_over":
+            return ("game_over", getattr(game, "game_over_selection", 0), game.last_message)
+        if game.state == "victoire":
+            return ("victoire",)
+        return None
+
+
+
+
+    def _rect_panneau(self, ecran: pygame.Surface, game: "Game") -> pygame.Rect:
+        """ Zone du panneau de tirage / magasin (à droite de la grille) """
+        panneau_x = OFFSET_X + game.grille.largeur * self.cell + 20
+        return pygame.Rect(panneau_x, OFFSET_Y, ecran.get_width() - panneau_x - 20, ecran.get_height() - OFFSET_Y - 20)
+
+
+
    
     def render_hud(self, ecran: pygame.Surface, game: "Game") -> None:
         """
@@ -149,10 +316,10 @@ class Renderer :
         piece = game.grille.get_piece(x, y)
 
         # fond du HUD
-        pygame.draw.rect(ecran, (25, 25, 35), (0, 0, ecran.get_width(), 110))
+        pygame.draw.rect(ecran, (25, 25, 35), (0, 0, ecran.get_width(), HAUTEUR_HUD))
 
         # titre
-        titre = self.font_title.render("Blue Prince", True, (240, 240, 240))
+        titre = self.textes.rendre(self.font_title, "Blue Prince", (240, 240, 240))
         ecran.blit(titre, (15, 8))
 
         # inventaire de base
@@ -166,7 +333,7 @@ class Renderer :
             f"Pas: {inv.pas}   Or: {inv.piecesOr}   Gemmes: {inv.gemmes}   "
             f"Clés: {inv.cles}   Dés: {inv.des}"
         )
-        surf = self.font.render(txt, True, (230, 230, 230))
+        surf = self.textes.rendre(self.font, txt, (230, 230, 230))
         ecran.blit(surf, (15, 40))
 
         # objets permanents
@@ -183,7 +350,7 @@ class Renderer :
                 txt_perm = "Objets permanents: (aucun)"
         else:
             txt_perm = "Objets permanents: (aucun)"
-        ecran.blit(self.small.render(txt_perm, True, (200, 200, 200)), (15, y_perm))
+        ecran.blit(self.textes.rendre(self.small, txt_perm, (200, 200, 200)), (15, y_perm))
 
         # autres objets (pomme, etc.)
         y_autres = y_perm + 18
@@ -202,7 +369,7 @@ class Renderer :
             txt_autres = "Objets: " + ", ".join(noms)
         else:
             txt_autres = "Objets: (aucun)"
-        ecran.blit(self.small.render(txt_autres, True, (200, 200, 200)), (15, y_autres))
+        ecran.blit(self.textes.rendre(self.small, txt_autres, (200, 200, 200)), (15, y_autres))
 
         # pièce actuelle
         if piece is not None:
@@ -210,21 +377,23 @@ class Renderer :
             txt_piece = f"Pièce actuelle : {nom_piece}  (x={x}, y={y})"
         else:
             txt_piece = f"Aucune pièce (x={x}, y={y})"
-        ecran.blit(self.small.render(txt_piece, True, (180, 220, 255)), (400, 40))
+        ecran.blit(self.textes.rendre(self.small, txt_piece, (180, 220, 255)), (400, 40))
 
         # état du jeu
-        ecran.blit(self.small.render(f"État: {game.state}", True, (240, 180, 120)), (400, 60))
+        ecran.blit(self.textes.rendre(self.small, f"État: {game.state}", (240, 180, 120)), (400, 60))
 
         # message temporaire  
         if getattr(game, "last_message", ""):  
-            ecran.blit(self.small.render(game.last_message, True, (255, 255, 200)), (400, 80))  
+            ecran.blit(self.textes.rendre(self.small, game.last_message, (255, 255, 200)), (400, 80))  
 
 
 
 
-    def render_grille(self, ecran: pygame.Surface, game: "Game") -> None:
+    def render_grille(self, ecran: pygame.Surface, game: "Game", complet: bool = False) -> list[pygame.Rect]:
         """
         Dessine la grille de jeu et les éléments.
+        Les cases sont dessinées dans une surface de fond en cache, redessinées seulement quand leur révision
+        (Grille.revisions) change ; le joueur est dessiné par-dessus, directement sur l'écran.
 
         Paramètres
         ----------
@@ -232,43 +401,109 @@ class Renderer :
             Surface pygame où dessiner la grille.
         game : Game
             Instance du jeu.
+        complet : bool
+            Recopie toute la grille sur l'écran (sinon seulement les cases modifiées).
 
         Returns
         -------
-        None
+        list[pygame.Rect]
+            Zones de l'écran modifiées.
         """
 
         grille = game.grille
-        sortie_x, sortie_y = grille.sortie 
+        L = grille.largeur
+        a_recopier = set(self._maj_fond_grille(grille, ecran))
+        cell = self.cell
+        if complet:
+            a_recopier = set(range(L * grille.hauteur))
+
+        # le joueur a bougé : sa case de départ doit être effacée, sa case d'arrivée redessinée
+        jx, jy = game.joueur.position
+        if self._pos_joueur != (jx, jy):
+            if self._pos_joueur is not None:
+                ax, ay = self._pos_joueur
+                a_recopier.add(ay * L + ax)
+            self._pos_joueur = (jx, jy)
+            a_recopier.add(jy * L + jx)
+
+        if not a_recopier:
+            return []
+
+        zones: list[pygame.Rect] = []
+        if complet:
+            ecran.blit(self._fond_grille, (OFFSET_X, OFFSET_Y))
+            zones.append(pygame.Rect(OFFSET_X, OFFSET_Y, L * cell, grille.hauteur * cell))
+        else:
+            for i in a_recopier:
+                gy, gx = divmod(i, L)
+                zone = pygame.Rect(gx * cell, gy * cell, cell, cell)
+                ecran.blit(self._fond_grille, (OFFSET_X + zone.x, OFFSET_Y + zone.y), zone)
+                zones.append(zone.move(OFFSET_X, OFFSET_Y))
 
-        for gy in range(grille.hauteur):
-            for gx in range(grille.largeur):
-                px = OFFSET_X + gx * CELL
-                py = OFFSET_Y + gy * CELL
+        # dessiner le joueur par-dessus tout
+        jpx = OFFSET_X + jx * cell + cell // 2
+        jpy = OFFSET_Y + jy * cell + cell // 2
+        pygame.draw.circle(ecran, (245, 245, 245), (jpx, jpy), max(2, cell // 6))
+        return zones
 
-                # fond de case
-                pygame.draw.rect(ecran, (25, 28, 45), (px, py, CELL, CELL))
-                pygame.draw.rect(ecran, (50, 50, 70), (px, py, CELL, CELL), 1)
 
-                piece = grille.get_piece(gx, gy)
 
-                if gx == 2 and gy == 8 :
-                    self._render_entrance(ecran, px, py)
 
-                if gx == sortie_x and gy == sortie_y:
-                    self._render_antechamber(ecran, px, py)
+    def _maj_fond_grille(self, grille, ecran: pygame.Surface) -> list[int]:
+        """
+        Redessine dans le fond en cache les cases modifiées depuis la dernière mise à jour
+        (journal de la grille : le travail ne dépend pas de la taille de la grille).
+        Une nouvelle grille fixe la taille des cases (taille_case) et est dessinée en entier.
 
-                if piece is not None:
-                    self._render_piece_image(ecran, piece, px, py)
-                # portes par-dessus
-                portes_case = grille.dict_portes(gx, gy)
-                self._render_portes_case(ecran, px, py, CELL, portes_case)
+        Returns
+        -------
+        list[int]
+            Indices (y * largeur + x) des cases redessinées.
+        """
+        if self._fond_grille is None or grille is not self._grille:
+            self._grille = grille
+            self.cell = taille_case(grille.largeur, grille.hauteur, ecran.get_width(), ecran.get_height())
+            self._fond_grille = pygame.Surface((grille.largeur * self.cell, grille.hauteur * self.cell))
+            self._revision = None
 
-        # dessiner le joueur par-dessus tout
-        jx, jy = game.joueur.position
-        jpx = OFFSET_X + jx * CELL + CELL // 2
-        jpy = OFFSET_Y + jy * CELL + CELL // 2
-        pygame.draw.circle(ecran, (245, 245, 245), (jpx, jpy), CELL // 6)
+        if self._revision == grille.revision:
+            return []
+        modifiees = None if self._revision is None else grille.cases_modifiees_depuis(self._revision)
+        if modifiees is None:
+            modifiees = range(grille.largeur * grille.hauteur)
+
+        L = grille.largeur
+        cell = self.cell
+        for i in modifiees:
+            gy, gx = divmod(i, L)
+            self._dessiner_case(self._fond_grille, grille, gx, gy, gx * cell, gy * cell)
+        self._revision = grille.revision
+        return list(modifiees)
+
+
+
+
+    def _dessiner_case(self, surface: pygame.Surface, grille, gx: int, gy: int, px: int, py: int) -> None:
+        """ Fond, pièce et portes de la case (gx, gy), en (px, py) sur surface """
+        cell = self.cell
+
+        # fond de case
+        pygame.draw.rect(surface, (25, 28, 45), (px, py, cell, cell))
+        pygame.draw.rect(surface, (50, 50, 70), (px, py, cell, cell), 1)
+
+        piece = grille.get_piece(gx, gy)
+
+        if (gx, gy) == grille.entree :
+            self._render_entrance(surface, px, py)
+
+        if (gx, gy) == grille.sortie:
+            self._render_antechamber(surface, px, py)
+
+        if piece is not None:
+            self._render_piece_image(surface, piece, px, py)
+        # portes par-dessus
+        portes_case = grille.dict_portes(gx, gy)
+        self._render_portes_case(surface, px, py, cell, portes_case)
 
 
 
@@ -289,20 +524,12 @@ class Renderer :
         -------
         None
         """
-        filename = "Entrance.png"
-        path = os.path.join(self.dir_images, filename)
-
-        if os.path.exists(path):
-            key = (filename, CELL)
-            if key not in self.images_cache:
-                img = pygame.image.load(path).convert_alpha()
-                img = pygame.transform.smoothscale(img, (CELL, CELL))
-                self.images_cache[key] = img
-            ecran.blit(self.images_cache[key], (px, py))
-        else:
+        cell = self.cell
+        if not self.images.dessiner(ecran, "Entrance", "", (px, py), cell):
             # fallback si jamais le fichier n'existe pas
-            pygame.draw.rect(ecran, (180, 150, 60), (px + 2, py + 2, CELL - 4, CELL - 4))
-            ecran.blit(self.small.render("ENTRANCE", True, (0, 0, 0)), (px + 4, py + 4))
+            pygame.draw.rect(ecran, (180, 150, 60), (px + 2, py + 2, cell - 4, cell - 4))
+            if cell >= CELL_TEXTE_PORTES:
+                ecran.blit(self.textes.rendre(self.small, "ENTRANCE", (0, 0, 0)), (px + 4, py + 4))
 
 
 
@@ -324,40 +551,13 @@ class Renderer :
         None
         """
 
-        filename = "Antechamber.png"
-        path = os.path.join(self.dir_images, filename)
-
-        if os.path.exists(path):
-            key = (filename, CELL)
-            if key not in self.images_cache:
-                img = pygame.image.load(path).convert_alpha()
-                img = pygame.transform.smoothscale(img, (CELL, CELL))
-                self.images_cache[key] = img
-            ecran.blit(self.images_cache[key], (px, py))
-        else:
+        cell = self.cell
+        if not self.images.dessiner(ecran, "Antechamber", "", (px, py), cell):
             # fallback si jamais le fichier n'existe pas
-            pygame.draw.rect(ecran, (180, 150, 60), (px + 2, py + 2, CELL - 4, CELL - 4))
-            ecran.blit(self.small.render("ENTRACNCE", True, (0, 0, 0)), (px + 4, py + 4))
-
-
-
-
-    def _get_piece_image(self, nom_piece: str, size: int) -> pygame.Surface | None :
+            pygame.draw.rect(ecran, (180, 150, 60), (px + 2, py + 2, cell - 4, cell - 4))
+            if cell >= CELL_TEXTE_PORTES:
+                ecran.blit(self.textes.rendre(self.small, "ENTRACNCE", (0, 0, 0)), (px + 4, py + 4))
 
-        filename = nom_piece.replace(" ", "_") + ".png"
-        path = os.path.join(self.dir_images, filename)
-
-        if not os.path.exists(path):
-            return None
-
-        key = (filename, size)
-        if key not in self.images_cache:
-            img = pygame.image.load(path).convert_alpha()
-            if img.get_width() != size or img.get_height() != size:
-                img = pygame.transform.smoothscale(img, (size, size))
-            self.images_cache[key] = img
-        return self.images_cache[key]
-        
 
 
 
@@ -397,54 +597,26 @@ class Renderer :
 
 
  
-    def _get_piece_image_oriente(self, piece, size: int) -> pygame.Surface | None:
-        nom_base = piece.nom.replace(" ", "_")
-        suffix_logique = self._orientation_piece(piece)  
-        suffix_fichier = self._map_suffix_to_image(suffix_logique)  
-
-        candidats: list[str] = []
-        if suffix_fichier:
-            candidats.append(f"{nom_base}_{suffix_fichier}.png")
-
-        if len(suffix_fichier) > 1:
-            principaux = {
-                "NS": "N",
-                "EO": "E",
-                "NE": "N",
-                "ES": "E",
-                "SO": "S",
-                "ON": "O",
-                "NES": "N",
-                "ESO": "E",
-                "SON": "S",
-                "ONE": "O",
-                "NSEO": "N",
-            }
-            card = principaux.get(suffix_fichier)
-            if card:
-                candidats.append(f"{nom_base}_{card}.png")
-
-        candidats.append(f"{nom_base}.png")
-
-        filename_choisi = None
-        for fname in candidats:
-            path = os.path.join(self.dir_images, fname)
-            if os.path.exists(path):
-                filename_choisi = fname
-                break
-
-        if filename_choisi is None:
-            return None
-
-        key = (filename_choisi, size)
-        if key not in self.images_cache:
-            # debug
-            print(f"{key}")
-            img = pygame.image.load(os.path.join(self.dir_images, filename_choisi)).convert_alpha()
-            if img.get_width() != size or img.get_height() != size:
-                img = pygame.transform.smoothscale(img, (size, size))
-            self.images_cache[key] = img
-        return self.images_cache[key]
+    def _fichier_piece(self, piece) -> str | None:
+        """ Fichier image d'une pièce orientée, résolu une fois par (nom, forme) dans l'index """
+        cle = (piece.nom, piece.forme.nom)
+        if cle not in self._fichiers_pieces:
+            nom_base = piece.nom.replace(" ", "_")
+            suffixe = self._map_suffix_to_image(self._orientation_piece(piece))
+            self._fichiers_pieces[cle] = self.images.index.fichier(nom_base, suffixe)
+            TRACE_RENDU.debug("image de %s (%s) : %s", piece.nom, piece.forme.nom, self._fichiers_pieces[cle])
+        return self._fichiers_pieces[cle]
+
+
+
+
+    def _dessiner_piece_orientee(self, ecran: pygame.Surface, piece, pos: tuple[int, int], size: int) -> bool:
+        """ Blit de l'image orientée depuis l'atlas de cette taille ; False si la pièce n'a pas d'image """
+        fichier = self._fichier_piece(piece)
+        if fichier is None:
+            return False
+        self.images.atlas_taille(size).blit(ecran, fichier, pos)
+        return True
 
 
 
@@ -455,14 +627,13 @@ class Renderer :
 
 
     def _render_piece_image(self, ecran: pygame.Surface, piece, px: int, py: int) -> None:
-        img = self._get_piece_image_oriente(piece, CELL)
-        if img is not None:
-            ecran.blit(img, (px, py))
-        else:
+        cell = self.cell
+        if not self._dessiner_piece_orientee(ecran, piece, (px, py), cell):
             # fallback texte
-            pygame.draw.rect(ecran, (210, 210, 210), (px + 2, py + 2, CELL - 4, CELL - 4))
-            short = piece.nom[:12]
-            ecran.blit(self.small.render(short, True, (0, 0, 0)), (px + 4, py + 4))
+            pygame.draw.rect(ecran, (210, 210, 210), (px + 2, py + 2, cell - 4, cell - 4))
+            if cell >= CELL_TEXTE_PORTES:
+                short = piece.nom[:12]
+                ecran.blit(self.textes.rendre(self.small, short, (0, 0, 0)), (px + 4, py + 4))
         
 
 
@@ -486,8 +657,10 @@ class Renderer :
         None
 
         """
-        # épaisseur
+        # épaisseur, retrait des portes depuis les coins, niveau écrit seulement si la case est assez grande
         th = 1
+        m = cell // 8
+        texte = cell >= CELL_TEXTE_PORTES
         for d, porte in portes.items():
             # couleur selon état
             if porte.ouverte:
@@ -504,24 +677,24 @@ class Renderer :
                     col = (255, 0, 0)  # rouge = verrou ultime
 
             if d == "N":
-                pygame.draw.rect(ecran, col, (px + 8, py, cell - 16, th)) # type: ignore
-                if not porte.ouverte and porte.niveau > 0:
-                    txt = self.small.render(str(porte.niveau), True, (255, 255, 255))
+                pygame.draw.rect(ecran, col, (px + m, py, cell - 2 * m, th)) # type: ignore
+                if texte and not porte.ouverte and porte.niveau > 0:
+                    txt = self.textes.rendre(self.small, str(porte.niveau), (255, 255, 255))
                     ecran.blit(txt, (px + cell // 2 - 4, py + 2))
             elif d == "S":
-                pygame.draw.rect(ecran, col, (px + 8, py + cell - th, cell - 16, th)) # type: ignore
-                if not porte.ouverte and porte.niveau > 0:
-                    txt = self.small.render(str(porte.niveau), True, (255, 255, 255))
+                pygame.draw.rect(ecran, col, (px + m, py + cell - th, cell - 2 * m, th)) # type: ignore
+                if texte and not porte.ouverte and porte.niveau > 0:
+                    txt = self.textes.rendre(self.small, str(porte.niveau), (255, 255, 255))
                     ecran.blit(txt, (px + cell // 2 - 4, py + cell - th - 12))
             elif d == "E":
-                pygame.draw.rect(ecran, col, (px + cell - th, py + 8, th, cell - 16)) # type: ignore
-                if not porte.ouverte and porte.niveau > 0:
-                    txt = self.small.render(str(porte.niveau), True, (255, 255, 255))
+                pygame.draw.rect(ecran, col, (px + cell - th, py + m, th, cell - 2 * m)) # type: ignore
+                if texte and not porte.ouverte and porte.niveau > 0:
+                    txt = self.textes.rendre(self.small, str(porte.niveau), (255, 255, 255))
                     ecran.blit(txt, (px + cell - th - 2, py + cell // 2 - 6))
             elif d == "O":
-                pygame.draw.rect(ecran, col, (px, py + 8, th, cell - 16)) # type: ignore
-                if not porte.ouverte and porte.niveau > 0:
-                    txt = self.small.render(str(porte.niveau), True, (255, 255, 255))
+                pygame.draw.rect(ecran, col, (px, py + m, th, cell - 2 * m)) # type: ignore
+                if texte and not porte.ouverte and porte.niveau > 0:
+                    txt = self.textes.rendre(self.small, str(porte.niveau), (255, 255, 255))
                     ecran.blit(txt, (px + 2, py + cell // 2 - 6))
 
 
@@ -550,7 +723,7 @@ class Renderer :
         index = data["index"]
 
         grille = game.grille
-        grid_right = OFFSET_X + grille.largeur * CELL
+        grid_right = OFFSET_X + grille.largeur * self.cell
         panel_x = grid_right + 20
         panel_y = OFFSET_Y
         panel_w = ecran.get_width() - panel_x - 20
@@ -561,7 +734,7 @@ class Renderer :
         pygame.draw.rect(ecran, (220, 220, 220), (panel_x, panel_y, panel_w, panel_h), 2)
 
         # titre
-        titre = self.font.render("Choisissez une salle", True, (255, 255, 255))
+        titre = self.textes.rendre(self.font, "Choisissez une salle", (255, 255, 255))
         ecran.blit(titre, (panel_x + 16, panel_y + 12))
 
         nb = len(pieces)
@@ -585,8 +758,7 @@ class Renderer :
             img_y = tiles_top
 
             # image orientée
-            img = self._get_piece_image_oriente(piece, img_size)
-            if img is not None:
+            if self._fichier_piece(piece) is not None:
                 # cadre de sélection
                 if i == index:
                     pygame.draw.rect(
@@ -595,7 +767,7 @@ class Renderer :
                         (img_x - 4, img_y - 4, img_size + 8, img_size + 8),
                         3,
                     )
-                ecran.blit(img, (img_x, img_y))
+                self._dessiner_piece_orientee(ecran, piece, (img_x, img_y), img_size)
             else:
                 # fallback 
                 rect = pygame.Rect(img_x, img_y, img_size, img_size)
@@ -603,7 +775,7 @@ class Renderer :
                     pygame.draw.rect(ecran, (200, 200, 80), rect, 3)
                 pygame.draw.rect(ecran, (180, 180, 180), rect)
                 short = piece.nom[:10]
-                txt = self.small.render(short, True, (0, 0, 0))
+                txt = self.textes.rendre(self.small, short, (0, 0, 0))
                 ecran.blit(
                     txt,
                     (rect.centerx - txt.get_width() // 2,
@@ -611,7 +783,7 @@ class Renderer :
                 )
 
             nom = piece.nom
-            txt_nom = self.small.render(nom, True, (220, 220, 255 if i == index else 200))
+            txt_nom = self.textes.rendre(self.small, nom, (220, 220, 255 if i == index else 200))
             txt_x = col_x + (col_width - txt_nom.get_width()) // 2
             txt_y = img_y + img_size + 6
             ecran.blit(txt_nom, (txt_x, txt_y))
@@ -619,7 +791,7 @@ class Renderer :
             # cout gemmes 
             cg = getattr(piece, "cout_gemmes", 0)
             if cg > 0:
-                txt_cg = self.small.render(f"Coût : {cg} gemme(s)", True, (200, 200, 200))
+                txt_cg = self.textes.rendre(self.small, f"Coût : {cg} gemme(s)", (200, 200, 200))
                 cg_x = col_x + (col_width - txt_cg.get_width()) // 2
                 cg_y = txt_y + txt_nom.get_height() + 2
                 ecran.blit(txt_cg, (cg_x, cg_y))
@@ -632,12 +804,12 @@ class Renderer :
         # --- DEBUG ORIENTATION ---
             nom_forme = getattr(piece.forme, "nom", "?")
             ports = "".join(sorted(getattr(piece.forme, "ens_portes", [])))
-            txt_debug = self.small.render(f"{nom_forme} ({ports})", True, (180, 180, 180))
+            txt_debug = self.textes.rendre(self.small, f"{nom_forme} ({ports})", (180, 180, 180))
             debug_x = col_x + (col_width - txt_debug.get_width()) // 2
             ecran.blit(txt_debug, (debug_x, debug_y))
 
         aide_txt = "<- / -> pour choisir   Entrée pour valider   Espace pour relancer (si dé)"
-        aide = self.small.render(aide_txt, True, (230, 230, 230))
+        aide = self.textes.rendre(self.small, aide_txt, (230, 230, 230))
         ecran.blit(aide, (panel_x + 16, panel_y + panel_h - 30))
 
 
@@ -667,7 +839,7 @@ class Renderer :
         index = ctx.get("index", 0)
 
         # panneau
-        grid_droite = OFFSET_X + game.grille.largeur * CELL
+        grid_droite = OFFSET_X + game.grille.largeur * self.cell
 
         panneau_x = grid_droite + 20
         panneau_y = OFFSET_Y
@@ -696,18 +868,14 @@ class Renderer :
             titre_txt = f"Magasin : {nom_piece}"
             sous_titre_txt = "Mag"
     
-        titre = self.font.render(f"Magasin : {nom_piece}", True, (255, 255, 255))
+        titre = self.textes.rendre(self.font, f"Magasin : {nom_piece}", (255, 255, 255))
         ecran.blit(titre, (panneau_x + 16, panneau_y + 12))
         # sous-titre
-        sous_titre = self.small.render(sous_titre_txt, True, (200, 200, 200))
+        sous_titre = self.textes.rendre(self.small, sous_titre_txt, (200, 200, 200))
         ecran.blit(sous_titre, (panneau_x + 16, panneau_y + 36))
         
         # ressources du joueur
-        info = self.small.render(
-            f"",
-            True,
-            (230, 230, 230),
-        )
+        info = self.textes.rendre(self.small, f"", (230, 230, 230))
         ecran.blit(info, (panneau_x + 16, panneau_y + 40))
 
         # zone des offres
@@ -730,15 +898,11 @@ class Renderer :
                 pygame.draw.rect(ecran, (40, 40, 40), rect)
 
             # texte doffre
-            txt = self.small.render(f"{label}  -  {prix} or", True, (255, 255, 255))
+            txt = self.textes.rendre(self.small, f"{label}  -  {prix} or", (255, 255, 255))
             ecran.blit(txt, (rect.x + 8, rect.y + 6))
 
         # aide
-        aide = self.small.render(
-            "Entrée / O : acheter    Échap : quitter   <- / ->  ou QD : changer d'article",
-            True,
-            (230, 230, 230),
-        )
+        aide = self.textes.rendre(self.small, "Entrée / O : acheter    Échap : quitter   <- / ->  ou QD : changer d'article", (230, 230, 230))
         ecran.blit(aide, (panneau_x + 16, panneau_y + panneau_h - 30))
 
 
@@ -784,12 +948,12 @@ class Renderer :
         pygame.draw.rect(ecran, (200, 0, 0), rect, 4, border_radius=20)
 
         # Titre
-        titre = self.font_title.render("GAME OVER", True, (255, 80, 80))
+        titre = self.textes.rendre(self.font_title, "GAME OVER", (255, 80, 80))
         ecran.blit(titre, (w // 2 - titre.get_width() // 2, rect.y + 40))
 
         # Message
         texte_msg = getattr(game, "last_message", "") or "Vous ne pouvez plus avancer..."
-        msg = self.small.render(texte_msg, True, (255, 200, 200))
+        msg = self.textes.rendre(self.small, texte_msg, (255, 200, 200))
         ecran.blit(msg, (w // 2 - msg.get_width() // 2, rect.y + 120))
 
         # Choix Oui / Non
@@ -804,7 +968,7 @@ class Renderer :
 
             # couleur texte
             col = (255, 255, 255) if i != selec else (255, 200, 0)
-            texte = self.font.render(opt, True, col)
+            texte = self.textes.rendre(self.font, opt, col)
             texte_rect = texte.get_rect(center=(int(x), y_options))
 
             if i == selec :
@@ -818,7 +982,7 @@ class Renderer :
                 pygame.draw.rect(ecran, (255, 200, 0), cadre_rect, width=3, border_radius=8)
 
                 # flèche à gauche
-                fleche = self.font.render("▶", True, (255, 200, 0))
+                fleche = self.textes.rendre(self.font, "▶", (255, 200, 0))
                 fleche_rect = fleche.get_rect(midright=(cadre_rect.left - 10, cadre_rect.centery))
                 ecran.blit(fleche, fleche_rect)
 
@@ -828,5 +992,54 @@ class Renderer :
 
     def render_victoire(self, ecran: pygame.Surface) -> None:
         w, h = ecran.get_size()
-        txt = self.font_title.render("VICTOIRE !", True, (80, 255, 120))
+        txt = self.textes.rendre(self.font_title, "VICTOIRE !", (80, 255, 120))
         ecran.blit(txt, (w // 2 - txt.get_width() // 2, h // 2 - txt.get_height() // 2))
+
+
+
+
+    def render_chrono(self, ecran: pygame.Surface) -> pygame.Rect:
+        """
+        Panneau des chronométrages : pour chaque série (boucle pygame puis handle_* les plus lents),
+        p50 / p99 / max sur la fenêtre glissante et l'histogramme des durées (classes de chrono.BORNES_US).
+
+        Paramètres
+        ----------
+        ecran : pygame.Surface
+
+        Returns
+        -------
+        pygame.Rect
+            Zone du panneau.
+        """
+        series = chrono.series()
+        affichees = [series[n] for n in SERIES_BOUCLE if n in series]
+        handlers = sorted((s for n, s in series.items() if n.startswith("jeu.")), key=lambda s: s.percentile(99), reverse=True)
+        affichees += handlers[:N_HANDLERS_AFFICHES]
+
+        hauteur = (len(affichees) + 1) * LIGNE_CHRONO + 10
+        w, h = ecran.get_size()
+        zone = pygame.Rect(w - LARGEUR_CHRONO - 10, h - hauteur - 10, LARGEUR_CHRONO, hauteur)
+        pygame.draw.rect(ecran, (15, 15, 25), zone)
+        pygame.draw.rect(ecran, (90, 90, 120), zone, width=1)
+
+        textes = self._textes_chrono
+        x_histo = zone.right - (len(chrono.BORNES_US) + 1) * LARGEUR_CLASSE - 8
+        ecran.blit(textes.rendre(self.small, "F3   (ms)          p50      p99      max", (200, 200, 200)), (zone.x + 6, zone.y + 4))
+        ecran.blit(textes.rendre(self.small, f"<={chrono.BORNES_US[-1] // 1000} ms", (140, 140, 160)), (x_histo, zone.y + 4))
+
+        for k, serie in enumerate(affichees, start=1):
+            y = zone.y + 4 + k * LIGNE_CHRONO
+            max_fenetre = max(serie.durees) / 1e6 if serie.durees else 0.0
+            ligne = f"{serie.nom[:24]:<24} {serie.percentile(50) / 1e3:>7.2f} {serie.percentile(99) / 1e3:>7.2f} {max_fenetre:>7.2f}"
+            couleur = (255, 140, 120) if serie.percentile(99) > chrono.BORNES_US[-1] else (230, 230, 230)
+            ecran.blit(textes.rendre(self.small, ligne, couleur), (zone.x + 6, y))
+
+            classes = serie.histogramme()
+            plus_grande = max(classes) or 1
+            for c, n in enumerate(classes):
+                hauteur_barre = round(n / plus_grande * (LIGNE_CHRONO - 4))
+                if hauteur_barre:
+                    barre = pygame.Rect(x_histo + c * LARGEUR_CLASSE, y + LIGNE_CHRONO - 2 - hauteur_barre, LARGEUR_CLASSE - 1, hauteur_barre)
+                    pygame.draw.rect(ecran, (120, 200, 255) if c < len(classes) - 1 else (255, 120, 100), barre)
+        return zone
@@ -0,0 +1,87 @@
+from __future__ import annotations
+# ui/textes.py
+# cache LRU des surfaces de texte : une chaîne identique n'est rastérisée qu'une fois
+
+from collections import OrderedDict
+
+import pygame
+
+
+CAPACITE_DEFAUT = 256
+
+
+
+
+class CacheTextes :
+    """
+    Cache borné (LRU) des surfaces produites par Font.render, indexé par (police, texte, couleur).
+    Les surfaces renvoyées sont partagées : les blitter, ne pas les modifier.
+
+    Paramètres
+    ----------
+    capacite : int
+        Nombre maximal de surfaces gardées ; au-delà, la moins récemment utilisée est libérée.
+
+    Attributs
+    ---------
+    capacite : int
+    succes : int
+        Nombre de rendus servis par le cache.
+    echecs : int
+        Nombre de rendus effectivement rastérisés.
+    _surfaces : OrderedDict[tuple, pygame.Surface]
+        Surfaces, de la moins à la plus récemment utilisée.
+
+    Méthodes
+    --------
+    rendre(police, texte, couleur) -> pygame.Surface
+        Equivalent de police.render(texte, True, couleur).
+    vider() -> None
+    stats() -> dict[str, int | float]
+        Compteurs (taille, succès, échecs, taux de succès).
+    """
+
+    def __init__ (self, capacite : int = CAPACITE_DEFAUT) -> None :
+        self.capacite = capacite
+        self.succes = 0
+        self.echecs = 0
+        self._surfaces : OrderedDict[tuple, pygame.Surface] = OrderedDict()
+
+
+
+    def __len__ (self) -> int :
+        return len(self._surfaces)
+
+
+
+    def rendre (self, police : pygame.font.Font, texte : str, couleur : tuple[int, ...]) -> pygame.Surface :
+        cle = (police, texte, couleur)
+        surface = self._surfaces.get(cle)
+        if surface is not None :
+            self.succes += 1
+            self._surfaces.move_to_end(cle)
+            return surface
+
+        self.echecs += 1
+        surface = police.render(texte, True, couleur)
+        self._surfaces[cle] = surface
+        if len(self._surfaces) > self.capacite :
+            self._surfaces.popitem(last=False)
+        return surface
+
+
+
+    def vider (self) -> None :
+        self._surfaces.clear()
+
+
+
+    def stats (self) -> dict[str, int | float] :
+        total = self.succes + self.echecs
+        return {
+            "taille" : len(self._surfaces),
+            "capacite" : self.capacite,
+            "succes" : self.succes,
+            "echecs" : self.echecs,
+            "taux_succes" : self.succes / total if total else 0.0,
+        }